@@ -139,6 +139,27 @@ class ArchiveLayout:
         """
         return self.__timestamp
 
+    def getPathToCatalog(self):
+        """
+        Returns the path to the catalog of the runs, reports and plugin
+        runs in the archive.
+
+        @return: Returns the path to the catalog of the archive.
+        @rtype: String
+        """
+        return os.path.join(self.getPathToArchiveRoot(), ".sxcatalog.db")
+
+    def getPathToSearchIndex(self):
+        """
+        Returns the path to the search index of the extracted reports in
+        the archive.
+
+        @return: Returns the path to the search index of the extracted
+        reports in the archive.
+        @rtype: String
+        """
+        return os.path.join(self.getPathToArchiveRoot(), ".sxsearchindex.db")
+
     def getPathToCompressedReports(self):
         """
         Returns the path to the compressed reports directory.
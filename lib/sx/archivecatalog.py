@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+"""
+This file contains the ArchiveCatalog class that is a database of the
+runs, reports and plugin runs in an archive.
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  2.17
+@copyright :  GPLv2
+"""
+import os
+import os.path
+import time
+import logging
+import sqlite3
+
+import sx
+from sx.logwriter import LogWriter
+from sx.reports import Report
+
+class ArchiveCatalog:
+    """
+    This class is a catalog of an archive that is a sqlite database
+    under the root of the archive. Each run of sxconsole that creates
+    or loads a directory of extracted reports, each report in the
+    directory and each file that a plugin created is recorded, so that
+    the reports for a hostname or the last run for a uid can be found
+    with a query instead of listing every directory in the archive.
+
+    @cvar SCHEMA_VERSION: The version of the tables in the catalog.
+    @type SCHEMA_VERSION: Int
+    @cvar REPORT_FILTERS: The names of the filters that can be used to
+    find reports and the columns that they match.
+    @type REPORT_FILTERS: Dictionary
+    """
+    SCHEMA_VERSION = 1
+    REPORT_FILTERS = {"uid":"runs.uid", "timestamp":"runs.timestamp", "hostname":"reports.hostname",
+                      "type":"reports.type", "name":"reports.name"}
+
+    def __init__(self, pathToCatalog, readOnly=False):
+        """
+        @param pathToCatalog: The path to the file of the catalog.
+        @type pathToCatalog: String
+        @param readOnly: If True then the catalog is only queried. The
+        catalog is not created if it does not exist and nothing is
+        added to it.
+        @type readOnly: Boolean
+        """
+        self.__pathToCatalog = pathToCatalog
+        self.__readOnly = readOnly
+        self.__connection = None
+
+    def getPathToCatalog(self):
+        return self.__pathToCatalog
+
+    def isReadOnly(self):
+        return self.__readOnly
+
+    def __connect(self):
+        """
+        Returns the connection to the catalog and creates the tables if
+        the catalog is new. None is returned if the catalog could not be
+        opened.
+
+        @return: Returns the connection to the catalog.
+        @rtype: sqlite3.Connection
+        """
+        if (not self.__connection == None):
+            return self.__connection
+        elif ((self.__readOnly) and (not os.path.isfile(self.__pathToCatalog))):
+            return None
+        try:
+            connection = sqlite3.connect(self.__pathToCatalog, timeout=60)
+            connection.text_factory = str
+            schemaVersion = connection.execute("PRAGMA user_version").fetchone()[0]
+            if ((self.__readOnly) and (not schemaVersion == ArchiveCatalog.SCHEMA_VERSION)):
+                message = "The archive catalog has no tables or an unsupported version(%d) and will not be used: %s" %(schemaVersion, self.__pathToCatalog)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+                connection.close()
+                return None
+            elif (self.__readOnly):
+                # The changes are refused by sqlite as well.
+                connection.execute("PRAGMA query_only = ON")
+            elif (schemaVersion == 0):
+                connection.execute("CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, uid TEXT, timestamp TEXT, " +
+                                   "pathToExtractedReports TEXT UNIQUE, pathToCompressedReports TEXT, created REAL)")
+                connection.execute("CREATE INDEX IF NOT EXISTS runsUIDIndex ON runs (uid, timestamp)")
+                connection.execute("CREATE TABLE IF NOT EXISTS reports (id INTEGER PRIMARY KEY, runId INTEGER, name TEXT, type TEXT, " +
+                                   "hostname TEXT, pathToExtractedReport TEXT UNIQUE, pathToCompressedReport TEXT, " +
+                                   "compressedSize INTEGER, byteSize INTEGER, fileCount INTEGER, created REAL)")
+                connection.execute("CREATE INDEX IF NOT EXISTS reportsRunIndex ON reports (runId)")
+                connection.execute("CREATE INDEX IF NOT EXISTS reportsHostnameIndex ON reports (hostname)")
+                connection.execute("CREATE TABLE IF NOT EXISTS pluginRuns (id INTEGER PRIMARY KEY, runId INTEGER, " +
+                                   "plugin TEXT, pathToOutput TEXT, created REAL, UNIQUE (runId, plugin, pathToOutput))")
+                connection.execute("PRAGMA user_version = %d" %(ArchiveCatalog.SCHEMA_VERSION))
+                connection.commit()
+            elif (not schemaVersion == ArchiveCatalog.SCHEMA_VERSION):
+                message = "The archive catalog has an unsupported version(%d) and will not be used: %s" %(schemaVersion, self.__pathToCatalog)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                connection.close()
+                return None
+        except sqlite3.Error, e:
+            message = "There was an error opening the archive catalog: %s(%s)" %(self.__pathToCatalog, str(e))
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return None
+        self.__connection = connection
+        return self.__connection
+
+    def close(self):
+        if (not self.__connection == None):
+            self.__connection.close()
+            self.__connection = None
+
+    def __execute(self, query, parameters=(), commit=False):
+        """
+        Returns the cursor of the query or None if there was an error.
+
+        @return: Returns the cursor of the query.
+        @rtype: sqlite3.Cursor
+
+        @param query: The SQL query.
+        @type query: String
+        @param parameters: The values of the parameters in the query.
+        @type parameters: Tuple
+        @param commit: If True then the changes are commited.
+        @type commit: Boolean
+        """
+        connection = self.__connect()
+        if (connection == None):
+            return None
+        try:
+            cursor = connection.execute(query, parameters)
+            if (commit):
+                connection.commit()
+            return cursor
+        except sqlite3.Error, e:
+            connection.rollback()
+            message = "There was an error with the query on the archive catalog: %s(%s)" %(self.__pathToCatalog, str(e))
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+        return None
+
+    def __getRunId(self, pathToExtractedReports):
+        cursor = self.__execute("SELECT id FROM runs WHERE pathToExtractedReports = ?", (os.path.abspath(pathToExtractedReports),))
+        if (cursor == None):
+            return None
+        row = cursor.fetchone()
+        if (row == None):
+            return None
+        return row[0]
+
+    def addRun(self, archiveLayout):
+        """
+        Adds the directory of extracted reports of the archive layout to
+        the catalog if it is not already in the catalog.
+
+        @return: Returns True if the run is in the catalog.
+        @rtype: Boolean
+
+        @param archiveLayout: The archive layout of the run.
+        @type archiveLayout: ArchiveLayout
+        """
+        if (self.__readOnly):
+            return False
+        cursor = self.__execute("INSERT OR IGNORE INTO runs (uid, timestamp, pathToExtractedReports, pathToCompressedReports, created) " +
+                                "VALUES (?, ?, ?, ?, ?)",
+                                (archiveLayout.getUID(), archiveLayout.getTimestamp(),
+                                 os.path.abspath(archiveLayout.getPathToExtractedReports()),
+                                 os.path.abspath(archiveLayout.getPathToCompressedReports()), time.time()), commit=True)
+        return (not cursor == None)
+
+    def addReport(self, archiveLayout, report, pathToCompressedReport=""):
+        """
+        Adds the report to the catalog or updates the report if it is
+        already in the catalog. The run of the archive layout is added
+        if it is not in the catalog.
+
+        @return: Returns True if the report was added to the catalog.
+        @rtype: Boolean
+
+        @param archiveLayout: The archive layout of the run.
+        @type archiveLayout: ArchiveLayout
+        @param report: The report that was extracted or loaded.
+        @type report: Report
+        @param pathToCompressedReport: The path to the compressed
+        report.
+        @type pathToCompressedReport: String
+        """
+        if ((self.__readOnly) or (not len(report.getPathToExtractedReport()) > 0)):
+            return False
+        runId = self.__getRunId(archiveLayout.getPathToExtractedReports())
+        if (runId == None):
+            if (not self.addRun(archiveLayout)):
+                return False
+            runId = self.__getRunId(archiveLayout.getPathToExtractedReports())
+        compressedSize = -1
+        if ((len(pathToCompressedReport) > 0) and (os.path.isfile(pathToCompressedReport))):
+            compressedSize = os.path.getsize(pathToCompressedReport)
+            pathToCompressedReport = os.path.abspath(pathToCompressedReport)
+        else:
+            pathToCompressedReport = ""
+        # The metadata file is read so that the files in the report do not
+        # have to be counted again.
+        metadataMap = Report.readMetadata(report.getPathToExtractedReport())
+        if (not len(metadataMap.keys()) > 0):
+            metadataMap = report.getMetadata()
+        cursor = self.__execute("INSERT OR REPLACE INTO reports (runId, name, type, hostname, pathToExtractedReport, pathToCompressedReport, " +
+                                "compressedSize, byteSize, fileCount, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                (runId, report.getName(), report.getType(), metadataMap.get("hostname", ""),
+                                 os.path.abspath(report.getPathToExtractedReport()), pathToCompressedReport, compressedSize,
+                                 metadataMap.get("byteSize", -1), metadataMap.get("fileCount", -1), time.time()), commit=True)
+        return (not cursor == None)
+
+    def addPluginRun(self, archiveLayout, pluginName, pathToOutput=""):
+        """
+        Adds a file that a plugin created for the run to the catalog.
+
+        @return: Returns True if the plugin run was added to the catalog.
+        @rtype: Boolean
+
+        @param archiveLayout: The archive layout of the run.
+        @type archiveLayout: ArchiveLayout
+        @param pluginName: The name of the plugin.
+        @type pluginName: String
+        @param pathToOutput: The path to the file that the plugin
+        created.
+        @type pathToOutput: String
+        """
+        if (self.__readOnly):
+            return False
+        runId = self.__getRunId(archiveLayout.getPathToExtractedReports())
+        if (runId == None):
+            return False
+        if (len(pathToOutput) > 0):
+            pathToOutput = os.path.abspath(pathToOutput)
+        cursor = self.__execute("INSERT OR REPLACE INTO pluginRuns (runId, plugin, pathToOutput, created) VALUES (?, ?, ?, ?)",
+                                (runId, pluginName, pathToOutput, time.time()), commit=True)
+        return (not cursor == None)
+
+    def getReportsForRun(self, pathToExtractedReports):
+        """
+        Returns a list of tuples of the path to each extracted report,
+        the name of the report type and the path to the compressed
+        report for the reports in the directory of extracted reports.
+
+        @return: Returns a list of tuples of the path to each extracted
+        report, the name of the report type and the path to the
+        compressed report.
+        @rtype: Array
+
+        @param pathToExtractedReports: The path to the directory of the
+        extracted reports.
+        @type pathToExtractedReports: String
+        """
+        runId = self.__getRunId(pathToExtractedReports)
+        if (runId == None):
+            return []
+        cursor = self.__execute("SELECT pathToExtractedReport, name, pathToCompressedReport FROM reports " +
+                                "WHERE runId = ? ORDER BY pathToExtractedReport", (runId,))
+        if (cursor == None):
+            return []
+        return cursor.fetchall()
+
+    def findReports(self, filtersMap):
+        """
+        Returns a list of the reports that match all the filters from
+        the newest run to the oldest. Each item is a tuple of the uid,
+        timestamp, name, type, hostname, path to the extracted report,
+        path to the compressed report, compressed size, size of the
+        files and the number of files.
+
+        @return: Returns a list of the reports that match all the
+        filters.
+        @rtype: Array
+
+        @param filtersMap: A map of the name of the filter to the value
+        that is matched. The names are the keys of REPORT_FILTERS.
+        @type filtersMap: Dictionary
+        """
+        listOfConditions = []
+        listOfValues = []
+        for key in sorted(filtersMap.keys()):
+            if (ArchiveCatalog.REPORT_FILTERS.has_key(key)):
+                listOfConditions.append("%s = ?" %(ArchiveCatalog.REPORT_FILTERS.get(key)))
+                listOfValues.append(filtersMap.get(key))
+        query = "SELECT runs.uid, runs.timestamp, reports.name, reports.type, reports.hostname, reports.pathToExtractedReport, "
+        query += "reports.pathToCompressedReport, reports.compressedSize, reports.byteSize, reports.fileCount "
+        query += "FROM reports JOIN runs ON reports.runId = runs.id"
+        if (len(listOfConditions) > 0):
+            query += " WHERE %s" %(" AND ".join(listOfConditions))
+        query += " ORDER BY runs.timestamp DESC, reports.pathToExtractedReport"
+        cursor = self.__execute(query, tuple(listOfValues))
+        if (cursor == None):
+            return []
+        return cursor.fetchall()
+
+    def getLastRun(self, uid):
+        """
+        Returns a tuple of the timestamp, the path to the extracted
+        reports, the path to the compressed reports and a list of tuples
+        of the plugin and the file it created for the newest run of the
+        uid. None is returned if there is no run for the uid.
+
+        @return: Returns a tuple of the newest run of the uid.
+        @rtype: Tuple
+
+        @param uid: The uid of the run.
+        @type uid: String
+        """
+        cursor = self.__execute("SELECT id, timestamp, pathToExtractedReports, pathToCompressedReports FROM runs " +
+                                "WHERE uid = ? ORDER BY timestamp DESC LIMIT 1", (uid,))
+        if (cursor == None):
+            return None
+        row = cursor.fetchone()
+        if (row == None):
+            return None
+        (runId, timestamp, pathToExtractedReports, pathToCompressedReports) = row
+        cursor = self.__execute("SELECT plugin, pathToOutput FROM pluginRuns WHERE runId = ? ORDER BY plugin, pathToOutput", (runId,))
+        listOfPluginRuns = []
+        if (not cursor == None):
+            listOfPluginRuns = cursor.fetchall()
+        return (timestamp, pathToExtractedReports, pathToCompressedReports, listOfPluginRuns)
@@ -19,16 +19,348 @@ import logging
 import subprocess
 import shutil
 import time
+import fnmatch
+import hashlib
+import collections
 
 import sx
 from sx.logwriter import LogWriter
+from sx.tools import FileUtil
+
+class ArchiveIndex :
+    """
+    This class is an index of the members in a compressed file. The
+    index maps the path of each member(relative to the root of the
+    report) to a tuple of the name, size, offset, type and link target
+    of the member, which the extractor uses to locate the member in
+    the compressed file. The objects of the module that read the
+    compressed file are not kept, so that an index is small.
+
+    An index is built once for each compressed file and is shared by
+    every extractor for that file until the file is modified or its
+    report is extracted. The least recently used indexes are removed
+    when there are more than the maximum number of indexes.
+
+    @cvar INDEX_MAP: A map of the real path to a compressed file to
+    the index of that file in the order that the indexes were used.
+    @type INDEX_MAP: OrderedDict
+    @cvar MAXIMUM_INDEXES: The maximum number of indexes that are kept.
+    @type MAXIMUM_INDEXES: Int
+    @cvar MEMBER_FILE: The type of a member that is a regular file.
+    @type MEMBER_FILE: String
+    @cvar MEMBER_DIR: The type of a member that is a directory.
+    @type MEMBER_DIR: String
+    @cvar MEMBER_SYMLINK: The type of a member that is a symbolic link.
+    @type MEMBER_SYMLINK: String
+    @cvar MEMBER_HARDLINK: The type of a member that is a hard link.
+    @type MEMBER_HARDLINK: String
+    @cvar MEMBER_OTHER: The type of a member that is not a file,
+    directory or link, such as a device.
+    @type MEMBER_OTHER: String
+    """
+    INDEX_MAP = collections.OrderedDict()
+    MAXIMUM_INDEXES = 64
+    MEMBER_FILE = "file"
+    MEMBER_DIR = "dir"
+    MEMBER_SYMLINK = "symlink"
+    MEMBER_HARDLINK = "hardlink"
+    MEMBER_OTHER = "other"
+
+    def __init__(self, pathToFile):
+        """
+        @param pathToFile: The path to the compressed file.
+        @type pathToFile: String
+        """
+        self.__pathToFile = os.path.realpath(pathToFile)
+        self.__fileSignature = ArchiveIndex.getFileSignature(self.__pathToFile)
+        self.__listOfMemberNames = []
+        self.__membersMap = {}
+        self.__capturedFilesMap = {}
+        # A map of the path of each directory to the names of the members
+        # in the directory. It is built on first use.
+        self.__childrenMap = None
+
+    def getFileSignature(pathToFile):
+        """
+        Returns a tuple of the size and modification time of the
+        file. None is returned if the file cannot be stat'ed.
+
+        @return: Returns a tuple of the size and modification time of
+        the file.
+        @rtype: Tuple
+
+        @param pathToFile: The path to the compressed file.
+        @type pathToFile: String
+        """
+        try:
+            fileStat = os.stat(pathToFile)
+            return (fileStat.st_size, fileStat.st_mtime)
+        except OSError:
+            return None
+    getFileSignature = staticmethod(getFileSignature)
+
+    def getIndex(pathToFile):
+        """
+        Returns the index for the compressed file. None is returned if
+        there is no index or the file was modified after the index was
+        built.
+
+        @return: Returns the index for the compressed file.
+        @rtype: ArchiveIndex
+
+        @param pathToFile: The path to the compressed file.
+        @type pathToFile: String
+        """
+        pathToFile = os.path.realpath(pathToFile)
+        archiveIndex = ArchiveIndex.INDEX_MAP.pop(pathToFile, None)
+        if ((not archiveIndex == None) and (archiveIndex.isValid())):
+            # The index is added again so that it is the most recently
+            # used.
+            ArchiveIndex.INDEX_MAP[pathToFile] = archiveIndex
+            return archiveIndex
+        return None
+    getIndex = staticmethod(getIndex)
+
+    def register(archiveIndex):
+        """
+        Adds the index to the map of indexes so that it is shared with
+        every extractor for the same file. The least recently used
+        indexes are removed if there are more than the maximum number of
+        indexes.
+
+        @param archiveIndex: The index that will be shared.
+        @type archiveIndex: ArchiveIndex
+        """
+        ArchiveIndex.INDEX_MAP.pop(archiveIndex.getPathToFile(), None)
+        ArchiveIndex.INDEX_MAP[archiveIndex.getPathToFile()] = archiveIndex
+        while (len(ArchiveIndex.INDEX_MAP.keys()) > ArchiveIndex.MAXIMUM_INDEXES):
+            ArchiveIndex.INDEX_MAP.popitem(last=False)
+    register = staticmethod(register)
+
+    def remove(pathToFile):
+        """
+        Removes the index for the compressed file, such as when the
+        report in the file was extracted and the index is not needed
+        anymore.
+
+        @param pathToFile: The path to the compressed file.
+        @type pathToFile: String
+        """
+        ArchiveIndex.INDEX_MAP.pop(os.path.realpath(pathToFile), None)
+    remove = staticmethod(remove)
+
+    def move(pathToSrc, pathToDst):
+        """
+        Changes the path of the index for a compressed file that was
+        moved, so that the index does not have to be built again.
+
+        @param pathToSrc: The path the compressed file was moved from.
+        @type pathToSrc: String
+        @param pathToDst: The path the compressed file was moved to.
+        @type pathToDst: String
+        """
+        archiveIndex = ArchiveIndex.INDEX_MAP.pop(os.path.realpath(pathToSrc), None)
+        if (not archiveIndex == None):
+            archiveIndex.setPathToFile(pathToDst)
+            if (archiveIndex.isValid()):
+                ArchiveIndex.register(archiveIndex)
+    move = staticmethod(move)
+
+    def getPathToFile(self):
+        return self.__pathToFile
+
+    def setPathToFile(self, pathToFile):
+        self.__pathToFile = os.path.realpath(pathToFile)
+
+    def isValid(self):
+        """
+        Returns True if the file has not been modified since the index
+        was built.
+
+        @return: Returns True if the file has not been modified since
+        the index was built.
+        @rtype: Boolean
+        """
+        signature = ArchiveIndex.getFileSignature(self.__pathToFile)
+        return ((not signature == None) and (signature == self.__fileSignature))
+
+    def add(self, memberName, memberPath, size=0, offset=-1, memberType=None, linkname=""):
+        """
+        Adds a member to the index.
+
+        @param memberName: The name of the member as it is listed in
+        the compressed file.
+        @type memberName: String
+        @param memberPath: The path of the member relative to the root
+        of the report.
+        @type memberPath: String
+        @param size: The size of the member.
+        @type size: Int
+        @param offset: The offset of the member in the compressed file
+        or -1 if the offset is not known.
+        @type offset: Int
+        @param memberType: The type of the member. If None then the
+        member is a directory if the name ends with "/", otherwise it is
+        a regular file.
+        @type memberType: String
+        @param linkname: The target of the member if it is a link.
+        @type linkname: String
+        """
+        self.__listOfMemberNames.append(memberName)
+        memberPath = memberPath.strip("/")
+        if (memberType == None):
+            memberType = ArchiveIndex.MEMBER_FILE
+            if (memberName.endswith("/")):
+                memberType = ArchiveIndex.MEMBER_DIR
+        if (not self.__membersMap.has_key(memberPath)):
+            self.__membersMap[memberPath] = (memberName, size, offset, memberType, linkname)
+        self.__childrenMap = None
+
+    def getMemberNames(self):
+        """
+        Returns the list of the names of all the members in the order
+        they are in the compressed file.
+
+        @return: Returns the list of the names of all the members.
+        @rtype: Array
+        """
+        return self.__listOfMemberNames
+
+    def getMemberPaths(self):
+        """
+        Returns the list of the paths of all the members, which are
+        relative to the root of the report.
+
+        @return: Returns the list of the paths of all the members.
+        @rtype: Array
+        """
+        return self.__membersMap.keys()
+
+    def hasMember(self, memberPath):
+        return self.__membersMap.has_key(memberPath.strip("/"))
+
+    def __getChildrenMap(self):
+        """
+        Returns a map of the path of each directory to the names of the
+        members in the directory. The directories that are not members
+        of the compressed file but have members are included.
+
+        @return: Returns a map of the path of each directory to the
+        names of the members in the directory.
+        @rtype: Dictionary
+        """
+        if (self.__childrenMap == None):
+            self.__childrenMap = {"":{}}
+            for memberPath in self.__membersMap.keys():
+                if (not len(memberPath) > 0):
+                    continue
+                elif (self.__membersMap.get(memberPath)[3] == ArchiveIndex.MEMBER_DIR):
+                    self.__childrenMap.setdefault(memberPath, {})
+                # Add the member and each of its parent directories to
+                # the directory that contains it.
+                while (len(memberPath) > 0):
+                    (head, tail) = os.path.split(memberPath)
+                    self.__childrenMap.setdefault(head, {})[tail] = True
+                    memberPath = head
+        return self.__childrenMap
+
+    def isDir(self, memberPath):
+        """
+        Returns True if the path is a directory in the compressed file.
+
+        @return: Returns True if the path is a directory in the
+        compressed file.
+        @rtype: Boolean
+
+        @param memberPath: The path of the member relative to the root
+        of the report.
+        @type memberPath: String
+        """
+        return self.__getChildrenMap().has_key(memberPath.strip("/"))
+
+    def listDir(self, memberPath):
+        """
+        Returns a sorted list of the names of the members in a
+        directory. An empty list is returned if the path is not a
+        directory.
+
+        @return: Returns a sorted list of the names of the members in
+        a directory.
+        @rtype: Array
+
+        @param memberPath: The path of the directory relative to the
+        root of the report.
+        @type memberPath: String
+        """
+        listOfNames = self.__getChildrenMap().get(memberPath.strip("/"), {}).keys()
+        listOfNames.sort()
+        return listOfNames
+
+    def getMemberName(self, memberPath):
+        """
+        Returns the name of the member as it is listed in the
+        compressed file. Empty string is returned if there is no member
+        with that path.
+
+        @return: Returns the name of the member as it is listed in the
+        compressed file.
+        @rtype: String
+
+        @param memberPath: The path of the member relative to the root
+        of the report.
+        @type memberPath: String
+        """
+        memberPath = memberPath.strip("/")
+        if (self.__membersMap.has_key(memberPath)):
+            return self.__membersMap.get(memberPath)[0]
+        return ""
+
+    def getMember(self, memberPath):
+        """
+        Returns a tuple of the name, size, offset, type and link target
+        of the member. None is returned if there is no member with that
+        path.
+
+        @return: Returns a tuple of the name, size, offset, type and
+        link target of the member.
+        @rtype: Tuple
+
+        @param memberPath: The path of the member relative to the root
+        of the report.
+        @type memberPath: String
+        """
+        return self.__membersMap.get(memberPath.strip("/"))
+
+    def addCapturedFile(self, memberPath, data):
+        self.__capturedFilesMap[memberPath.strip("/")] = data
+
+    def getCapturedFile(self, memberPath):
+        """
+        Returns the contents of a file that was captured when the index
+        was built. None is returned if the file was not captured.
+
+        @return: Returns the contents of a file that was captured when
+        the index was built.
+        @rtype: Array
+
+        @param memberPath: The path of the member relative to the root
+        of the report.
+        @type memberPath: String
+        """
+        return self.__capturedFilesMap.get(memberPath.strip("/"))
 
 class Extractor :
     """
     @cvar PATH_TO_TEMP_DIR: This is the path to directory that will
     @type PATH_TO_TEMP_DIR: String
+    @cvar PROBE_FILES: A list of paths(relative to the root of the
+    report) whose contents are read from the compressed file before
+    extraction, such as the files used to detect the report type or
+    the hostname.
+    @type PROBE_FILES: Array
     """
     PATH_TO_TEMP_DIR = "/tmp/sx-%s" %(time.strftime(sx.UID_TIMESTAMP))
+    PROBE_FILES = []
 
     def __init__(self, name, pathToFile, pathToCommand):
         # Descriptive name of extractor
@@ -49,6 +381,34 @@ class Extractor :
     def getPathToCommand(self):
         return self.__pathToCommand
 
+    def getArchiveIndex(self):
+        """
+        Returns the index of the members in the compressed file. The
+        index is built on first use and shared with every extractor for
+        the same file. None is returned if the index could not be built.
+
+        @return: Returns the index of the members in the compressed
+        file.
+        @rtype: ArchiveIndex
+        """
+        archiveIndex = ArchiveIndex.getIndex(self.getPathToFile())
+        if (archiveIndex == None):
+            archiveIndex = self.buildArchiveIndex()
+            if (not archiveIndex == None):
+                ArchiveIndex.register(archiveIndex)
+        return archiveIndex
+
+    def buildArchiveIndex(self):
+        """
+        This function should be overridden by extractors that can index
+        the compressed file. Returns None by default.
+
+        @return: Returns a new index of the members in the compressed
+        file.
+        @rtype: ArchiveIndex
+        """
+        return None
+
     def list(self) :
         commandOptions = self.getListArgs()
         if (commandOptions == None) :
@@ -89,6 +449,150 @@ class Extractor :
         return (not os.path.isdir(Extractor.PATH_TO_TEMP_DIR))
     clean = staticmethod(clean)
 
+    def addProbeFiles(listOfPaths) :
+        """
+        This function will add paths to the list of files that are
+        read from the compressed file before extraction. Extractors
+        that can stream the compressed file will capture the contents
+        of these files in the same pass that lists the file, so that
+        a report can be probed without reading the compressed file
+        again.
+
+        @param listOfPaths: A list of paths that are relative to the
+        root of the report.
+        @type listOfPaths: Array
+        """
+        for pathToFile in listOfPaths:
+            pathToFile = pathToFile.strip("/")
+            if ((len(pathToFile) > 0) and (not pathToFile in Extractor.PROBE_FILES)):
+                Extractor.PROBE_FILES.append(pathToFile)
+    addProbeFiles = staticmethod(addProbeFiles)
+
+    def isMatchingPath(pathToFile, listOfPathPatterns) :
+        """
+        Returns True if the path matches one of the path patterns or
+        is under a directory that matches one of the path patterns. A
+        path pattern is a shell-style wildcard(glob) that is relative to
+        the root of the report. If the list of path patterns is empty
+        then every path matches.
+
+        @return: Returns True if the path matches one of the path
+        patterns.
+        @rtype: Boolean
+
+        @param pathToFile: The path relative to the root of the report.
+        @type pathToFile: String
+        @param listOfPathPatterns: A list of path patterns.
+        @type listOfPathPatterns: Array
+        """
+        if (not len(listOfPathPatterns) > 0):
+            return True
+        pathToFile = pathToFile.strip("/")
+        for pathPattern in listOfPathPatterns:
+            pathPattern = pathPattern.strip("/")
+            if (fnmatch.fnmatchcase(pathToFile, pathPattern)):
+                return True
+            elif (pathToFile.startswith("%s/" %(pathPattern))):
+                return True
+        return False
+    isMatchingPath = staticmethod(isMatchingPath)
+
+    # ###########################################################################
+    # Functions for reading a report without extracting it
+    # ###########################################################################
+    def resolvePath(self, pathToFileInExtractor):
+        """
+        Returns the path of the member that a path refers to after any
+        links in the path are followed. This function should be
+        overridden by extractors that support links.
+
+        @return: Returns the path of the member that a path refers to.
+        @rtype: String
+
+        @param pathToFileInExtractor: The path relative to the root of
+        the report.
+        @type pathToFileInExtractor: String
+        """
+        memberPath = os.path.normpath(pathToFileInExtractor.strip("/"))
+        if (memberPath == "."):
+            return ""
+        return memberPath
+
+    def isFile(self, pathToFileInExtractor):
+        """
+        Returns True if the path refers to a file in the compressed
+        file.
+
+        @return: Returns True if the path refers to a file in the
+        compressed file.
+        @rtype: Boolean
+
+        @param pathToFileInExtractor: The path relative to the root of
+        the report.
+        @type pathToFileInExtractor: String
+        """
+        archiveIndex = self.getArchiveIndex()
+        if (archiveIndex == None):
+            return False
+        memberPath = self.resolvePath(pathToFileInExtractor)
+        return ((archiveIndex.hasMember(memberPath)) and
+                (not archiveIndex.getMemberName(memberPath).endswith("/")))
+
+    def isDir(self, pathToDirInExtractor):
+        archiveIndex = self.getArchiveIndex()
+        if (archiveIndex == None):
+            return False
+        return archiveIndex.isDir(self.resolvePath(pathToDirInExtractor))
+
+    def listDir(self, pathToDirInExtractor):
+        """
+        Returns a sorted list of the names of the members in a
+        directory in the compressed file.
+
+        @return: Returns a sorted list of the names of the members in
+        a directory in the compressed file.
+        @rtype: Array
+
+        @param pathToDirInExtractor: The path relative to the root of
+        the report.
+        @type pathToDirInExtractor: String
+        """
+        archiveIndex = self.getArchiveIndex()
+        if (archiveIndex == None):
+            return []
+        return archiveIndex.listDir(self.resolvePath(pathToDirInExtractor))
+
+    def getFileSize(self, pathToFileInExtractor):
+        """
+        Returns the size in bytes of a file in the compressed file. -1
+        is returned if the file does not exist or the size is not
+        known. This function should be overridden by the extractors.
+
+        @return: Returns the size in bytes of a file in the compressed
+        file.
+        @rtype: Long
+
+        @param pathToFileInExtractor: The path relative to the root of
+        the report.
+        @type pathToFileInExtractor: String
+        """
+        return -1
+
+    def getDecompressionBenchmarks(self):
+        """
+        Decompresses the whole file with each decompression backend
+        that can be used for the file and returns the results. This
+        function should be overridden by extractors that have more than
+        one decompression backend.
+
+        @return: Returns a list of tuples of the name of the
+        decompression backend, the name of the decoder, the number of
+        seconds it took to decompress the file, and the number of bytes
+        that were decompressed.
+        @rtype: Array
+        """
+        return []
+
     def isCommandInstalled(self) :
         return False
 
@@ -104,6 +608,431 @@ class Extractor :
     def getDataFromFile(self, pathToFileInExtractor) :
         return []
 
-    def extract(self, extractDir, stripDirectoriesDepth=1) :
+    def getDataFromFiles(self, listOfPaths):
+        """
+        Returns a map of each path to the contents of the file. The
+        files that do not exist are not in the map. This function
+        should be overridden by extractors that can read all the files
+        in a single pass over the compressed file.
+
+        @return: Returns a map of each path to an array of Strings,
+        where each newline in the file is an item in the array.
+        @rtype: Dictionary
+
+        @param listOfPaths: The paths relative to the root of the
+        report.
+        @type listOfPaths: Array
+        """
+        filesMap = {}
+        for pathToFileInExtractor in listOfPaths:
+            if (self.isFile(pathToFileInExtractor)):
+                filesMap[pathToFileInExtractor] = self.getDataFromFile(pathToFileInExtractor)
+        return filesMap
+
+    def extract(self, extractDir, stripDirectoriesDepth=1, listOfPathPatterns=[]) :
+        """
+        This function should be overridden by the extractors. If the
+        list of path patterns is not empty then only the members that
+        match a path pattern are extracted, otherwise every member is
+        extracted.
+
+        @return: Returns True if the file was extracted.
+        @rtype: Boolean
+
+        @param extractDir: The full path to directory for extraction.
+        @type extractDir: String
+        @param stripDirectoriesDepth: The number of leading
+        directories that will be removed.
+        @type stripDirectoriesDepth: Int
+        @param listOfPathPatterns: A list of path patterns that are
+        relative to the root of the report.
+        @type listOfPathPatterns: Array
+        """
         return False
 
+
+class DeferredExtractor :
+    """
+    This class wraps an extractor so that a report can do everything
+    that comes before the extraction, such as reading the hostname and
+    creating the extraction directory, while the extraction itself is
+    recorded and done later. This allows the extraction directories
+    to be chosen in a known order and the extractions to be ran in
+    other processes.
+
+    All functions other than extract() are passed to the extractor
+    that is wrapped.
+    """
+    def __init__(self, extractor):
+        """
+        @param extractor: The extractor that will be wrapped.
+        @type extractor: Extractor
+        """
+        self.__extractor = extractor
+        self.__extractDir = ""
+        self.__stripDirectoriesDepth = 1
+        self.__listOfPathPatterns = []
+
+    def __getattr__(self, name):
+        return getattr(self.__extractor, name)
+
+    def __str__(self):
+        return str(self.__extractor)
+
+    def getExtractor(self):
+        return self.__extractor
+
+    def getExtractDir(self):
+        """
+        Returns the path to the directory that the report requested to
+        be extracted to. Empty string is returned if extract() was not
+        called.
+
+        @return: Returns the path to the directory that the report
+        requested to be extracted to.
+        @rtype: String
+        """
+        return self.__extractDir
+
+    def getStripDirectoriesDepth(self):
+        return self.__stripDirectoriesDepth
+
+    def getPathPatterns(self):
+        return self.__listOfPathPatterns
+
+    def extract(self, extractDir, stripDirectoriesDepth=1, listOfPathPatterns=[]) :
+        """
+        Records the extraction that was requested and does not extract
+        anything. Returns True if the extraction directory exists.
+
+        @return: Returns True if the extraction directory exists.
+        @rtype: Boolean
+        """
+        self.__extractDir = extractDir
+        self.__stripDirectoriesDepth = stripDirectoriesDepth
+        self.__listOfPathPatterns = listOfPathPatterns
+        return os.path.isdir(extractDir)
+
+class ExtractionCache :
+    """
+    This class is a cache of extracted reports that is keyed by the
+    digest of the compressed file. When a compressed file that was
+    extracted before is extracted again then the files are hardlinked
+    from the cache instead of being decompressed again. If the cache
+    is on a different filesystem then the files are copied.
+
+    Each entry is a directory named after its key that contains the
+    extracted files in the directory "report" and the file "entry"
+    which records the compressed file that was extracted. The
+    modification time of the "entry" file is updated when the entry is
+    used, so that the entries used least recently are evicted first.
+
+    The files in the cache share their inodes with the extracted
+    reports, so the extracted files should not be modified in place.
+
+    @cvar DIGEST_BLOCK_SIZE: The number of bytes that are read at a time
+    when the digest of a file is created.
+    @type DIGEST_BLOCK_SIZE: Int
+    @cvar MAXIMUM_ENTRIES: The maximum number of entries in the cache.
+    @type MAXIMUM_ENTRIES: Int
+    @cvar MAXIMUM_SIZE: The maximum number of bytes of extracted files
+    in the cache.
+    @type MAXIMUM_SIZE: Int
+    @cvar DIGEST_MAP: A map of the real path to a file to a tuple of
+    the signature of the file and the digest of the file.
+    @type DIGEST_MAP: Dictionary
+    """
+    DIGEST_BLOCK_SIZE = 1048576
+    MAXIMUM_ENTRIES = 50
+    MAXIMUM_SIZE = 10737418240
+    DIGEST_MAP = {}
+
+    def __init__(self, pathToCacheDir=""):
+        """
+        @param pathToCacheDir: The path to the directory of the
+        cache. If empty then the directory "cache/extractions" in the
+        configuration directory is used.
+        @type pathToCacheDir: String
+        """
+        if (not len(pathToCacheDir) > 0):
+            pathToCacheDir = os.path.join(sx.SXConfigurationFiles.CONFIGURATION_DIR, "cache", "extractions")
+        self.__pathToCacheDir = pathToCacheDir
+
+    def getPathToCacheDir(self):
+        return self.__pathToCacheDir
+
+    def getDigest(pathToFile):
+        """
+        Returns the sha1 digest of the file from
+        FileUtil.getFileDigest(). The digest is kept until the size or
+        modification time of the file changes, so the file is only
+        hashed once. Empty string is returned if the file cannot be
+        read.
+
+        @return: Returns the sha1 digest of the file.
+        @rtype: String
+
+        @param pathToFile: The path to the file.
+        @type pathToFile: String
+        """
+        pathToFile = os.path.realpath(pathToFile)
+        fileSignature = ArchiveIndex.getFileSignature(pathToFile)
+        if (fileSignature == None):
+            return ""
+        if (ExtractionCache.DIGEST_MAP.has_key(pathToFile)):
+            (currentFileSignature, digest) = ExtractionCache.DIGEST_MAP.get(pathToFile)
+            if (currentFileSignature == fileSignature):
+                return digest
+        digest = FileUtil.getFileDigest(pathToFile, ExtractionCache.DIGEST_BLOCK_SIZE)
+        if (not len(digest) > 0):
+            return ""
+        ExtractionCache.DIGEST_MAP[pathToFile] = (fileSignature, digest)
+        return digest
+    getDigest = staticmethod(getDigest)
+
+    def getKey(self, pathToFile, stripDirectoriesDepth=1, listOfPathPatterns=[]):
+        """
+        Returns the key of the entry for the extraction of the
+        file. Empty string is returned if the digest of the file could
+        not be created.
+
+        @return: Returns the key of the entry for the extraction of the
+        file.
+        @rtype: String
+
+        @param pathToFile: The path to the compressed file.
+        @type pathToFile: String
+        @param stripDirectoriesDepth: The number of leading
+        directories that will be removed.
+        @type stripDirectoriesDepth: Int
+        @param listOfPathPatterns: The path patterns of the files that
+        will be extracted.
+        @type listOfPathPatterns: Array
+        """
+        digest = ExtractionCache.getDigest(pathToFile)
+        if (not len(digest) > 0):
+            return ""
+        key = "%s-%d" %(digest, stripDirectoriesDepth)
+        if (len(listOfPathPatterns) > 0):
+            # Only some of the files are extracted, so the patterns are
+            # part of the key.
+            key += "-%s" %(hashlib.sha1("\n".join(sorted(listOfPathPatterns))).hexdigest()[:12])
+        return key
+
+    def __linkTree(self, pathToSrcDir, pathToDstDir):
+        """
+        Recreates the directory tree in the destination directory
+        where each file is a hardlink to the file in the source
+        directory. If a hardlink cannot be created then the file is
+        copied. Symlinks are recreated.
+
+        @return: Returns True if all the files were linked or copied.
+        @rtype: Boolean
+
+        @param pathToSrcDir: The path to the directory that will be
+        linked.
+        @type pathToSrcDir: String
+        @param pathToDstDir: The path to the directory where the links
+        will be created.
+        @type pathToDstDir: String
+        """
+        listOfDirs = []
+        try:
+            for (pathToDir, dirnames, filenames) in os.walk(pathToSrcDir):
+                currentDstDir = os.path.join(pathToDstDir, os.path.relpath(pathToDir, pathToSrcDir))
+                if (not os.path.isdir(currentDstDir)):
+                    os.makedirs(currentDstDir)
+                listOfDirs.append((pathToDir, currentDstDir))
+                # The symlinks to directories are not walked.
+                for name in dirnames + filenames:
+                    pathToSrc = os.path.join(pathToDir, name)
+                    pathToDst = os.path.join(currentDstDir, name)
+                    if (os.path.islink(pathToSrc)):
+                        os.symlink(os.readlink(pathToSrc), pathToDst)
+                    elif (os.path.isfile(pathToSrc)):
+                        try:
+                            os.link(pathToSrc, pathToDst)
+                        except OSError:
+                            shutil.copy2(pathToSrc, pathToDst)
+            # The mode of the directories is set last in case a
+            # directory is not writable.
+            listOfDirs.reverse()
+            for (pathToSrc, pathToDst) in listOfDirs:
+                shutil.copystat(pathToSrc, pathToDst)
+        except (IOError, OSError, shutil.Error):
+            message = "There was an error linking the directory %s to the directory: %s." %(pathToSrcDir, pathToDstDir)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return False
+        return True
+
+    def __getListOfEntries(self):
+        """
+        Returns a list of tuples of the last time used, the size, and
+        the path to each entry in the cache sorted with the least
+        recently used entry first.
+
+        @return: Returns a list of tuples for each entry in the cache.
+        @rtype: Array
+        """
+        listOfEntries = []
+        if (not os.path.isdir(self.__pathToCacheDir)):
+            return listOfEntries
+        for filename in os.listdir(self.__pathToCacheDir):
+            pathToEntry = os.path.join(self.__pathToCacheDir, filename)
+            pathToEntryFile = os.path.join(pathToEntry, "entry")
+            if (not os.path.isfile(pathToEntryFile)):
+                continue
+            entrySize = 0
+            try:
+                fin = open(pathToEntryFile, "r")
+                for line in fin.readlines():
+                    if (line.startswith("size=")):
+                        entrySize = int(line.split("=", 1)[1])
+                fin.close()
+                listOfEntries.append((os.path.getmtime(pathToEntryFile), entrySize, pathToEntry))
+            except (IOError, OSError, ValueError):
+                message = "There was an error reading the file: %s." %(pathToEntryFile)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        listOfEntries.sort()
+        return listOfEntries
+
+    def get(self, key, extractDir):
+        """
+        Links the files of the entry into the extraction
+        directory. Returns False if there is no entry for the key or the
+        files could not be linked.
+
+        @return: Returns True if the files of the entry were linked into
+        the extraction directory.
+        @rtype: Boolean
+
+        @param key: The key of the entry.
+        @type key: String
+        @param extractDir: The full path to directory for extraction.
+        @type extractDir: String
+        """
+        pathToEntry = os.path.join(self.__pathToCacheDir, key)
+        pathToEntryFile = os.path.join(pathToEntry, "entry")
+        if ((not len(key) > 0) or (not os.path.isfile(pathToEntryFile))):
+            return False
+        if (not self.__linkTree(os.path.join(pathToEntry, "report"), extractDir)):
+            return False
+        try:
+            os.utime(pathToEntryFile, None)
+        except OSError:
+            pass
+        return True
+
+    def add(self, key, pathToFile, extractDir):
+        """
+        Adds the files in the extraction directory to the cache as the
+        entry for the key and then evicts the least recently used
+        entries if the cache is too large. The entry is created in a
+        temporary directory that is renamed when it is complete.
+
+        @return: Returns True if the entry was added.
+        @rtype: Boolean
+
+        @param key: The key of the entry.
+        @type key: String
+        @param pathToFile: The path to the compressed file that was
+        extracted.
+        @type pathToFile: String
+        @param extractDir: The full path to directory that the file was
+        extracted to.
+        @type extractDir: String
+        """
+        pathToEntry = os.path.join(self.__pathToCacheDir, key)
+        if ((not len(key) > 0) or (os.path.exists(pathToEntry))):
+            return False
+        pathToTmpEntry = "%s.tmp-%d" %(pathToEntry, os.getpid())
+        entrySize = 0
+        try:
+            if (not self.__linkTree(extractDir, os.path.join(pathToTmpEntry, "report"))):
+                raise OSError("The files could not be linked.")
+            for (pathToDir, dirnames, filenames) in os.walk(os.path.join(pathToTmpEntry, "report")):
+                for filename in filenames:
+                    entrySize += os.lstat(os.path.join(pathToDir, filename)).st_size
+            fout = open(os.path.join(pathToTmpEntry, "entry"), "w")
+            fout.write("file=%s\nsize=%d\n" %(os.path.realpath(pathToFile), entrySize))
+            fout.close()
+            os.rename(pathToTmpEntry, pathToEntry)
+        except (IOError, OSError):
+            message = "There was an error adding the file to the extraction cache: %s." %(pathToFile)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            shutil.rmtree(pathToTmpEntry, ignore_errors=True)
+            return False
+        message = "The extracted files were added to the extraction cache: %s." %(pathToEntry)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        self.evict()
+        return True
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the number of
+        entries and the size of the cache are within the limits.
+        """
+        listOfEntries = self.__getListOfEntries()
+        cacheSize = 0
+        for (lastUsed, entrySize, pathToEntry) in listOfEntries:
+            cacheSize += entrySize
+        while ((len(listOfEntries) > ExtractionCache.MAXIMUM_ENTRIES) or
+               ((len(listOfEntries) > 1) and (cacheSize > ExtractionCache.MAXIMUM_SIZE))):
+            (lastUsed, entrySize, pathToEntry) = listOfEntries.pop(0)
+            message = "Evicting the entry from the extraction cache: %s." %(pathToEntry)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            shutil.rmtree(pathToEntry, ignore_errors=True)
+            cacheSize -= entrySize
+
+class CachedExtractor :
+    """
+    This class wraps an extractor so that the files are linked from
+    the extraction cache if the compressed file was extracted
+    before. If the file was not extracted before then the extractor
+    extracts the file and the extracted files are added to the
+    extraction cache.
+
+    All functions other than extract() are passed to the extractor
+    that is wrapped.
+    """
+    def __init__(self, extractor, extractionCache):
+        """
+        @param extractor: The extractor that will be wrapped.
+        @type extractor: Extractor
+        @param extractionCache: The extraction cache.
+        @type extractionCache: ExtractionCache
+        """
+        self.__extractor = extractor
+        self.__extractionCache = extractionCache
+
+    def __getattr__(self, name):
+        return getattr(self.__extractor, name)
+
+    def __str__(self):
+        return str(self.__extractor)
+
+    def getExtractor(self):
+        return self.__extractor
+
+    def getExtractionCache(self):
+        return self.__extractionCache
+
+    def extract(self, extractDir, stripDirectoriesDepth=1, listOfPathPatterns=[]) :
+        """
+        Links the files from the extraction cache if there is an entry
+        for the file, otherwise the file is extracted and added to the
+        extraction cache.
+
+        @return: Returns True if the file was extracted.
+        @rtype: Boolean
+        """
+        pathToFile = self.__extractor.getPathToFile()
+        key = self.__extractionCache.getKey(pathToFile, stripDirectoriesDepth, listOfPathPatterns)
+        if (self.__extractionCache.get(key, extractDir)):
+            message = "The extracted files were linked from the extraction cache for the file: %s." %(pathToFile)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+            return True
+        if (not self.__extractor.extract(extractDir, stripDirectoriesDepth, listOfPathPatterns)):
+            return False
+        self.__extractionCache.add(key, pathToFile, extractDir)
+        return True
@@ -1,38 +1,304 @@
 #!/usr/bin/env python
 """
+Performs operations on a tarball that is archived with tar and
+compressed bzip2, gunzip, or xv.
+
+The python tarfile module is used in streaming mode to do all the
+functions, so that the compressed file is decompressed only once for
+each operation. Only an uncompressed tarball can be read at the offset
+of a member. A compressed tarball is decompressed from the start for
+every read, so the members that are needed should be read together
+with getDataFromFiles(). The GNU tar command is only used when the compression
+type is not supported by the tarfile module. In some instances
+"liblzma"(the python lzma module) will be needed to provide native
+support for xz.
+
+When a parallel decoder(pigz, pbzip2, lbzip2, pixz or xz -T0) is
+installed the compressed file can be decompressed by the decoder on
+multiple cores and piped into the tarfile module. The decompression
+backend is selected with Tarextractor.setDecompressionBackend().
+
+Thread about native xz support:
+http://bugs.python.org/issue6715
 
 @author    :  Shane Bradley
 @contact   :  sbradley@redhat.com
 @version   :  2.17
 @copyright :  GPLv2
 """
+import os
 import os.path
 import logging
 import mimetypes
 import subprocess
 import shutil
+import tarfile
+import copy
+import time
+import tempfile
+
+# The lzma module is only in the standard library for python 3, so the
+# GNU tar command is used for xz files when it cannot be imported.
+try:
+    import lzma
+except ImportError:
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
 
 import sx
 from sx.logwriter import LogWriter
 from sx.extractors import Extractor
+from sx.extractors import ArchiveIndex
+
+class DecoderPipe :
+    """
+    This class is a file object for reading the output of a decoder
+    process. Closing the pipe will stop the decoder if it has not
+    finished.
+    """
+    def __init__(self, command, pathToFile):
+        """
+        @param command: The command that will decode the file and write
+        to standard out.
+        @type command: Array
+        @param pathToFile: The path to the file that will be decoded.
+        @type pathToFile: String
+        """
+        self.__command = command
+        # True if the end of the output was read, so the decoder has
+        # exited or is about to exit on its own.
+        self.__isEndOfOutput = False
+        fin = open(pathToFile, "rb")
+        self.__devnull = open(os.devnull, "w")
+        try:
+            self.__task = subprocess.Popen(command, stdin=fin, stdout=subprocess.PIPE, stderr=self.__devnull)
+        finally:
+            fin.close()
+
+    def read(self, size=-1):
+        data = self.__task.stdout.read(size)
+        if ((not len(data) > 0) and (not size == 0)):
+            self.__isEndOfOutput = True
+        return data
+
+    def close(self):
+        """
+        Closes the pipe and waits for the decoder to exit. Returns True
+        if the decoder exited without an error.
+
+        @return: Returns True if the decoder exited without an error.
+        @rtype: Boolean
+        """
+        self.__task.stdout.close()
+        isTerminated = False
+        if ((not self.__isEndOfOutput) and (self.__task.poll() == None)):
+            # The decoder is stopped since the rest of the output will
+            # not be read.
+            try:
+                self.__task.terminate()
+                isTerminated = True
+            except OSError:
+                pass
+        self.__task.wait()
+        self.__devnull.close()
+        if ((self.__task.returncode > 0) or ((self.__task.returncode < 0) and (not isTerminated))):
+            message = "The decoder exited with an error(%d): %s." %(self.__task.returncode, " ".join(self.__command))
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return False
+        return True
 
 class Tarextractor(Extractor) :
+    """
+    @cvar COMMAND_INSTALLED_MAP: A map of the path to a command and if
+    the command was found to be installed, so that the command is only
+    ran once.
+    @type COMMAND_INSTALLED_MAP: Dictionary
+    @cvar MAXIMUM_SYMLINKS: The maximum number of symbolic links that
+    are followed when a path is resolved, so that a loop of links
+    does not run forever.
+    @type MAXIMUM_SYMLINKS: Int
+    @cvar BENCHMARK_BLOCK_SIZE: The number of bytes that are read at a
+    time from each member when the decompression is benchmarked.
+    @type BENCHMARK_BLOCK_SIZE: Int
+    @cvar DECOMPRESSION_BACKENDS: The list of decompression backends. The
+    "native" backend decompresses in python, the "parallel" backend
+    decompresses with a parallel decoder and the "auto" backend uses a
+    parallel decoder if one is installed.
+    @type DECOMPRESSION_BACKENDS: Array
+    @cvar DECOMPRESSION_BACKEND: The decompression backend that is used.
+    @type DECOMPRESSION_BACKEND: String
+    @cvar PARALLEL_DECODERS_MAP: A map of the compression type to the
+    list of parallel decoders that are tried in order. Each decoder
+    reads the compressed file from standard in and writes to standard
+    out.
+    @type PARALLEL_DECODERS_MAP: Dictionary
+    @cvar PATH_TO_COMMANDS_MAP: A map of the name of a command to the
+    path of the command that was found in the PATH.
+    @type PATH_TO_COMMANDS_MAP: Dictionary
+    @cvar STAGING_DIR: The path to the directory that the tarballs are
+    extracted to while they are indexed. If empty then the tarballs are
+    not extracted while they are indexed.
+    @type STAGING_DIR: String
+    @cvar STAGED_MAP: A map of the real path to a tarball to a tuple of
+    the signature of the tarball, the path to the directory it was
+    extracted to while it was indexed and the number of directories
+    that were stripped.
+    @type STAGED_MAP: Dictionary
+    """
+    COMMAND_INSTALLED_MAP = {}
+    MAXIMUM_SYMLINKS = 20
+    BENCHMARK_BLOCK_SIZE = 1048576
+    DECOMPRESSION_BACKENDS = ["auto", "native", "parallel"]
+    DECOMPRESSION_BACKEND = "auto"
+    PARALLEL_DECODERS_MAP = {"gzip":[["pigz", "-d", "-c"]],
+                             "bzip2":[["lbzip2", "-d", "-c"], ["pbzip2", "-d", "-c"]],
+                             "xz":[["pixz", "-d"], ["xz", "-d", "-c", "-T0"]]}
+    PATH_TO_COMMANDS_MAP = {}
+    STAGING_DIR = ""
+    STAGED_MAP = {}
+
     def __init__(self, pathToFile):
         Extractor.__init__(self, "TARextractor", pathToFile, "/bin/tar")
 
     def isCommandInstalled(self) :
+        if (Tarextractor.COMMAND_INSTALLED_MAP.has_key(self.getPathToCommand())):
+            return Tarextractor.COMMAND_INSTALLED_MAP.get(self.getPathToCommand())
         command = [self.getPathToCommand(), "--version"]
+        isInstalled = False
         try :
             tarTask = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             (stdout, stderr) = tarTask.communicate()
             if ((stdout.find("GNU") >= 0) or (tarTask.returncode  == 0)):
-                return True
-            else:
-                return False
+                isInstalled = True
         except OSError:
             message = "There was an error checking if the binary tar is installed."
             logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+        Tarextractor.COMMAND_INSTALLED_MAP[self.getPathToCommand()] = isInstalled
+        return isInstalled
+
+    def setDecompressionBackend(decompressionBackend):
+        """
+        Sets the decompression backend that is used by all the tar
+        extractors. Returns False if the decompression backend is not
+        known.
+
+        @return: Returns False if the decompression backend is not
+        known.
+        @rtype: Boolean
+
+        @param decompressionBackend: The name of the decompression
+        backend.
+        @type decompressionBackend: String
+        """
+        if (not decompressionBackend in Tarextractor.DECOMPRESSION_BACKENDS):
+            message = "The decompression backend is not known: %s." %(decompressionBackend)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
             return False
+        Tarextractor.DECOMPRESSION_BACKEND = decompressionBackend
+        return True
+    setDecompressionBackend = staticmethod(setDecompressionBackend)
+
+    def setStagingDir(pathToStagingDir):
+        """
+        Sets the path to the directory that the tarballs are extracted
+        to while they are indexed, so that a tarball that is extracted
+        after it is indexed is only decompressed once. If the path is
+        empty then the tarballs are not extracted while they are
+        indexed.
+
+        @param pathToStagingDir: The path to the directory that the
+        tarballs are extracted to while they are indexed.
+        @type pathToStagingDir: String
+        """
+        Tarextractor.STAGING_DIR = pathToStagingDir
+    setStagingDir = staticmethod(setStagingDir)
+
+    def clearStagedDirs():
+        """
+        Removes the directory that the tarballs were extracted to while
+        they were indexed, along with every extracted tarball that was
+        not used, and stops extracting the tarballs while they are
+        indexed.
+        """
+        if ((len(Tarextractor.STAGING_DIR) > 0) and (os.path.isdir(Tarextractor.STAGING_DIR))):
+            shutil.rmtree(Tarextractor.STAGING_DIR, True)
+        Tarextractor.STAGING_DIR = ""
+        Tarextractor.STAGED_MAP = {}
+    clearStagedDirs = staticmethod(clearStagedDirs)
+
+    def __findCommand(commandName):
+        """
+        Returns the path to the command if it is found in the PATH. An
+        empty string is returned if it is not found. The result is
+        cached so the PATH is only searched once for each command.
+
+        @return: Returns the path to the command if it is found in the
+        PATH.
+        @rtype: String
+
+        @param commandName: The name of the command.
+        @type commandName: String
+        """
+        if (not Tarextractor.PATH_TO_COMMANDS_MAP.has_key(commandName)):
+            pathToCommand = ""
+            for pathToDir in os.environ.get("PATH", "").split(os.pathsep):
+                currentPath = os.path.join(pathToDir, commandName)
+                if ((os.path.isfile(currentPath)) and (os.access(currentPath, os.X_OK))):
+                    pathToCommand = currentPath
+                    break
+            Tarextractor.PATH_TO_COMMANDS_MAP[commandName] = pathToCommand
+        return Tarextractor.PATH_TO_COMMANDS_MAP.get(commandName)
+    __findCommand = staticmethod(__findCommand)
+
+    def __getMemberType(tarinfo):
+        """
+        Returns the type of the member for the index of the tarball.
+
+        @return: Returns the type of the member for the index of the
+        tarball.
+        @rtype: String
+
+        @param tarinfo: The member of the tarball.
+        @type tarinfo: TarInfo
+        """
+        if (tarinfo.isfile()):
+            return ArchiveIndex.MEMBER_FILE
+        elif (tarinfo.isdir()):
+            return ArchiveIndex.MEMBER_DIR
+        elif (tarinfo.issym()):
+            return ArchiveIndex.MEMBER_SYMLINK
+        elif (tarinfo.islnk()):
+            return ArchiveIndex.MEMBER_HARDLINK
+        return ArchiveIndex.MEMBER_OTHER
+    __getMemberType = staticmethod(__getMemberType)
+
+    def getParallelDecoder(self, decompressionBackend=None):
+        """
+        Returns the command for the parallel decoder that will be used
+        to decompress the file. None is returned if the native backend
+        is used or there is no parallel decoder installed for the
+        compression type.
+
+        @return: Returns the command for the parallel decoder that will
+        be used to decompress the file.
+        @rtype: Array
+
+        @param decompressionBackend: The decompression backend. If None
+        then the decompression backend that was set is used.
+        @type decompressionBackend: String
+        """
+        if (decompressionBackend == None):
+            decompressionBackend = Tarextractor.DECOMPRESSION_BACKEND
+        if ((decompressionBackend == "native") or (not self.isValidMimeType())):
+            return None
+        compressionType = mimetypes.guess_type(self.getPathToFile())[1]
+        for command in Tarextractor.PARALLEL_DECODERS_MAP.get(compressionType, []):
+            pathToCommand = Tarextractor.__findCommand(command[0])
+            if (len(pathToCommand) > 0):
+                return [pathToCommand] + command[1:]
+        return None
 
     def isValidMimeType(self):
         mimetypes.init()
@@ -51,6 +317,56 @@ class Tarextractor(Extractor) :
             return True
         return False
 
+    def isNativeSupported(self):
+        """
+        Returns True if the tarfile module can read the compression
+        type of the file, either by decompressing the file itself or by
+        reading the output of a parallel decoder. If False then the GNU
+        tar command will be used.
+
+        @return: Returns True if the tarfile module can read the
+        compression type of the file.
+        @rtype: Boolean
+        """
+        if (not self.isValidMimeType()):
+            return False
+        elif (self.isNativeDecompressionSupported()):
+            return True
+        return (not self.getParallelDecoder() == None)
+
+    def isNativeDecompressionSupported(self):
+        """
+        Returns True if the tarfile module can decompress the file
+        itself without a parallel decoder.
+
+        @return: Returns True if the tarfile module can decompress the
+        file itself.
+        @rtype: Boolean
+        """
+        if (not self.isValidMimeType()):
+            return False
+        compressionType = mimetypes.guess_type(self.getPathToFile())[1]
+        if (compressionType in ["gzip", "bzip2", None]):
+            return True
+        elif ((compressionType == "xz") and (not lzma == None)):
+            return True
+        return False
+
+    def isRandomAccessSupported(self):
+        """
+        Returns True if a member can be read by seeking to its offset,
+        which is only true for a tarball that is not compressed. The
+        compressed streams have no seek points, so seeking forward
+        decompresses everything before the offset.
+
+        @return: Returns True if a member can be read by seeking to
+        its offset.
+        @rtype: Boolean
+        """
+        if (not self.isValidMimeType()):
+            return False
+        return (mimetypes.guess_type(self.getPathToFile())[1] == None)
+
     def getListArgs(self) :
         if (not self.isValidMimeType()):
             return None;
@@ -72,25 +388,515 @@ class Tarextractor(Extractor) :
         return None
 
     # ###########################################################################
-    # Extract, list, getDataFromFile functions
+    # Helper functions for streaming the tarball
     # ###########################################################################
-    def getDataFromFile(self, pathToFileInExtractor) :
+    def __getMemberPath(self, memberName):
+        """
+        Returns the path of the member relative to the root directory
+        of the report, which is the path without the first directory.
+
+        @return: Returns the path of the member relative to the root
+        directory of the report.
+        @rtype: String
+
+        @param memberName: The name of the member in the tarball.
+        @type memberName: String
+        """
+        splitItem = memberName.strip("/").split("/", 1)
+        if (len(splitItem) >= 2):
+            return splitItem[1]
+        return splitItem[0]
+
+    def __stripMemberName(self, memberName, stripDirectoriesDepth):
+        """
+        Returns the name of the member with the leading directories
+        removed, the same way that "--strip-components" does with the
+        GNU tar command. An empty string is returned if there is nothing
+        left after stripping or the path is not safe to extract.
+
+        @return: Returns the name of the member with the leading
+        directories removed.
+        @rtype: String
+
+        @param memberName: The name of the member in the tarball.
+        @type memberName: String
+        @param stripDirectoriesDepth: The number of leading directories
+        that will be removed.
+        @type stripDirectoriesDepth: Int
+        """
+        components = []
+        for component in memberName.split("/"):
+            if ((len(component) > 0) and (not component == ".")):
+                components.append(component)
+        if (".." in components):
+            return ""
+        return "/".join(components[stripDirectoriesDepth:])
+
+    def __openStream(self, decompressionBackend=None):
+        """
+        Returns a tuple of the TarFile object opened in streaming mode
+        and the file object it reads from(None if the TarFile object
+        owns the file). The file object has to be closed after the
+        TarFile is closed.
+
+        If a parallel decoder is used then the TarFile reads from the
+        output of the decoder.
+
+        @return: Returns a tuple of the TarFile object opened in
+        streaming mode and the file object it reads from.
+        @rtype: Tuple
+
+        @param decompressionBackend: The decompression backend. If None
+        then the decompression backend that was set is used.
+        @type decompressionBackend: String
+        """
+        decoderCommand = self.getParallelDecoder(decompressionBackend)
+        if (not decoderCommand == None):
+            message = "Decompressing the file with the command: %s %s" %(" ".join(decoderCommand), self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            fileobj = DecoderPipe(decoderCommand, self.getPathToFile())
+            try:
+                return (tarfile.open(fileobj=fileobj, mode="r|"), fileobj)
+            except:
+                fileobj.close()
+                raise
+        compressionType = mimetypes.guess_type(self.getPathToFile())[1]
+        if (compressionType == "xz"):
+            fileobj = lzma.LZMAFile(self.getPathToFile(), "rb")
+            return (tarfile.open(fileobj=fileobj, mode="r|"), fileobj)
+        return (tarfile.open(self.getPathToFile(), mode="r|*"), None)
+
+    def __closeStream(self, tar, fileobj):
+        """
+        Closes the TarFile object and the file object it reads from.
+        Returns False if the file object is the output of a parallel
+        decoder that exited with an error, since the TarFile object sees
+        the end of the output of a failed decoder as the end of the
+        tarball.
+
+        @return: Returns False if the parallel decoder exited with an
+        error.
+        @rtype: Boolean
+
+        @param tar: The TarFile object.
+        @type tar: TarFile
+        @param fileobj: The file object the TarFile reads from.
+        @type fileobj: File
+        """
+        if (not tar == None):
+            tar.close()
+        if (isinstance(fileobj, DecoderPipe)):
+            return fileobj.close()
+        elif (not fileobj == None):
+            fileobj.close()
+        return True
+
+    def __retryWithNativeBackend(self, decompressionBackend):
+        """
+        Returns True if the file was decompressed with a parallel decoder
+        that failed and the tarfile module can decompress the file
+        itself. A message is logged either way.
+
+        @return: Returns True if the file can be decompressed again with
+        the native backend.
+        @rtype: Boolean
+
+        @param decompressionBackend: The decompression backend that was
+        used.
+        @type decompressionBackend: String
+        """
+        if ((not decompressionBackend == "native") and (self.isNativeDecompressionSupported())):
+            message = "The parallel decoder failed on the file, so it will be decompressed again with the tarfile module: %s." %(self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
+            return True
+        message = "The parallel decoder failed on the file: %s." %(self.getPathToFile())
+        logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+        return False
+
+    def __readMember(self, member):
+        """
+        Returns the contents of a member by seeking to the offset of the
+        member in an uncompressed tarball. An empty list is returned if
+        there was an error.
+
+        @return: Returns an array of Strings, where each newline in
+        the member is an item in the array.
+        @rtype: Array
+
+        @param member: The tuple of the member that was found in the
+        index.
+        @type member: Tuple
+        """
+        (memberName, size, offset, memberType, linkname) = member
+        fileContents = []
+        tar = None
+        try:
+            tar = tarfile.open(self.getPathToFile(), mode="r:")
+            # The header of the member is read again from its offset,
+            # since the index does not keep the members of the tarfile
+            # module.
+            tar.fileobj.seek(offset)
+            tarinfo = tarfile.TarInfo.fromtarfile(tar)
+            if (tarinfo.offset == offset):
+                fin = tar.extractfile(tarinfo)
+                if (not fin == None):
+                    fileContents = fin.readlines()
+                    fin.close()
+        except (tarfile.TarError, EnvironmentError, EOFError):
+            message = "There was an error reading the member %s from the file: %s." %(memberName, self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        finally:
+            if (not tar == None):
+                tar.close()
+        return fileContents
+
+    def __readMembers(self, listOfOffsets):
+        """
+        Returns a map of the offset of each member to the contents of
+        the member. The members are read in a single streaming pass that
+        stops after the last member, since a compressed tarball can
+        only be read from the start. The members that could not be read
+        are not in the map.
+
+        @return: Returns a map of the offset of each member to an array
+        of Strings, where each newline in the member is an item in the
+        array.
+        @rtype: Dictionary
+
+        @param listOfOffsets: The offsets of the members that were
+        found in the index.
+        @type listOfOffsets: Array
+        """
+        (membersMap, isDecoded) = self.__readMembersWithTarfile(listOfOffsets)
+        if ((not isDecoded) and (self.__retryWithNativeBackend(Tarextractor.DECOMPRESSION_BACKEND))):
+            (membersMap, isDecoded) = self.__readMembersWithTarfile(listOfOffsets, "native")
+        if (not isDecoded):
+            return {}
+        return membersMap
+
+    def __readMembersWithTarfile(self, listOfOffsets, decompressionBackend=None):
+        """
+        Returns a tuple of the map of the offset of each member to the
+        contents of the member and whether the tarball was decoded
+        without an error.
+
+        @return: Returns a tuple of the map of the offset of each member
+        to the contents of the member and whether the tarball was
+        decoded without an error.
+        @rtype: Tuple
+
+        @param listOfOffsets: The offsets of the members that were
+        found in the index.
+        @type listOfOffsets: Array
+        @param decompressionBackend: The decompression backend. If None
+        then the decompression backend that was set is used.
+        @type decompressionBackend: String
+        """
+        offsetsMap = {}
+        for offset in listOfOffsets:
+            offsetsMap[offset] = True
+        if (not len(offsetsMap.keys()) > 0):
+            return ({}, True)
+        lastOffset = max(offsetsMap.keys())
+        membersMap = {}
+        (tar, fileobj) = (None, None)
+        isDecoded = True
+        try:
+            (tar, fileobj) = self.__openStream(decompressionBackend)
+            for currentTarinfo in tar:
+                if (offsetsMap.has_key(currentTarinfo.offset)):
+                    fin = tar.extractfile(currentTarinfo)
+                    if (not fin == None):
+                        membersMap[currentTarinfo.offset] = fin.readlines()
+                        fin.close()
+                if (currentTarinfo.offset >= lastOffset):
+                    break
+        except (tarfile.TarError, EnvironmentError, EOFError):
+            message = "There was an error reading the members from the file: %s." %(self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        finally:
+            isDecoded = self.__closeStream(tar, fileobj)
+        return (membersMap, isDecoded)
+
+    def __getSelectedPaths(self, listOfPathPatterns, stripDirectoriesDepth):
+        """
+        Returns a map of the stripped names of the members that match
+        the path patterns. The targets of links that match are added as
+        well, so that links in the report are not left dangling. None
+        is returned if the tarball could not be indexed.
+
+        @return: Returns a map of the stripped names of the members
+        that match the path patterns.
+        @rtype: Dictionary
+
+        @param listOfPathPatterns: A list of path patterns that are
+        relative to the root of the report.
+        @type listOfPathPatterns: Array
+        @param stripDirectoriesDepth: The number of leading directories
+        that will be removed.
+        @type stripDirectoriesDepth: Int
+        """
+        archiveIndex = self.getArchiveIndex()
+        if (archiveIndex == None):
+            return None
+        selectedPathsMap = {}
+        for memberName in archiveIndex.getMemberNames():
+            strippedName = self.__stripMemberName(memberName, stripDirectoriesDepth)
+            if ((not len(strippedName) > 0) or (not Extractor.isMatchingPath(strippedName, listOfPathPatterns))):
+                continue
+            selectedPathsMap[strippedName] = True
+            member = archiveIndex.getMember(self.__getMemberPath(memberName))
+            if (member == None):
+                continue
+            (memberName, size, offset, memberType, linkname) = member
+            if (memberType == ArchiveIndex.MEMBER_SYMLINK):
+                linkTarget = os.path.normpath(os.path.join(os.path.dirname(strippedName), linkname))
+                if ((not linkname.startswith("/")) and (not linkTarget.startswith(".."))):
+                    selectedPathsMap[linkTarget] = True
+            elif (memberType == ArchiveIndex.MEMBER_HARDLINK):
+                linkTarget = self.__stripMemberName(linkname, stripDirectoriesDepth)
+                if (len(linkTarget) > 0):
+                    selectedPathsMap[linkTarget] = True
+        return selectedPathsMap
+
+    def buildArchiveIndex(self):
+        """
+        Returns a new index of the tarball. When the tarfile module is
+        used, the index is built in a single streaming pass that also
+        captures the contents of the probe files. If a staging directory
+        is set then the tarball is extracted in the same pass, so that
+        extracting the tarball later does not decompress it again. None
+        is returned if there was an error reading the tarball.
+
+        @return: Returns a new index of the tarball.
+        @rtype: ArchiveIndex
+        """
+        archiveIndex = ArchiveIndex(self.getPathToFile())
+        if (not self.isNativeSupported()):
+            for memberName in Extractor.list(self):
+                archiveIndex.add(memberName, self.__getMemberPath(memberName))
+            return archiveIndex
+        (archiveIndex, isDecoded) = self.__buildArchiveIndexWithTarfile()
+        if ((not isDecoded) and (self.__retryWithNativeBackend(Tarextractor.DECOMPRESSION_BACKEND))):
+            (archiveIndex, isDecoded) = self.__buildArchiveIndexWithTarfile("native")
+        if (not isDecoded):
+            return None
+        return archiveIndex
+
+    def __createStagedDir(self):
+        """
+        Returns the path to a new directory under the staging directory
+        that the tarball is extracted to while it is indexed. An empty
+        string is returned if there is no staging directory or the
+        directory could not be created.
+
+        @return: Returns the path to a new directory under the staging
+        directory.
+        @rtype: String
+        """
+        if (not len(Tarextractor.STAGING_DIR) > 0):
+            return ""
+        try:
+            if (not os.path.isdir(Tarextractor.STAGING_DIR)):
+                os.makedirs(Tarextractor.STAGING_DIR)
+            return tempfile.mkdtemp(dir=Tarextractor.STAGING_DIR)
+        except (IOError, os.error):
+            message = "The staging directory could not be created, so the file will not be extracted while it is indexed: %s." %(self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return ""
+
+    def __buildArchiveIndexWithTarfile(self, decompressionBackend=None):
+        """
+        Returns a tuple of a new index of the tarball that is built in a
+        single streaming pass with the tarfile module and False if the
+        parallel decoder failed. The index is None if there was an error
+        reading the tarball.
+
+        If a staging directory is set then each member is extracted to a
+        new directory under the staging directory as it is indexed, with
+        the first directory stripped.
+
+        @return: Returns a tuple of a new index of the tarball and False
+        if the parallel decoder failed.
+        @rtype: Tuple
+
+        @param decompressionBackend: The decompression backend. If None
+        then the decompression backend that was set is used.
+        @type decompressionBackend: String
+        """
+        archiveIndex = ArchiveIndex(self.getPathToFile())
+        capturePaths = {}
+        for pathToFile in Extractor.PROBE_FILES:
+            capturePaths[pathToFile] = True
+        pathToStagedDir = self.__createStagedDir()
+        directories = []
+        links = []
+        (tar, fileobj) = (None, None)
+        isDecoded = True
+        try:
+            (tar, fileobj) = self.__openStream(decompressionBackend)
+            for tarinfo in tar:
+                memberName = tarinfo.name
+                if (tarinfo.isdir()):
+                    memberName = "%s/" %(memberName.rstrip("/"))
+                memberPath = self.__getMemberPath(tarinfo.name)
+                archiveIndex.add(memberName, memberPath, tarinfo.size, tarinfo.offset, Tarextractor.__getMemberType(tarinfo), tarinfo.linkname)
+                if (len(pathToStagedDir) > 0):
+                    # A member cannot be read again from the stream after
+                    # it is extracted, so the probe files are read from
+                    # the staged directory.
+                    strippedName = self.__extractStreamedMember(tar, tarinfo, pathToStagedDir, 1, None, directories, links)
+                    pathToStagedFile = os.path.join(pathToStagedDir, strippedName)
+                    if ((capturePaths.has_key(memberPath)) and (tarinfo.isfile()) and (len(strippedName) > 0) and
+                        (os.path.isfile(pathToStagedFile)) and (not os.path.islink(pathToStagedFile))):
+                        fin = open(pathToStagedFile, "r")
+                        archiveIndex.addCapturedFile(memberPath, fin.readlines())
+                        fin.close()
+                elif ((capturePaths.has_key(memberPath)) and (tarinfo.isfile())):
+                    fin = tar.extractfile(tarinfo)
+                    archiveIndex.addCapturedFile(memberPath, fin.readlines())
+                    fin.close()
+            if (len(pathToStagedDir) > 0):
+                self.__finishExtraction(tar, pathToStagedDir, directories, links)
+        except (tarfile.TarError, EnvironmentError, EOFError):
+            message = "There was an error reading the file: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            archiveIndex = None
+        finally:
+            isDecoded = self.__closeStream(tar, fileobj)
+        if (len(pathToStagedDir) > 0):
+            if ((archiveIndex == None) or (not isDecoded)):
+                shutil.rmtree(pathToStagedDir, True)
+            else:
+                Tarextractor.STAGED_MAP[os.path.realpath(self.getPathToFile())] = (ArchiveIndex.getFileSignature(self.getPathToFile()), pathToStagedDir, 1)
+        return (archiveIndex, isDecoded)
+
+    def getDecompressionBenchmarks(self):
+        if (not self.isValidMimeType()):
+            return []
+        listOfBackends = ["native", "parallel"]
+        if (not self.isNativeDecompressionSupported()):
+            listOfBackends.remove("native")
+        listOfBenchmarks = []
+        for decompressionBackend in listOfBackends:
+            decoderCommand = self.getParallelDecoder(decompressionBackend)
+            decoderName = "tarfile"
+            if (not decoderCommand == None):
+                decoderName = " ".join([os.path.basename(decoderCommand[0])] + decoderCommand[1:])
+            elif (decompressionBackend == "parallel"):
+                continue
+            bytesCount = 0
+            startTime = time.time()
+            (tar, fileobj) = (None, None)
+            try:
+                (tar, fileobj) = self.__openStream(decompressionBackend)
+                for tarinfo in tar:
+                    if (tarinfo.isfile()):
+                        fin = tar.extractfile(tarinfo)
+                        data = fin.read(Tarextractor.BENCHMARK_BLOCK_SIZE)
+                        while (len(data) > 0):
+                            bytesCount += len(data)
+                            data = fin.read(Tarextractor.BENCHMARK_BLOCK_SIZE)
+                        fin.close()
+            except (tarfile.TarError, EnvironmentError, EOFError):
+                message = "There was an error reading the file: %s." % (self.getPathToFile())
+                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                bytesCount = -1
+            finally:
+                if (not self.__closeStream(tar, fileobj)):
+                    message = "The decoder %s failed reading the file: %s." % (decoderName, self.getPathToFile())
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                    bytesCount = -1
+            if (bytesCount < 0):
+                continue
+            listOfBenchmarks.append((decompressionBackend, decoderName, time.time() - startTime, bytesCount))
+        return listOfBenchmarks
+
+    # ###########################################################################
+    # Functions for reading a report without extracting it
+    # ###########################################################################
+    def resolvePath(self, pathToFileInExtractor):
+        """
+        Returns the path of the member that a path refers to after the
+        symbolic links in the path are followed. Absolute links are
+        followed from the root of the report. The path is returned
+        unresolved when the tarfile module cannot be used.
+
+        @return: Returns the path of the member that a path refers to.
+        @rtype: String
+
+        @param pathToFileInExtractor: The path relative to the root of
+        the report.
+        @type pathToFileInExtractor: String
+        """
+        archiveIndex = self.getArchiveIndex()
+        if ((archiveIndex == None) or (not self.isNativeSupported())):
+            return Extractor.resolvePath(self, pathToFileInExtractor)
+        components = pathToFileInExtractor.split("/")
+        resolvedPath = ""
+        symlinkCount = 0
+        while (len(components) > 0):
+            component = components.pop(0)
+            if ((not len(component) > 0) or (component == ".")):
+                continue
+            elif (component == ".."):
+                resolvedPath = os.path.dirname(resolvedPath)
+                continue
+            currentPath = os.path.join(resolvedPath, component)
+            member = archiveIndex.getMember(currentPath)
+            if ((not member == None) and (member[3] == ArchiveIndex.MEMBER_SYMLINK) and (symlinkCount < Tarextractor.MAXIMUM_SYMLINKS)):
+                symlinkCount += 1
+                linkname = member[4]
+                if (linkname.startswith("/")):
+                    resolvedPath = ""
+                components = linkname.split("/") + components
+            else:
+                resolvedPath = currentPath
+        return resolvedPath
+
+    def __getFileMember(self, pathToFileInExtractor):
+        """
+        Returns the tuple of the member for a regular file that a path
+        refers to after links are followed. None is returned if the path
+        does not refer to a regular file.
+
+        @return: Returns the tuple of the member for a regular file that
+        a path refers to.
+        @rtype: Tuple
+
+        @param pathToFileInExtractor: The path relative to the root of
+        the report.
+        @type pathToFileInExtractor: String
+        """
+        archiveIndex = self.getArchiveIndex()
+        if (archiveIndex == None):
+            return None
+        member = archiveIndex.getMember(self.resolvePath(pathToFileInExtractor))
+        if ((not member == None) and (member[3] == ArchiveIndex.MEMBER_HARDLINK)):
+            # A hard link is read from the member that it links to.
+            member = archiveIndex.getMember(self.__getMemberPath(member[4]))
+        if ((not member == None) and (member[3] == ArchiveIndex.MEMBER_FILE)):
+            return member
+        return None
+
+    def getFileSize(self, pathToFileInExtractor):
+        if (not self.isNativeSupported()):
+            return Extractor.getFileSize(self, pathToFileInExtractor)
+        member = self.__getFileMember(pathToFileInExtractor)
+        if (member == None):
+            return -1
+        return member[1]
+
+    # ###########################################################################
+    # Functions that use the GNU tar command
+    # ###########################################################################
+    def __getDataFromFileWithCommand(self, pathToFileInExtractor) :
         # Get the path that is contained in the tarball, since path
         # that is passed to function is relative path.
-        fileList =  self.list()
         fullPathToFile = ""
-        for item in fileList:
-            splitItem = item.split("/", 1)
-            # Strip any leading slashes because the result will not
-            # contain one.
-            if (len(splitItem) == 1):
-                if (splitItem[0] == pathToFileInExtractor.strip("/")):
-                    fullPathToFile = item
-                    break;
-            elif (len(splitItem) >= 2):
-                if (splitItem[1] == pathToFileInExtractor.strip("/")):
-                    fullPathToFile = item
-                    break;
+        archiveIndex = self.getArchiveIndex()
+        if (not archiveIndex == None):
+            fullPathToFile = archiveIndex.getMemberName(pathToFileInExtractor)
         # Get the options to extract
         commandOptions = self.getExtractArgs()
         if (commandOptions == None) :
@@ -100,37 +906,44 @@ class Tarextractor(Extractor) :
             message = "The path to the file does not exist: %s" %(pathToFileInExtractor)
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
         else:
-            # ###################################################################
-            # Create a tmp directory to extract the file
-            # ###################################################################
-            if (not os.access(Extractor.PATH_TO_TEMP_DIR, os.F_OK)):
+            # The member is written to standard out so that it can be
+            # read without being written to disk.
+            command = [self.getPathToCommand(), "-xOf", self.getPathToFile(), fullPathToFile]
+            fileExtractedContents = []
+            devnull = open(os.devnull, "w")
+            try:
+                task = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=devnull)
                 try:
-                    os.makedirs(Extractor.PATH_TO_TEMP_DIR)
-                except (IOError, os.error):
-                    message = "Could not create the directory to extract file to: %s" % (Extractor.PATH_TO_TEMP_DIR)
-                    logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-            command = [self.getPathToCommand(), commandOptions, self.getPathToFile(), "-C", Extractor.PATH_TO_TEMP_DIR, "--strip-components", "0", fullPathToFile]
-            task = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            (stdout, stderr) = task.communicate()
-            if (not task.returncode  == 0):
+                    fileExtractedContents = task.stdout.readlines()
+                finally:
+                    task.stdout.close()
+                    task.wait()
+            except (IOError, OSError):
+                task = None
+            devnull.close()
+            if ((task == None) or (not task.returncode == 0)):
                 message = "There was an error extracting a file from the file: %s." % (self.getPathToFile())
                 logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-            else:
-                fileExtractedContents = []
-                pathToExtractedFile = os.path.join(Extractor.PATH_TO_TEMP_DIR, fullPathToFile)
-                # Extract the contents of the file to an array
-                if (os.path.isfile(pathToExtractedFile)):
-                    try:
-                        fout = open(pathToExtractedFile, "r")
-                        fileExtractedContents = fout.readlines()
-                        fout.close
-                    except (IOError, os.error, KeyError):
-                        message = "There was a problem reading a file that was extracted from a tarfile: %s" %(pathToExtractedFile)
-                        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-                return fileExtractedContents
+                return []
+            return fileExtractedContents
         return []
 
-    def extract(self, extractDir, stripDirectoriesDepth=1) :
+    def __extractWithCommand(self, extractDir, stripDirectoriesDepth=1, listOfPathPatterns=[]) :
+        # The members that match are given to the command, otherwise
+        # the command extracts every member.
+        listOfMemberNames = []
+        if (len(listOfPathPatterns) > 0):
+            selectedPathsMap = self.__getSelectedPaths(listOfPathPatterns, stripDirectoriesDepth)
+            if (selectedPathsMap == None):
+                return False
+            for memberName in self.list():
+                if ((not memberName.endswith("/")) and
+                    (selectedPathsMap.has_key(self.__stripMemberName(memberName, stripDirectoriesDepth)))):
+                    listOfMemberNames.append(memberName)
+            if (not len(listOfMemberNames) > 0):
+                message = "There was no files in %s that matched the files required for extraction." %(self.getPathToFile())
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+                return os.path.isdir(extractDir)
         commandOptions = self.getExtractArgs()
         if (commandOptions == None) :
             message =  "This file is unknown type and will not be extracted: %s." %(self.getPathToFile())
@@ -149,6 +962,7 @@ class Tarextractor(Extractor) :
             message = "%s %s %s -C %s --strip-components %s %s" %(self.getPathToCommand(), commandOptions, self.getPathToFile(), extractDir, str(stripDirectoriesDepth), excludedFiles)
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
             command = [self.getPathToCommand(), commandOptions, self.getPathToFile(), "-C", extractDir, "--strip-components", str(stripDirectoriesDepth), excludedFiles]
+            command += listOfMemberNames
             task = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             (stdout, stderr) = task.communicate()
             if (not task.returncode  == 0):
@@ -158,3 +972,327 @@ class Tarextractor(Extractor) :
                 return os.path.isdir(extractDir)
         return False
 
+    # ###########################################################################
+    # Extract, list, getDataFromFile functions
+    # ###########################################################################
+    def list(self) :
+        archiveIndex = self.getArchiveIndex()
+        if (archiveIndex == None):
+            return []
+        return archiveIndex.getMemberNames()
+
+    def getDataFromFile(self, pathToFileInExtractor) :
+        if (not self.isNativeSupported()):
+            return self.__getDataFromFileWithCommand(pathToFileInExtractor)
+        archiveIndex = self.getArchiveIndex()
+        if (not archiveIndex == None):
+            fileContents = archiveIndex.getCapturedFile(pathToFileInExtractor)
+            if (fileContents == None):
+                fileContents = archiveIndex.getCapturedFile(self.resolvePath(pathToFileInExtractor))
+            if (not fileContents == None):
+                return fileContents
+            member = self.__getFileMember(pathToFileInExtractor)
+            if ((not member == None) and (self.isRandomAccessSupported())):
+                return self.__readMember(member)
+            elif (not member == None):
+                return self.__readMembers([member[2]]).get(member[2], [])
+        message = "The path to the file does not exist: %s" %(pathToFileInExtractor)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return []
+
+    def getDataFromFiles(self, listOfPaths):
+        archiveIndex = self.getArchiveIndex()
+        if ((not self.isNativeSupported()) or (archiveIndex == None) or (self.isRandomAccessSupported())):
+            return Extractor.getDataFromFiles(self, listOfPaths)
+        filesMap = {}
+        # A map of the path to the offset of the member.
+        offsetsMap = {}
+        for pathToFileInExtractor in listOfPaths:
+            fileContents = archiveIndex.getCapturedFile(pathToFileInExtractor)
+            if (fileContents == None):
+                fileContents = archiveIndex.getCapturedFile(self.resolvePath(pathToFileInExtractor))
+            if (not fileContents == None):
+                filesMap[pathToFileInExtractor] = fileContents
+                continue
+            member = self.__getFileMember(pathToFileInExtractor)
+            if (not member == None):
+                offsetsMap[pathToFileInExtractor] = member[2]
+        if (len(offsetsMap.keys()) > 0):
+            membersMap = self.__readMembers(offsetsMap.values())
+            for pathToFileInExtractor in offsetsMap.keys():
+                filesMap[pathToFileInExtractor] = membersMap.get(offsetsMap.get(pathToFileInExtractor), [])
+        return filesMap
+
+    def extract(self, extractDir, stripDirectoriesDepth=1, listOfPathPatterns=[]) :
+        if (not self.isNativeSupported()):
+            return self.__extractWithCommand(extractDir, stripDirectoriesDepth, listOfPathPatterns)
+        message = "Extracting the file with the tarfile module: %s to %s with %d directories stripped." %(self.getPathToFile(), extractDir, stripDirectoriesDepth)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        # If there are path patterns then only the members that were
+        # selected from the index are extracted.
+        selectedPathsMap = None
+        if (len(listOfPathPatterns) > 0):
+            selectedPathsMap = self.__getSelectedPaths(listOfPathPatterns, stripDirectoriesDepth)
+            if (selectedPathsMap == None):
+                return False
+            message = "There are %d members of %s that will be extracted." %(len(selectedPathsMap.keys()), self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        elif (self.__moveStagedDir(extractDir, stripDirectoriesDepth)):
+            return True
+        result = self.__extractWithTarfile(extractDir, stripDirectoriesDepth, selectedPathsMap)
+        if ((result == None) and (self.__retryWithNativeBackend(Tarextractor.DECOMPRESSION_BACKEND))):
+            result = self.__extractWithTarfile(extractDir, stripDirectoriesDepth, selectedPathsMap, "native")
+        return (result == True)
+
+    def __moveStagedDir(self, extractDir, stripDirectoriesDepth):
+        """
+        Returns True if the tarball was extracted to the staging
+        directory while it was indexed and the staged directory was
+        moved to the extract directory. The staged directory is only
+        used if the tarball has not changed since it was indexed, the
+        same number of directories were stripped and the extract
+        directory is empty.
+
+        @return: Returns True if the staged directory was moved to the
+        extract directory.
+        @rtype: Boolean
+
+        @param extractDir: The full path to directory for extraction.
+        @type extractDir: String
+        @param stripDirectoriesDepth: The number of leading directories
+        that will be removed.
+        @type stripDirectoriesDepth: Int
+        """
+        stagedItem = Tarextractor.STAGED_MAP.pop(os.path.realpath(self.getPathToFile()), None)
+        if (stagedItem == None):
+            return False
+        (fileSignature, pathToStagedDir, stagedDepth) = stagedItem
+        if ((stagedDepth == stripDirectoriesDepth) and (fileSignature == ArchiveIndex.getFileSignature(self.getPathToFile()))):
+            try:
+                # The staged directory is only readable by the owner, so
+                # it is given the mode of the directory it replaces.
+                dirMode = 0755
+                if (os.path.isdir(extractDir)):
+                    dirMode = os.stat(extractDir).st_mode & 07777
+                    os.rmdir(extractDir)
+                os.rename(pathToStagedDir, extractDir)
+                os.chmod(extractDir, dirMode)
+                message = "The file was extracted while it was indexed: %s to %s." %(self.getPathToFile(), extractDir)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+                return True
+            except (IOError, os.error):
+                message = "The directory the file was extracted to while it was indexed could not be moved to: %s." %(extractDir)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+                try:
+                    if (not os.path.isdir(extractDir)):
+                        os.makedirs(extractDir)
+                except (IOError, os.error):
+                    pass
+        shutil.rmtree(pathToStagedDir, True)
+        return False
+
+    def __isInsideDir(self, pathToFile, pathToDir):
+        """
+        Returns True if the path resolves to the directory or a path
+        under the directory after all the symbolic links are followed.
+
+        @return: Returns True if the path resolves to a path under the
+        directory.
+        @rtype: Boolean
+
+        @param pathToFile: The path that will be resolved.
+        @type pathToFile: String
+        @param pathToDir: The path to the directory.
+        @type pathToDir: String
+        """
+        realPathToFile = os.path.realpath(pathToFile)
+        realPathToDir = os.path.realpath(pathToDir)
+        return ((realPathToFile == realPathToDir) or (realPathToFile.startswith(realPathToDir.rstrip("/") + "/")))
+
+    def __isSafeMember(self, tarinfo, extractDir):
+        """
+        Returns True if the member can be extracted without writing
+        outside of the extract directory. The parent directory of the
+        member cannot resolve through a symbolic link to outside of the
+        extract directory, and the target of a link cannot be absolute
+        or resolve to outside of the extract directory.
+
+        @return: Returns True if the member can be extracted without
+        writing outside of the extract directory.
+        @rtype: Boolean
+
+        @param tarinfo: The member with the stripped name.
+        @type tarinfo: TarInfo
+        @param extractDir: The full path to directory for extraction.
+        @type extractDir: String
+        """
+        pathToMember = os.path.join(extractDir, tarinfo.name)
+        if (not self.__isInsideDir(os.path.dirname(pathToMember), extractDir)):
+            return False
+        elif (tarinfo.issym()):
+            if (tarinfo.linkname.startswith("/")):
+                return False
+            return self.__isInsideDir(os.path.join(os.path.dirname(pathToMember), tarinfo.linkname), extractDir)
+        elif (tarinfo.islnk()):
+            return self.__isInsideDir(os.path.join(extractDir, tarinfo.linkname), extractDir)
+        return True
+
+    def __extractMember(self, tar, tarinfo, extractDir):
+        """
+        Extracts the member if it is safe to extract. A message is logged
+        if the member is skipped or there was an error.
+
+        @param tar: The TarFile object.
+        @type tar: TarFile
+        @param tarinfo: The member with the stripped name.
+        @type tarinfo: TarInfo
+        @param extractDir: The full path to directory for extraction.
+        @type extractDir: String
+        """
+        if (not self.__isSafeMember(tarinfo, extractDir)):
+            message = "The member %s will not be extracted because it would be written outside of the directory: %s." %(tarinfo.name, extractDir)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
+            return
+        try:
+            tar.extract(tarinfo, extractDir)
+        except (EnvironmentError, tarfile.TarError):
+            message = "There was an error extracting the member %s from the file: %s." %(tarinfo.name, self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+
+    def __extractStreamedMember(self, tar, tarinfo, extractDir, stripDirectoriesDepth, selectedPathsMap, directories, links):
+        """
+        Extracts the member that was just read from the TarFile object
+        that is opened in streaming mode. The links are added to the list
+        of links so they can be created after all the other members and
+        the directories are added to the list of directories so their
+        attributes can be set after all the files are written. Returns
+        the stripped name of the member or an empty string if the member
+        is skipped.
+
+        @return: Returns the stripped name of the member or an empty
+        string if the member is skipped.
+        @rtype: String
+
+        @param tar: The TarFile object.
+        @type tar: TarFile
+        @param tarinfo: The member that was just read.
+        @type tarinfo: TarInfo
+        @param extractDir: The full path to directory for extraction.
+        @type extractDir: String
+        @param stripDirectoriesDepth: The number of leading directories
+        that will be removed.
+        @type stripDirectoriesDepth: Int
+        @param selectedPathsMap: A map of the stripped names of the
+        members that will be extracted. If None then every member is
+        extracted.
+        @type selectedPathsMap: Dictionary
+        @param directories: The list of directories that were extracted.
+        @type directories: Array
+        @param links: The list of links that will be created.
+        @type links: Array
+        """
+        strippedName = self.__stripMemberName(tarinfo.name, stripDirectoriesDepth)
+        if ((not len(strippedName) > 0) or (tarinfo.isdev())):
+            return ""
+        elif ((not selectedPathsMap == None) and (not selectedPathsMap.has_key(strippedName))):
+            return ""
+        # The member is copied since the member that was read might be
+        # kept in the index of the tarball.
+        tarinfo = copy.copy(tarinfo)
+        tarinfo.name = strippedName
+        if (tarinfo.islnk()):
+            # Hard links point to a member whose path has to be
+            # stripped as well.
+            tarinfo.linkname = self.__stripMemberName(tarinfo.linkname, stripDirectoriesDepth)
+            if (not len(tarinfo.linkname) > 0):
+                return ""
+            links.append(tarinfo)
+            return strippedName
+        elif (tarinfo.issym()):
+            links.append(tarinfo)
+            return strippedName
+        elif (tarinfo.isdir()):
+            directories.append(tarinfo)
+            tarinfo = copy.copy(tarinfo)
+            tarinfo.mode = 0700
+        self.__extractMember(tar, tarinfo, extractDir)
+        return strippedName
+
+    def __finishExtraction(self, tar, extractDir, directories, links):
+        """
+        Creates the links and sets the attributes on the directories
+        after all the other members of the tarball were extracted.
+
+        @param tar: The TarFile object.
+        @type tar: TarFile
+        @param extractDir: The full path to directory for extraction.
+        @type extractDir: String
+        @param directories: The list of directories that were extracted.
+        @type directories: Array
+        @param links: The list of links that will be created.
+        @type links: Array
+        """
+        # The links are created in the order they are in the tarball,
+        # so a link to a link is created after the link it targets.
+        for tarinfo in links:
+            self.__extractMember(tar, tarinfo, extractDir)
+        directories.sort(key=lambda tarinfo: tarinfo.name)
+        directories.reverse()
+        for tarinfo in directories:
+            pathToDir = os.path.join(extractDir, tarinfo.name)
+            try:
+                tar.utime(tarinfo, pathToDir)
+                tar.chmod(tarinfo, pathToDir)
+            except tarfile.ExtractError:
+                message = "There was an error setting the attributes on the directory: %s." %(pathToDir)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+
+    def __extractWithTarfile(self, extractDir, stripDirectoriesDepth, selectedPathsMap, decompressionBackend=None):
+        """
+        Extracts the tarball in a single streaming pass with the tarfile
+        module. Returns None if the parallel decoder failed, since the
+        members after the failure were not extracted.
+
+        The links are created after all the other members are written,
+        the same way that GNU tar does, so that a member cannot be
+        written through a symbolic link. The members that would be
+        written outside of the extract directory are skipped.
+
+        @return: Returns True if the file was extracted, False if there
+        was an error and None if the parallel decoder failed.
+        @rtype: Boolean
+
+        @param extractDir: The full path to directory for extraction.
+        @type extractDir: String
+        @param stripDirectoriesDepth: The number of leading directories
+        that will be removed.
+        @type stripDirectoriesDepth: Int
+        @param selectedPathsMap: A map of the stripped names of the
+        members that will be extracted. If None then every member is
+        extracted.
+        @type selectedPathsMap: Dictionary
+        @param decompressionBackend: The decompression backend. If None
+        then the decompression backend that was set is used.
+        @type decompressionBackend: String
+        """
+        # The attributes of directories are set after all the files are
+        # written, in case a directory is not writable.
+        directories = []
+        links = []
+        (tar, fileobj) = (None, None)
+        isExtracted = True
+        isDecoded = True
+        try:
+            (tar, fileobj) = self.__openStream(decompressionBackend)
+            for tarinfo in tar:
+                self.__extractStreamedMember(tar, tarinfo, extractDir, stripDirectoriesDepth, selectedPathsMap, directories, links)
+            self.__finishExtraction(tar, extractDir, directories, links)
+        except (tarfile.TarError, EnvironmentError, EOFError):
+            message = "There was an error extracting the file: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            isExtracted = False
+        finally:
+            isDecoded = self.__closeStream(tar, fileobj)
+        if (not isDecoded):
+            return None
+        return ((isExtracted) and (os.path.isdir(extractDir)))
@@ -6,15 +6,20 @@
 @version   :  2.17
 @copyright :  GPLv2
 """
+import os
 import os.path
 import logging
 import mimetypes
 import subprocess
 import shutil
+import stat
+import time
+import zipfile
 
 import sx
 from sx.logwriter import LogWriter
 from sx.extractors import Extractor
+from sx.extractors import ArchiveIndex
 
 
 class Zipextractor(Extractor) :
@@ -60,74 +65,217 @@ class Zipextractor(Extractor) :
             return None;
         return "-qo"
 
+    def buildArchiveIndex(self):
+        """
+        Returns a new index of the zip file that is built from the
+        central directory of the zip file, so the members do not have
+        to be read. None is returned if there was an error reading the
+        zip file.
+
+        @return: Returns a new index of the zip file.
+        @rtype: ArchiveIndex
+        """
+        archiveIndex = ArchiveIndex(self.getPathToFile())
+        try:
+            zfile = zipfile.ZipFile(self.getPathToFile(), "r")
+            try:
+                for zinfo in zfile.infolist():
+                    # No stripping required on zip files.
+                    archiveIndex.add(zinfo.filename, zinfo.filename, zinfo.file_size, zinfo.header_offset)
+            finally:
+                zfile.close()
+        except (zipfile.BadZipfile, zipfile.LargeZipFile, EnvironmentError):
+            message = "There was an error reading the file: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return None
+        return archiveIndex
+
+    def getFileSize(self, pathToFileInExtractor):
+        archiveIndex = self.getArchiveIndex()
+        if (archiveIndex == None):
+            return -1
+        member = archiveIndex.getMember(self.resolvePath(pathToFileInExtractor))
+        if ((member == None) or (not member[3] == ArchiveIndex.MEMBER_FILE)):
+            return -1
+        return member[1]
+
     # ###########################################################################
-    # Extract, getDataFromFile functions
+    # Extract, list, getDataFromFile functions
     # ###########################################################################
+    def list(self) :
+        archiveIndex = self.getArchiveIndex()
+        if (archiveIndex == None):
+            return []
+        return archiveIndex.getMemberNames()
+
     def getDataFromFile(self, pathToFileInExtractor) :
-        # unzip RHEV-log.zip RhevManager.exe.config -d test/
-        fullPathToFile = pathToFileInExtractor
-        fileList =  self.list()
         fullPathToFile = ""
-        for item in fileList:
-            # No stripping required on zip files.
-            if (item == pathToFileInExtractor):
-                fullPathToFile = item
-                break;
-        # Get the options to extract
-        commandOptions = self.getExtactArgs()
-        if (commandOptions == None) :
+        archiveIndex = self.getArchiveIndex()
+        if (not archiveIndex == None):
+            fullPathToFile = archiveIndex.getMemberName(self.resolvePath(pathToFileInExtractor))
+        if (not self.isValidMimeType()) :
             message =  "This file is unknown type and will not be extracted: %s." %(self.getPathToFile())
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
         elif (not len(fullPathToFile) > 0):
             message = "The path to the file does not exist: %s" %(pathToFileInExtractor)
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
         else:
-            # ###################################################################
-            # Create a tmp directory to extract the file
-            # ###################################################################
-            if (not os.access(Extractor.PATH_TO_TEMP_DIR, os.F_OK)):
+            # The member is read with the zipfile module, so it is not
+            # written to disk.
+            try:
+                zfile = zipfile.ZipFile(self.getPathToFile(), "r")
                 try:
-                    os.makedirs(Extractor.PATH_TO_TEMP_DIR)
-                except (IOError, os.error):
-                    message = "Could not create the directory to extract file to: %s" % (Extractor.PATH_TO_TEMP_DIR)
-                    logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-
-            command = [self.getPathToCommand(), commandOptions, self.getPathToFile(), fullPathToFile, "-d", Extractor.PATH_TO_TEMP_DIR]
-            task = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            (stdout, stderr) = task.communicate()
-            if (not task.returncode  == 0):
+                    fin = zfile.open(fullPathToFile)
+                    try:
+                        return fin.readlines()
+                    finally:
+                        fin.close()
+                finally:
+                    zfile.close()
+            except (zipfile.BadZipfile, zipfile.LargeZipFile, KeyError, RuntimeError, EnvironmentError):
                 message = "There was an error extracting a file from the file: %s." % (self.getPathToFile())
                 logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-            else:
-                fileExtractedContents = []
-                pathToExtractedFile = os.path.join(Extractor.PATH_TO_TEMP_DIR, fullPathToFile)
-                # Extract the contents of the file to an array
-                if (os.path.isfile(pathToExtractedFile)):
-                    try:
-                        fout = open(pathToExtractedFile, "r")
-                        fileExtractedContents = fout.readlines()
-                        fout.close
-                    except (IOError, os.error, KeyError):
-                        message = "There was a problem reading a file that was extracted from a tarfile: %s" %(pathToExtractedFile)
-                        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-                return fileExtractedContents
         return []
 
-    def extract(self, extractDir, stripDirectoriesDepth=1) :
-        commandOptions = self.getExtactArgs()
-        if (commandOptions == None) :
+    def __isInsideDir(self, pathToFile, pathToDir):
+        """
+        Returns True if the path resolves to the directory or a path
+        under the directory after all the symbolic links are followed.
+
+        @return: Returns True if the path resolves to a path under the
+        directory.
+        @rtype: Boolean
+
+        @param pathToFile: The path that will be resolved.
+        @type pathToFile: String
+        @param pathToDir: The path to the directory.
+        @type pathToDir: String
+        """
+        realPathToFile = os.path.realpath(pathToFile)
+        realPathToDir = os.path.realpath(pathToDir)
+        return ((realPathToFile == realPathToDir) or (realPathToFile.startswith(realPathToDir.rstrip("/") + "/")))
+
+    def __extractMember(self, zfile, zinfo, extractDir, directories):
+        """
+        Extracts the member if it is safe to extract. The parent
+        directory of the member cannot resolve through a symbolic link
+        to outside of the extract directory, and the target of a
+        symbolic link cannot be absolute or resolve to outside of the
+        extract directory. The mode and modification time of the member
+        are set as unzip would. A message is logged if the member is
+        skipped or there was an error.
+
+        @param zfile: The ZipFile object.
+        @type zfile: ZipFile
+        @param zinfo: The member that will be extracted.
+        @type zinfo: ZipInfo
+        @param extractDir: The full path to directory for extraction.
+        @type extractDir: String
+        @param directories: A list of tuples of the path, the mode and
+        the modification time of the directories that were extracted,
+        which is added to. The mode and modification time of the
+        directories are set after all the members are extracted.
+        @type directories: Array
+        """
+        # The mode is only set if the member was created on unix.
+        memberMode = 0
+        if (zinfo.create_system == 3):
+            memberMode = (zinfo.external_attr >> 16) & 0xFFFF
+        pathToMember = os.path.join(extractDir, zinfo.filename)
+        mtime = time.mktime(zinfo.date_time + (0, 0, -1))
+        if ((not len(zinfo.filename.strip("/")) > 0) or (not self.__isInsideDir(os.path.dirname(pathToMember.rstrip("/")), extractDir))):
+            message = "The member %s will not be extracted because it would be written outside of the directory: %s." %(zinfo.filename, extractDir)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
+            return
+        try:
+            if (zinfo.filename.endswith("/")):
+                pathToMember = pathToMember.rstrip("/")
+                if (not os.path.isdir(pathToMember)):
+                    os.makedirs(pathToMember)
+                directories.append((pathToMember, memberMode & 07777, mtime))
+                return
+            if (not os.path.isdir(os.path.dirname(pathToMember))):
+                os.makedirs(os.path.dirname(pathToMember))
+            if ((os.path.islink(pathToMember)) or (os.path.isfile(pathToMember))):
+                os.remove(pathToMember)
+            if (stat.S_ISLNK(memberMode)):
+                linkname = zfile.read(zinfo)
+                if ((linkname.startswith("/")) or
+                    (not self.__isInsideDir(os.path.join(os.path.dirname(pathToMember), linkname), extractDir))):
+                    message = "The member %s will not be extracted because it would be written outside of the directory: %s." %(zinfo.filename, extractDir)
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
+                    return
+                os.symlink(linkname, pathToMember)
+                return
+            fin = zfile.open(zinfo)
+            try:
+                fout = open(pathToMember, "wb")
+                try:
+                    shutil.copyfileobj(fin, fout)
+                finally:
+                    fout.close()
+            finally:
+                fin.close()
+            if ((memberMode & 07777) > 0):
+                os.chmod(pathToMember, memberMode & 07777)
+            os.utime(pathToMember, (mtime, mtime))
+        except (EnvironmentError, OverflowError, ValueError, RuntimeError, zipfile.BadZipfile):
+            message = "There was an error extracting the member %s from the file: %s." %(zinfo.filename, self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+
+    def extract(self, extractDir, stripDirectoriesDepth=1, listOfPathPatterns=[]) :
+        """
+        Extracts the zip file with the zipfile module. The leading
+        directories are not stripped from zip files. If there are path
+        patterns then only the members that match are extracted.
+
+        @return: Returns True if there was no fatal errors.
+        @rtype: Boolean
+
+        @param extractDir: The full path to directory for extraction.
+        @type extractDir: String
+        @param stripDirectoriesDepth: The number of leading directories
+        that will be removed, which is not used for zip files.
+        @type stripDirectoriesDepth: Int
+        @param listOfPathPatterns: A list of path patterns of the members
+        that will be extracted.
+        @type listOfPathPatterns: Array
+        """
+        if (not self.isValidMimeType()) :
             message =  "This file is unknown type and will not be extracted: %s." %(self.getPathToFile())
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-        elif (not self.isCommandInstalled()):
-            message = "The %s command does not appear to be installed or incorrect version." %(self.getPathToCommand())
+            return False
+        message = "Extracting the file with the zipfile module: %s to %s." %(self.getPathToFile(), extractDir)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        membersExtracted = 0
+        try:
+            zfile = zipfile.ZipFile(self.getPathToFile(), "r")
+            try:
+                directories = []
+                for zinfo in zfile.infolist():
+                    # The members that match are extracted, otherwise
+                    # every member is extracted.
+                    if ((len(listOfPathPatterns) > 0) and ((zinfo.filename.endswith("/")) or
+                                                           (not Extractor.isMatchingPath(zinfo.filename, listOfPathPatterns)))):
+                        continue
+                    self.__extractMember(zfile, zinfo, extractDir, directories)
+                    membersExtracted += 1
+                # The mode and modification time of the directories are
+                # set last, so that the directories that are not writable
+                # can be extracted to.
+                directories.sort()
+                directories.reverse()
+                for (pathToDir, dirMode, mtime) in directories:
+                    os.utime(pathToDir, (mtime, mtime))
+                    if (dirMode > 0):
+                        os.chmod(pathToDir, dirMode)
+            finally:
+                zfile.close()
+        except (zipfile.BadZipfile, zipfile.LargeZipFile, EnvironmentError):
+            message = "There was an error extracting the file: %s." % (self.getPathToFile())
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-        else:
-            command = [self.getPathToCommand(), commandOptions, self.getPathToFile(), "-d", extractDir]
-            task = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            (stdout, stderr) = task.communicate()
-            if (not task.returncode  == 0):
-                message = "There was an error extracting the file: %s." % (self.getPathToFile())
-                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-            else:
-                return os.path.isdir(extractDir)
-        return False
+            return False
+        if ((len(listOfPathPatterns) > 0) and (not membersExtracted > 0)):
+            message = "There was no files in %s that matched the files required for extraction." %(self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return os.path.isdir(extractDir)
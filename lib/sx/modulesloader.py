@@ -1,8 +1,14 @@
 #!/usr/bin/env python
 """
-This file contains 4 classes. ModulesLoader is default loader for all
+This file contains 6 classes. ModulesLoader is default loader for all
 modules: reports, plugins, and extractors.
 
+ModulesRegistry is the process-wide registry of the module classes that
+the loaders share.
+
+ReportDetectionIndex is the index of the type detection files of the
+report classes.
+
 ReportsLoader is a child of the ModulesLoader class that loads report modules.
 PluginsLoader is a child of the ModulesLoader class that loads plugin modules.
 
@@ -15,16 +21,235 @@ import os
 import os.path
 import logging
 import sys
-import re
+import ast
+import json
+import tempfile
+import threading
 
 import sx
 from sx.logwriter import LogWriter
+from sx.extractors import Extractor
+
+class ModulesRegistry:
+    """
+    This class is the registry of the module classes that were loaded
+    from each modules directory. All the loaders in a process share the
+    registry, so a modules directory is only listed and its modules are
+    only imported once.
+
+    The modules that were imported are saved in a manifest with the
+    modification time of the directory. A new process imports the
+    modules in the manifest without listing the directory, until the
+    directory is changed. The modules that failed to import are saved
+    with the modification time and size of their file, and they are
+    tried again when their file is changed, since changing a file in
+    place does not change the modification time of the directory.
+
+    @cvar PATH_TO_MANIFEST: The path to the manifest file.
+    @type PATH_TO_MANIFEST: String
+    @cvar MANIFEST_VERSION: The version of the format of the manifest.
+    @type MANIFEST_VERSION: Int
+    """
+    PATH_TO_MANIFEST = os.path.join(os.path.join(sx.SXConfigurationFiles.CONFIGURATION_DIR, "cache"), "modules.manifest")
+    MANIFEST_VERSION = 2
+
+    def __init__(self):
+        # A map of the path to a modules directory to a tuple of the
+        # modification time of the directory and the list of classes.
+        self.__classesMap = {}
+        # The manifest that is read when it is first used.
+        self.__manifestMap = None
+        # The loaders can be created by different threads.
+        self.__lock = threading.RLock()
+
+    def __str__(self):
+        rstring = ""
+        for pathToClassesDir in sorted(self.__classesMap.keys()):
+            (mtime, loadedModuleClasses) = self.__classesMap.get(pathToClassesDir)
+            rstring += "%s: %d classes\n" %(pathToClassesDir, len(loadedModuleClasses))
+        return rstring.rstrip()
+
+    def __getManifest(self):
+        if (self.__manifestMap == None):
+            self.__manifestMap = {}
+            if (os.path.isfile(ModulesRegistry.PATH_TO_MANIFEST)):
+                try:
+                    fin = open(ModulesRegistry.PATH_TO_MANIFEST, "r")
+                    manifestMap = json.load(fin)
+                    fin.close()
+                    if ((isinstance(manifestMap, dict)) and (manifestMap.get("version") == ModulesRegistry.MANIFEST_VERSION) and
+                        (isinstance(manifestMap.get("directories"), dict))):
+                        self.__manifestMap = manifestMap.get("directories")
+                except (IOError, os.error, ValueError):
+                    message = "There was an error reading the modules manifest: %s" %(ModulesRegistry.PATH_TO_MANIFEST)
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return self.__manifestMap
+
+    def __writeManifest(self):
+        pathToCacheDir = os.path.dirname(ModulesRegistry.PATH_TO_MANIFEST)
+        pathToTmpManifest = ""
+        try:
+            if (not os.path.isdir(pathToCacheDir)):
+                os.makedirs(pathToCacheDir)
+            (fd, pathToTmpManifest) = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=pathToCacheDir)
+            fout = os.fdopen(fd, "w")
+            json.dump({"version":ModulesRegistry.MANIFEST_VERSION, "directories":self.__getManifest()}, fout, sort_keys=True, indent=1)
+            fout.close()
+            os.rename(pathToTmpManifest, ModulesRegistry.PATH_TO_MANIFEST)
+        except (IOError, os.error):
+            message = "There was an error writing the modules manifest: %s" %(ModulesRegistry.PATH_TO_MANIFEST)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            if ((len(pathToTmpManifest) > 0) and (os.path.exists(pathToTmpManifest))):
+                try:
+                    os.remove(pathToTmpManifest)
+                except os.error:
+                    pass
+
+    def getClasses(self, pathToClassesDir, mtime):
+        """
+        Returns a copy of the list of classes that were loaded from the
+        modules directory. None is returned if the classes were not
+        loaded or the directory was changed since they were loaded.
+
+        @return: Returns a copy of the list of classes that were loaded
+        from the modules directory.
+        @rtype: Array
+
+        @param pathToClassesDir: The path to the modules directory.
+        @type pathToClassesDir: String
+        @param mtime: The modification time of the modules directory.
+        @type mtime: Float
+        """
+        self.__lock.acquire()
+        try:
+            if (self.__classesMap.has_key(pathToClassesDir)):
+                (loadedMtime, loadedModuleClasses) = self.__classesMap.get(pathToClassesDir)
+                if (loadedMtime == mtime):
+                    return list(loadedModuleClasses)
+            return None
+        finally:
+            self.__lock.release()
+
+    def __getFileStat(self, pathToFile):
+        """
+        Returns a list of the modification time and the size of the
+        file. None is returned if the file cannot be stat'd.
+
+        @return: Returns a list of the modification time and the size
+        of the file.
+        @rtype: Array
+
+        @param pathToFile: The path to the file.
+        @type pathToFile: String
+        """
+        try:
+            fileStat = os.stat(pathToFile)
+        except os.error:
+            return None
+        return [fileStat.st_mtime, fileStat.st_size]
+
+    def getModules(self, pathToClassesDir, mtime):
+        """
+        Returns the list of the import name and the class name of each
+        module in the manifest for the modules directory. The modules
+        that failed to import are included if their file was changed
+        since the manifest was written. None is returned if the
+        directory is not in the manifest or the directory was changed
+        since the manifest was written.
+
+        @return: Returns the list of the import name and the class name
+        of each module in the manifest for the modules directory.
+        @rtype: Array
+
+        @param pathToClassesDir: The path to the modules directory.
+        @type pathToClassesDir: String
+        @param mtime: The modification time of the modules directory.
+        @type mtime: Float
+        """
+        self.__lock.acquire()
+        try:
+            entryMap = self.__getManifest().get(pathToClassesDir)
+            if ((not isinstance(entryMap, dict)) or (not entryMap.get("mtime") == mtime)):
+                return None
+            listOfModules = []
+            for (moduleImport, moduleClassName) in entryMap.get("modules", []):
+                listOfModules.append((str(moduleImport), str(moduleClassName)))
+            for (moduleImport, moduleClassName, fileStat) in entryMap.get("failed", []):
+                pathToModuleFile = os.path.join(pathToClassesDir, "%s.py" %(moduleImport.rsplit(".", 1)[-1]))
+                if (not self.__getFileStat(pathToModuleFile) == fileStat):
+                    listOfModules.append((str(moduleImport), str(moduleClassName)))
+            listOfModules.sort()
+            return listOfModules
+        finally:
+            self.__lock.release()
+
+    def add(self, pathToClassesDir, mtime, loadedModuleClasses, listOfModules, listOfFailedModules=[]):
+        """
+        Adds the classes that were loaded from the modules directory to
+        the registry and the modules they were imported from to the
+        manifest. The modules that failed to import are added to the
+        manifest with the modification time and size of their file.
+
+        @param pathToClassesDir: The path to the modules directory.
+        @type pathToClassesDir: String
+        @param mtime: The modification time of the modules directory.
+        @type mtime: Float
+        @param loadedModuleClasses: The list of classes that were loaded.
+        @type loadedModuleClasses: Array
+        @param listOfModules: The list of the import name and the class
+        name of each class that was loaded.
+        @type listOfModules: Array
+        @param listOfFailedModules: The list of the import name, the
+        class name, and the path to the module file of each class that
+        failed to load.
+        @type listOfFailedModules: Array
+        """
+        self.__lock.acquire()
+        try:
+            self.__classesMap[pathToClassesDir] = (mtime, list(loadedModuleClasses))
+            listOfFailedEntries = []
+            for (moduleImport, moduleClassName, pathToModuleFile) in listOfFailedModules:
+                listOfFailedEntries.append([moduleImport, moduleClassName, self.__getFileStat(pathToModuleFile)])
+            # The modules that failed before and were not tried again
+            # because their file was not changed are kept.
+            listOfTriedImports = [module[0] for module in listOfModules] + [module[0] for module in listOfFailedModules]
+            previousEntryMap = self.__getManifest().get(pathToClassesDir)
+            if (isinstance(previousEntryMap, dict)):
+                for (moduleImport, moduleClassName, fileStat) in previousEntryMap.get("failed", []):
+                    pathToModuleFile = os.path.join(pathToClassesDir, "%s.py" %(moduleImport.rsplit(".", 1)[-1]))
+                    if ((not moduleImport in listOfTriedImports) and (os.path.isfile(pathToModuleFile))):
+                        listOfFailedEntries.append([moduleImport, moduleClassName, fileStat])
+            listOfFailedEntries.sort()
+            entryMap = {"mtime":mtime, "modules":[list(module) for module in listOfModules], "failed":listOfFailedEntries}
+            if (not self.__getManifest().get(pathToClassesDir) == entryMap):
+                self.__getManifest()[pathToClassesDir] = entryMap
+                self.__writeManifest()
+        finally:
+            self.__lock.release()
+
+    def clear(self):
+        """
+        Removes all the classes from the registry so that the modules
+        directories are listed again.
+        """
+        self.__lock.acquire()
+        try:
+            self.__classesMap = {}
+            self.__manifestMap = {}
+        finally:
+            self.__lock.release()
 
 class ModulesLoader :
     """
     This is the base loader for loading reports, plugins, and
     extractors.
+
+    @cvar REGISTRY: The registry of the module classes that all the
+    loaders share.
+    @type REGISTRY: ModulesRegistry
     """
+    REGISTRY = ModulesRegistry()
+
     def __init__(self):
         pass
 
@@ -67,6 +292,86 @@ class ModulesLoader :
             print e
         return None
 
+    def importClass(self, moduleImport, moduleClassName):
+        """
+        This function will return the class that is imported from the
+        module. None is returned if the module or the class could not be
+        imported.
+
+        @return: Returns the class that is imported from the module.
+        @rtype: Class
+
+        @param moduleImport: The python import name of the module.
+        @type moduleImport: String
+        @param moduleClassName: Name of the class that will be imported
+        @type moduleClassName: String
+        """
+        try:
+            return self.__importModule(moduleImport, moduleClassName)
+        except AttributeError:
+            message = "The class module was not found for %s." %(moduleImport.rsplit(".", 1)[-1])
+            logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+        return None
+
+    def getModules(self, pathToModuleBaseDir, moduleImportBase, mtime=None):
+        """
+        This function will return a list of the modules in the directory
+        without importing them. Each item is a tuple of the python import
+        name, the class name, and the path to the module file. The
+        modules in the manifest of the registry are used without listing
+        the directory.
+
+        @return: Returns a list of the modules in the directory.
+        @rtype: Array
+
+        @param pathToModuleBaseDir: The path to the base directory
+        that contains the modules.
+        @type pathToModuleBaseDir: String
+        @param moduleImportBase: The name of the modules base
+        python import name.
+        @type moduleImportBase: String
+        @param mtime: The modification time of the directory of the
+        modules. If None then the directory is stat'd.
+        @type mtime: Float
+        """
+        listOfModules = []
+        if ((not len(pathToModuleBaseDir) > 0) or (not len(moduleImportBase) > 0)):
+            return listOfModules
+        pathToClassesDir = ("%s/%s") %(pathToModuleBaseDir, moduleImportBase.replace(".", "/"))
+        if (not (os.path.isdir(pathToClassesDir))):
+            return listOfModules
+        # Add path to modules if it does not exist in python path
+        if (not (pathToModuleBaseDir in sys.path)) :
+            sys.path.append(pathToModuleBaseDir)
+        if (mtime == None):
+            try:
+                mtime = os.stat(pathToClassesDir).st_mtime
+            except os.error:
+                return listOfModules
+        listOfRegisteredModules = ModulesLoader.REGISTRY.getModules(pathToClassesDir, mtime)
+        if (not listOfRegisteredModules == None):
+            for (moduleImport, moduleClassName) in listOfRegisteredModules:
+                listOfModules.append((moduleImport, moduleClassName,
+                                      os.path.join(pathToClassesDir, "%s.py" %(moduleImport.rsplit(".", 1)[-1]))))
+            return listOfModules
+        # Get list of files and load the classes into an array if they
+        # are valid modules
+        filenames = os.listdir(pathToClassesDir)
+        filenames.sort()
+        # validate the modules
+        for filename in filenames:
+            moduleFilename =  filename[:-3]
+            if ((not filename[-3:] == ".py") or (moduleFilename == "__init__")):
+                continue
+            if (self.__validateModule(os.path.join(pathToClassesDir,filename))) :
+                # First letter of module filename's class has to be be capitalized.
+                listOfModules.append(("%s.%s" %(moduleImportBase, moduleFilename), str.capitalize(moduleFilename),
+                                      os.path.join(pathToClassesDir, filename)))
+            else:
+                message = ("Module %s does not validate, skipping.") % (filename)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+        return listOfModules
+
     def getClasses(self, pathToModuleBaseDir, moduleImportBase):
         """
         This class will return a list of classes based on path
@@ -101,29 +406,35 @@ class ModulesLoader :
         if (not (pathToModuleBaseDir in sys.path)) :
             sys.path.append(pathToModuleBaseDir)
 
-        # Get list of files and load the classes into an array if they
-        # are valid modules
-        filenames = os.listdir(pathToClassesDir)
-        filenames.sort()
-        # validate and load modules
-        for filename in filenames:
-            moduleFilename =  filename[:-3]
-            if ((not filename[-3:] == ".py") or (moduleFilename == "__init__")):
-                continue
-            if (self.__validateModule(os.path.join(pathToClassesDir,filename))) :
-                try:
-                    # First letter of module filename's class has to be be capitalized.
-                    moduleClass = self.__importModule("%s.%s" %(moduleImportBase, moduleFilename), str.capitalize(moduleFilename))
-                    if (not moduleClass == None):
-                        loadedModuleClasses.append(moduleClass)
-                except AttributeError:
-                    message = "The class module was not found for %s." %(moduleFilename)
-                    logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+        # The classes are loaded once for each process unless the
+        # directory is changed.
+        try:
+            mtime = os.stat(pathToClassesDir).st_mtime
+        except os.error:
+            return loadedModuleClasses
+        registeredModuleClasses = ModulesLoader.REGISTRY.getClasses(pathToClassesDir, mtime)
+        if (not registeredModuleClasses == None):
+            return registeredModuleClasses
+
+        listOfModules = self.getModules(pathToModuleBaseDir, moduleImportBase, mtime)
+        # load the modules
+        listOfLoadedModules = []
+        listOfFailedModules = []
+        for (moduleImport, moduleClassName, pathToModuleFile) in listOfModules:
+            moduleClass = self.importClass(moduleImport, moduleClassName)
+            if (not moduleClass == None):
+                loadedModuleClasses.append(moduleClass)
+                listOfLoadedModules.append((moduleImport, moduleClassName))
             else:
-                message = ("Module %s does not validate, skipping.") % (filename)
-                logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
-                continue
-        return loadedModuleClasses
+                listOfFailedModules.append((moduleImport, moduleClassName, pathToModuleFile))
+        # The directory is changed when the compiled modules are written,
+        # so the modification time is read again after the imports.
+        try:
+            mtime = os.stat(pathToClassesDir).st_mtime
+        except os.error:
+            pass
+        ModulesLoader.REGISTRY.add(pathToClassesDir, mtime, loadedModuleClasses, listOfLoadedModules, listOfFailedModules)
+        return list(loadedModuleClasses)
 
     def load(self, pathToModuleBaseDir, moduleImportBase):
         """
@@ -149,6 +460,117 @@ class ModulesLoader :
                 loadedModules.append(moduleInstance)
         return loadedModules
 
+class ReportDetectionIndex:
+    """
+    This class is an index of the type detection files of the report
+    classes. The type detection files are hashed by their path and a
+    path is matched by looking up only its suffixes that have the same
+    number of path components as a type detection file, so each path is
+    matched in linear time.
+
+    If more than one type detection file matches a path then the report
+    class with the highest DETECTION_PRIORITY is used and if they have
+    the same priority the report class that was loaded first is used.
+
+    @cvar INDEXES: A map of the tuple of report classes to the index of
+    their type detection files.
+    @type INDEXES: Dictionary
+    """
+    INDEXES = {}
+
+    def __init__(self, reportClasses):
+        """
+        @param reportClasses: A list of report classes in the order they
+        were loaded.
+        @type reportClasses: Array
+        """
+        # A map of the type detection file to a tuple of the rank and
+        # the report class. The lowest rank has the highest priority.
+        self.__detectionPathsMap = {}
+        order = 0
+        for reportClass in reportClasses:
+            if (reportClass == None) :
+                continue
+            detectionPath = reportClass.TYPE_DETECTION_FILE.strip("/")
+            if (not len(detectionPath) > 0):
+                continue
+            rank = (-reportClass.DETECTION_PRIORITY, order)
+            order += 1
+            if ((not self.__detectionPathsMap.has_key(detectionPath)) or
+                (rank < self.__detectionPathsMap.get(detectionPath)[0])):
+                self.__detectionPathsMap[detectionPath] = (rank, reportClass)
+        # The number of path components in each of the type detection
+        # files, so that only the suffixes that could match are looked up.
+        self.__listOfDetectionDepths = []
+        for detectionPath in self.__detectionPathsMap.keys():
+            depth = len(detectionPath.split("/"))
+            if (not depth in self.__listOfDetectionDepths):
+                self.__listOfDetectionDepths.append(depth)
+        self.__listOfDetectionDepths.sort()
+
+    def getIndex(reportClasses):
+        """
+        Returns the index of the type detection files of the report
+        classes. The index is only built once for each list of report
+        classes.
+
+        @return: Returns the index of the type detection files of the
+        report classes.
+        @rtype: ReportDetectionIndex
+
+        @param reportClasses: A list of report classes in the order they
+        were loaded.
+        @type reportClasses: Array
+        """
+        key = tuple(reportClasses)
+        detectionIndex = ReportDetectionIndex.INDEXES.get(key)
+        if (detectionIndex == None):
+            detectionIndex = ReportDetectionIndex(reportClasses)
+            ReportDetectionIndex.INDEXES[key] = detectionIndex
+        return detectionIndex
+    getIndex = staticmethod(getIndex)
+
+    def getDetectionPaths(self):
+        """
+        Returns a list of tuples of the type detection file and the
+        report class sorted by the priority of the report classes.
+
+        @return: Returns a list of tuples of the type detection file
+        and the report class.
+        @rtype: Array
+        """
+        detectionPaths = []
+        for detectionPath in self.__detectionPathsMap.keys():
+            (rank, reportClass) = self.__detectionPathsMap.get(detectionPath)
+            detectionPaths.append((rank, detectionPath, reportClass))
+        detectionPaths.sort()
+        return [(detectionPath, reportClass) for (rank, detectionPath, reportClass) in detectionPaths]
+
+    def findReportClass(self, pathToFilename) :
+        """
+        Returns the report class whose type detection file is the path
+        or the end of the path. None is returned if no report class
+        matches. Only whole path components are matched.
+
+        @return: Returns the report class whose type detection file is
+        the path or the end of the path.
+        @rtype: Class
+
+        @param pathToFilename: The path to a file.
+        @type pathToFilename: String
+        """
+        components = pathToFilename.strip("/").split("/")
+        match = None
+        for depth in self.__listOfDetectionDepths:
+            if (depth > len(components)):
+                break
+            item = self.__detectionPathsMap.get("/".join(components[-depth:]))
+            if ((not item == None) and ((match == None) or (item[0] < match[0]))):
+                match = item
+        if (match == None):
+            return None
+        return match[1]
+
 class ReportsLoader(ModulesLoader) :
     """
     This class will load or perform various operations on report
@@ -162,79 +584,104 @@ class ReportsLoader(ModulesLoader) :
         self.__coreClasses = self.getClasses(self.__pathToBaseDir, sx.REPORT_CORE_IMPORT)
         self.__userClasses = self.getClasses(sx.SXConfigurationFiles.CONFIGURATION_DIR,
                                              sx.SXConfigurationFiles.REPORT_USER_IMPORT)
-        # Build the regex for searching.
-        self.__findRegexCore =self. __buildFindReportRegex(self.__coreClasses)
-        self.__findRegexUser =self. __buildFindReportRegex(self.__userClasses)
+        # The detection indexes of the type detection files are shared
+        # by all the loaders that have the same report classes.
+        self.__detectionIndexCore = ReportDetectionIndex.getIndex(self.__coreClasses)
+        self.__detectionIndexAll = ReportDetectionIndex.getIndex(self.__coreClasses + self.__userClasses)
+
+        # Register the files that the reports read from a compressed
+        # report before extraction, so extractors can capture them while
+        # listing the compressed report.
+        for reportClass in (self.__coreClasses + self.__userClasses):
+            Extractor.addProbeFiles(reportClass.PROBE_FILES)
 
         # Load up extractors
         self.__extractorsLoader = ExtractorsLoader()
 
-    def __buildFindReportRegex(self, reportClasses) :
+    def __getDetectionIndex(self, includeUserReports=True) :
         """
-        Returns a regex string based on type detection file
-        in report classes.
+        Returns the detection index of the report classes that will be
+        searched.
 
-        Do note that certain characters are not allowed in filename
-        because of re rules. All whitespaces will be turned to
-        underscores.
-
-        @return: Returns a regex string based on type detection file
-        in report classes.
-        @rtype: Class
+        @return: Returns the detection index of the report classes that
+        will be searched.
+        @rtype: ReportDetectionIndex
 
+        @param includeUserReports: If enable the user modules(reports) will
+        be searched. Default is True
+        @type includeUserReports: Boolean
         """
-        # Build the expression for all the different signature
-        # files inside that report file.
-        regex = ""
-        for reportClass in reportClasses:
-            # Escape out . with \.
-            if (len(regex) > 0) :
-                regex += "|"
-            if (not reportClass == None) :
-                regex += "(?P<%s>.*%s.*)" %(reportClass.REPORT_NAME.replace(" ", "_"), reportClass.TYPE_DETECTION_FILE.replace(".", "\."))
-        return regex
+        if (includeUserReports):
+            return self.__detectionIndexAll
+        return self.__detectionIndexCore
 
     def __findReport(self, listOfFilenames, includeUserReports=True) :
         """
-        Returns the class that matches the report file. None is
+        Returns the report that matches the report file. None is
         returned if no report type is found. This function is for
         matching a file in list of filenames to a unique file that
         identiifes the that this list of files is a certain report.
 
-        @return: Returns the class for that matches the report.
-        @rtype: Class
+        The search stops at the first filename that matches, so the
+        list of filenames can be a generator that only reads as many
+        filenames as are needed.
 
-        @param listOfFilenames: A list of filenames that will be
-        searched.
+        @return: Returns the report that matches.
+        @rtype: Report
+
+        @param listOfFilenames: A list(or other iterable) of filenames
+        that will be searched.
         @type listOfFilenames: Array
         @param includeUserReports: If enable the user modules(reports) will
         be searched. Default is True
         @type includeUserReports: Boolean
         """
-
-        if (len(listOfFilenames) > 0) :
-            regex = self.__findRegexCore
-            reportClasses = self.__coreClasses
-            if (includeUserReports):
-                regex = "%s|%s" %(self.__findRegexCore, self.__findRegexUser)
-                reportClasses += self.__userClasses
-            detectionFileMap = {}
-            for reportClass in reportClasses:
-                detectionFileMap[reportClass.REPORT_NAME.replace(" ", "_")] = reportClass
-            #message = "The regular expression used for searching for report types:\n\t  %s." %(regex)
-            #logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-            rem = re.compile(regex)
-            for line in listOfFilenames:
-                mo = rem.match(line)
-                if mo:
-                    if (detectionFileMap.has_key(mo.lastgroup)):
-                        reportClass = detectionFileMap.get(mo.lastgroup)
-                        report = reportClass()
-                        return report
+        detectionIndex = self.__getDetectionIndex(includeUserReports)
+        for line in listOfFilenames:
+            reportClass = detectionIndex.findReportClass(line)
+            if (not reportClass == None):
+                return reportClass()
         return None
 
+    def __findReportInDir(self, pathToDir, includeUserReports=True) :
+        """
+        Returns the report that matches the directory. The type
+        detection files are checked directly under the directory first,
+        which is where they are for a report that was extracted by
+        sx. Otherwise the directory is walked until a type detection
+        file is found. None is returned if no report type is found.
+
+        @return: Returns the report that matches the directory.
+        @rtype: Report
+
+        @param pathToDir: The path to the directory.
+        @type pathToDir: String
+        @param includeUserReports: If enable the user modules(reports) will
+        be searched. Default is True
+        @type includeUserReports: Boolean
+        """
+        for (detectionPath, reportClass) in self.__getDetectionIndex(includeUserReports).getDetectionPaths():
+            if (os.path.exists(os.path.join(pathToDir, detectionPath))):
+                return reportClass()
+        return self.__findReport(self.__walkDir(pathToDir), includeUserReports)
+
+    def __walkDir(self, pathToDir) :
+        """
+        A generator that yields the path to each file in the directory
+        and its subdirectories, so that the directory is only walked
+        until the caller stops.
+
+        @param pathToDir: The path to the directory.
+        @type pathToDir: String
+        """
+        for root, dirs, files in os.walk(pathToDir):
+            for currentFilename in files:
+                yield os.path.join(root, currentFilename)
+
     def getReportByName(self, reportName, includeUserReports=True):
-        reportClasses = self.__coreClasses
+        # A new list is created so the list of the core classes is not
+        # changed.
+        reportClasses = list(self.__coreClasses)
         if (includeUserReports):
             reportClasses += self.__userClasses
         for reportClass in reportClasses:
@@ -253,19 +700,17 @@ class ReportsLoader(ModulesLoader) :
         # report signatures.
         message = "Searching for a known report type from the path: %s." %(pathToFilename)
         logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-        listOfFilenames = []
+        report = None
         if (os.path.isfile(pathToFilename)):
-            # If file then i need to extract with extractor to get list of files.
+            # If file then the list of files comes from the index of the
+            # compressed file. The index is shared with the extractors,
+            # so the compressed file is not listed again when extracted.
             extractor = self.__extractorsLoader.getExtractor(pathToFilename, includeUserReports)
             if (not extractor == None):
-                listOfFilenames = extractor.list()
+                report = self.__findReport(extractor.list(), includeUserReports)
         elif (os.path.isdir(pathToFilename)):
             # If dir i dont need to extract anything just search the dir
-            listOfFilenames = []
-            for root, dirs, files in os.walk(pathToFilename):
-                for currentFilename in files:
-                    listOfFilenames.append(os.path.join(root, currentFilename))
-        report = self.__findReport(listOfFilenames, includeUserReports)
+            report = self.__findReportInDir(pathToFilename, includeUserReports)
         if (report == None) :
             message = "The report type could not be determined for the filepath: %s." %(pathToFilename)
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
@@ -306,12 +751,112 @@ class ReportsLoader(ModulesLoader) :
 class PluginsLoader(ModulesLoader) :
     """
     This class will load plugins and do various operations on plugins.
+
+    The metadata of a plugin is read from the dictionary that is
+    assigned to the variable PLUGIN_METADATA in the module of the plugin
+    without importing the module, so only the plugins that will be ran
+    need to be imported.
+
+    @cvar METADATA_VARIABLE_NAME: The name of the variable in the module
+    of a plugin that is assigned the metadata of the plugin.
+    @type METADATA_VARIABLE_NAME: String
+    @cvar METADATA_KEYS: The keys that the metadata of a plugin must
+    have.
+    @type METADATA_KEYS: Array
     """
+    METADATA_VARIABLE_NAME = "PLUGIN_METADATA"
+    METADATA_KEYS = ["name", "description", "reportTypes", "enabled", "requireReports", "options"]
 
     def __init__(self):
         ModulesLoader.__init__(self)
         self.__pathToBaseDir = sx.SXImportPath.generateBaseImportPath()
 
+    def getPluginMetadata(pathToModuleFile):
+        """
+        Returns the metadata of the plugin that is read from the module
+        file without importing the module. None is returned if the
+        module does not have valid metadata.
+
+        @return: Returns the metadata of the plugin.
+        @rtype: Dictionary
+
+        @param pathToModuleFile: The path to the module file of the
+        plugin.
+        @type pathToModuleFile: String
+        """
+        try:
+            fin = open(pathToModuleFile, "r")
+            try:
+                moduleTree = ast.parse(fin.read(), pathToModuleFile)
+            finally:
+                fin.close()
+        except (IOError, os.error, SyntaxError, TypeError):
+            return None
+        for node in moduleTree.body:
+            if ((isinstance(node, ast.Assign)) and (len(node.targets) == 1) and
+                (isinstance(node.targets[0], ast.Name)) and
+                (node.targets[0].id == PluginsLoader.METADATA_VARIABLE_NAME)):
+                try:
+                    metadataMap = ast.literal_eval(node.value)
+                except ValueError:
+                    message = "The plugin metadata is not a literal in the module: %s" %(pathToModuleFile)
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+                    return None
+                if (not isinstance(metadataMap, dict)):
+                    return None
+                for key in PluginsLoader.METADATA_KEYS:
+                    if (not metadataMap.has_key(key)):
+                        message = "The plugin metadata is missing the key \"%s\" in the module: %s" %(key, pathToModuleFile)
+                        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+                        return None
+                return metadataMap
+        return None
+    getPluginMetadata = staticmethod(getPluginMetadata)
+
+    def getPluginModules(self, includeUserPlugins=True):
+        """
+        Returns a list of the plugin modules without importing them. Each
+        item is a tuple of the metadata of the plugin, the python import
+        name, and the class name. The metadata is None if the module
+        does not have valid metadata.
+
+        @return: Returns a list of the plugin modules.
+        @rtype: Array
+
+        @param includeUserPlugins: If enable the user modules(plugins) will
+        be included. Default is True.
+        @type includeUserPlugins: Boolean
+        """
+        listOfModules = self.getModules(self.__pathToBaseDir, sx.PLUGIN_CORE_IMPORT)
+        if (includeUserPlugins):
+            listOfModules += self.getModules(sx.SXConfigurationFiles.CONFIGURATION_DIR,
+                                             sx.SXConfigurationFiles.PLUGIN_USER_IMPORT)
+        listOfPluginModules = []
+        for (moduleImport, moduleClassName, pathToModuleFile) in listOfModules:
+            listOfPluginModules.append((PluginsLoader.getPluginMetadata(pathToModuleFile), moduleImport, moduleClassName))
+        return listOfPluginModules
+
+    def loadPlugin(self, pathToPluginReportDir, moduleImport, moduleClassName):
+        """
+        Returns a loaded(instance) plugin that is imported from the
+        module. None is returned if the plugin could not be imported.
+
+        @return: Returns a loaded(instance) plugin.
+        @rtype: PluginBase
+
+        @param pathToPluginReportDir: Root directory for the path for
+        which plugin report will be written.
+        @type pathToPluginReportDir: String
+        @param moduleImport: The python import name of the module.
+        @type moduleImport: String
+        @param moduleClassName: Name of the class of the plugin.
+        @type moduleClassName: String
+        """
+        mClass = self.importClass(moduleImport, moduleClassName)
+        if (mClass == None):
+            return None
+        return mClass(pathToPluginReportDir)
+
     def load(self, pathToPluginReportDir, includeUserPlugins=True):
         """
         This class will return a list of loaded(instance) objects based on path
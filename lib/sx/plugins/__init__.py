@@ -12,35 +12,198 @@ import time
 import os
 import os.path
 import logging
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 
 import sx
 from sx.logwriter import LogWriter
 from sx.modulesloader import PluginsLoader
 from sx.tools import ConsoleUtil
+from sx.reports import FileContentCache
 
 from sx.analysisreport import AnalysisReport
 from sx.analysisreport import ARSection
 from sx.analysisreport import ARSectionItem
 
+def prefetchFile(reportAndPath):
+    """
+    This function will read a file from a report into the content
+    cache of the reports. This function is ran by the threads that
+    prefetch the files.
+
+    @param reportAndPath: A tuple of the report and the path to the
+    file, which is relative to the root of the report.
+    @type reportAndPath: Tuple
+    """
+    (report, pathToFile) = reportAndPath
+    report.getDataFromFile(pathToFile)
+
+def runScheduledPlugin(index):
+    """
+    This function will run the setup(), execute(), and report() of a
+    plugin of the current scheduler. This function is ran by the
+    processes of the scheduler, which are forked after the plugins and
+    reports are loaded, so only the index of the plugin is passed.
+
+    @return: Returns the analysis reports of the plugin.
+    @rtype: Array
+
+    @param index: The index of the plugin in the list of plugins of the
+    scheduler.
+    @type index: Int
+    """
+    return PluginScheduler.CURRENT.runPlugin(index)
+
+class PluginInfo:
+    """
+    This class is the information about a plugin that is known before
+    the plugin is loaded. A plugin that has metadata is only loaded when
+    it is enabled, and a plugin that does not have metadata is loaded so
+    that its information can be read.
+    """
+    def __init__(self, name, className, enabled, moduleImport, metadataMap=None, plugin=None):
+        """
+        @param name: The name of the plugin.
+        @type name: String
+        @param className: The name of the class of the plugin.
+        @type className: String
+        @param enabled: If True then the plugin is enabled.
+        @type enabled: Boolean
+        @param moduleImport: The python import name of the module of the
+        plugin.
+        @type moduleImport: String
+        @param metadataMap: The metadata of the plugin. None if the
+        plugin does not have metadata.
+        @type metadataMap: Dictionary
+        @param plugin: The loaded plugin. None if the plugin is not
+        loaded.
+        @type plugin: PluginBase
+        """
+        self.__name = name
+        self.__className = className
+        self.__enabled = enabled
+        self.__moduleImport = moduleImport
+        self.__metadataMap = metadataMap
+        self.__plugin = plugin
+
+    def getName(self):
+        return self.__name
+
+    def getClassName(self):
+        return self.__className
+
+    def getModuleImport(self):
+        return self.__moduleImport
+
+    def isEnabled(self):
+        return self.__enabled
+
+    def setEnabled(self, enabled):
+        self.__enabled = enabled
+
+    def getPlugin(self):
+        return self.__plugin
+
+    def getDescription(self):
+        """
+        Returns the description of the plugin from the loaded plugin or
+        from the metadata.
+
+        @return: Returns the description of the plugin.
+        @rtype: String
+        """
+        if (not self.__plugin == None):
+            return self.__plugin.getDescription()
+        return self.__metadataMap.get("description")
+
+    def getOptions(self):
+        """
+        Returns a map of the name of each option of the plugin to the
+        description of the option from the loaded plugin or from the
+        metadata.
+
+        @return: Returns a map of the name of each option to the
+        description of the option.
+        @rtype: Dictionary
+        """
+        if (not self.__plugin == None):
+            optionsMap = {}
+            for optionName in self.__plugin.getOptions():
+                optionsMap[optionName] = self.__plugin.getOptionDescription(optionName)
+            return optionsMap
+        return self.__metadataMap.get("options")
+
+    def isNamed(self, name):
+        """
+        Returns True if the name is the name of the plugin or the name
+        of its class. This is not case sensitive.
+
+        @return: Returns True if the name is the name of the plugin or
+        the name of its class.
+        @rtype: Boolean
+
+        @param name: The name that will be compared.
+        @type name: String
+        """
+        return PluginBase.isMatchingName(name, self.__name, self.__className)
+
 class PluginsHelper:
-    def printPluginsList(self, includeUserPlugins=True):
-        # Load up all plugins and pass the directory to write reports
+    """
+    @cvar PREFETCH_THREADS: The number of threads that read the files
+    the plugins require before the plugins are ran. If 0 then the
+    files are not prefetched.
+    @type PREFETCH_THREADS: Int
+    """
+    PREFETCH_THREADS = 8
+
+    def __getPluginsInfo(self, pathToPluginReportDir, includeUserPlugins):
+        """
+        Returns a list of the information about each plugin. The
+        plugins that have metadata are not loaded and the plugins that
+        do not have metadata are loaded so that their information can be
+        read.
+
+        @return: Returns a list of the information about each plugin.
+        @rtype: Array
+
+        @param pathToPluginReportDir: Root directory for the path for
+        which plugin report will be written.
+        @type pathToPluginReportDir: String
+        @param includeUserPlugins: If enable the user modules(plugins) will
+        be included.
+        @type includeUserPlugins: Boolean
+        """
         pluginLoader = PluginsLoader()
-        loadedPlugins = pluginLoader.load("", includeUserPlugins)
-        if (not len(loadedPlugins) > 0):
+        pluginsInfo = []
+        for (metadataMap, moduleImport, moduleClassName) in pluginLoader.getPluginModules(includeUserPlugins):
+            if (not metadataMap == None):
+                pluginsInfo.append(PluginInfo(metadataMap.get("name"), moduleClassName, metadataMap.get("enabled"),
+                                              moduleImport, metadataMap=metadataMap))
+            else:
+                plugin = pluginLoader.loadPlugin(pathToPluginReportDir, moduleImport, moduleClassName)
+                if (not plugin == None):
+                    pluginsInfo.append(PluginInfo(plugin.getName(), moduleClassName, plugin.isEnabled(),
+                                                  moduleImport, plugin=plugin))
+        return pluginsInfo
+
+    def printPluginsList(self, includeUserPlugins=True):
+        # Read the metadata of the plugins. Only the plugins that do not
+        # have metadata are loaded.
+        pluginsInfo = self.__getPluginsInfo("", includeUserPlugins)
+        if (not len(pluginsInfo) > 0):
             logging.getLogger(sx.MAIN_LOGGER_NAME).error("There were no plugins found.")
         else:
             enabledMessage = "The following plugins are currently enabled by default:\n"
             disabledMessage = "The following plugins are currently disabled by default:\n"
-            for plugin in loadedPlugins:
-                if plugin.isEnabled():
+            for pluginInfo in pluginsInfo:
+                if (pluginInfo.isEnabled()):
                     enabledMessage = "%s%s: %s\n" %(enabledMessage,
-                                                    ConsoleUtil.colorText(str(plugin.getName()),"red"),
-                                                    plugin.getDescription())
+                                                    ConsoleUtil.colorText(str(pluginInfo.getName()),"red"),
+                                                    pluginInfo.getDescription())
                 else:
                     disabledMessage = "%s%s: %s\n" %(disabledMessage,
-                                                     ConsoleUtil.colorText(str(plugin.getName()),"red"),
-                                                     plugin.getDescription())
+                                                     ConsoleUtil.colorText(str(pluginInfo.getName()),"red"),
+                                                     pluginInfo.getDescription())
             if (not len(enabledMessage) > 0):
                 enabledMessage = "There was no plugins enabled."
             if (not len(disabledMessage) > 0):
@@ -48,45 +211,59 @@ class PluginsHelper:
             print  "\n%s\n%s" %(enabledMessage, disabledMessage)
 
             print "The list of available options for plugins:"
-            for plugin in loadedPlugins:
-                optionNames = plugin.getOptions()
-                if (len(optionNames) > 0):
-                    for optionName in optionNames :
-                        optionDescription = plugin.getOptionDescription(optionName)
-                        print "%s.%s: %s" %(ConsoleUtil.colorText(str(plugin.getName()),"red"),
-                                            ConsoleUtil.colorText(optionName,"red"),
-                                            optionDescription)
+            for pluginInfo in pluginsInfo:
+                optionsMap = pluginInfo.getOptions()
+                for optionName in optionsMap.keys():
+                    print "%s.%s: %s" %(ConsoleUtil.colorText(str(pluginInfo.getName()),"red"),
+                                        ConsoleUtil.colorText(optionName,"red"),
+                                        optionsMap.get(optionName))
 
     def getEnabledPluginsList(self, pathToPluginReportDir, enableAllPlugins, disableAllPlugins,
                               listOfEnabledPlugins, listOfDisabledPlugins, pluginsOptionsMap,
                               includeUserPlugins=True):
-        # Load up all plugins and pass the directory to write reports
-        pluginLoader = PluginsLoader()
-        loadedPlugins = pluginLoader.load(pathToPluginReportDir, includeUserPlugins)
+        # Read the metadata of the plugins and only load the plugins that
+        # are enabled. The plugins that do not have metadata are always
+        # loaded.
+        pluginsInfo = self.__getPluginsInfo(pathToPluginReportDir, includeUserPlugins)
 
         # Enable/Disable all
         if (enableAllPlugins) :
-            for plugin in loadedPlugins:
-                plugin.setEnabled(True)
+            for pluginInfo in pluginsInfo:
+                pluginInfo.setEnabled(True)
         elif (disableAllPlugins) :
-            for plugin in loadedPlugins:
-                plugin.setEnabled(False)
+            for pluginInfo in pluginsInfo:
+                pluginInfo.setEnabled(False)
 
+        # The name of the plugin and the class name can be different.
         # Enable singletons
         if (len(listOfEnabledPlugins) > 0):
             for ePlug in listOfEnabledPlugins:
-                for lPlug in loadedPlugins:
-                    if (lPlug.isNamed(str(ePlug))):
-                        lPlug.setEnabled(True)
+                for pluginInfo in pluginsInfo:
+                    if (pluginInfo.isNamed(str(ePlug))):
+                        pluginInfo.setEnabled(True)
                         break;
 
         # Disable Singletons
         if (len(listOfDisabledPlugins) > 0):
             for dPlug in listOfDisabledPlugins:
-                for lPlug in loadedPlugins:
-                    if (lPlug.isNamed(str(dPlug))):
-                        lPlug.setEnabled(False)
+                for pluginInfo in pluginsInfo:
+                    if (pluginInfo.isNamed(str(dPlug))):
+                        pluginInfo.setEnabled(False)
                         break;
+
+        # Load the plugins that are enabled and have not been loaded.
+        pluginLoader = PluginsLoader()
+        loadedPlugins = []
+        for pluginInfo in pluginsInfo:
+            if (not pluginInfo.isEnabled()):
+                continue
+            plugin = pluginInfo.getPlugin()
+            if (plugin == None):
+                plugin = pluginLoader.loadPlugin(pathToPluginReportDir, pluginInfo.getModuleImport(), pluginInfo.getClassName())
+                if (plugin == None):
+                    continue
+            plugin.setEnabled(True)
+            loadedPlugins.append(plugin)
         # #######################################################################
         # Get a list of only the enabled plugins and set the options for
         # each. Will add options later on in another iterations.
@@ -113,40 +290,417 @@ class PluginsHelper:
         # Return the list of enabled plugins.
         return enabledPlugins
 
-    def generatePluginReports(self, listOfReports, listOfEnabledPlugins):
-        # Setup: gather files needed from each report
+    def getRequiredFiles(self, listOfEnabledPlugins):
+        """
+        Returns the union of the path patterns for the files that the
+        enabled plugins read from the reports. An empty list is returned
+        if there are no plugins that require reports or a plugin requires
+        every file in the reports, since all the files will need to be
+        extracted.
+
+        @return: Returns the union of the path patterns for the files
+        that the enabled plugins read from the reports.
+        @rtype: Array
+
+        @param listOfEnabledPlugins: The list of enabled plugins.
+        @type listOfEnabledPlugins: Array
+        """
+        listOfPathPatterns = []
         for plugin in listOfEnabledPlugins:
-            if ((plugin.isReportsRequired()) and (len(listOfReports) > 0)):
-                plugin.setup(listOfReports)
+            if (not plugin.isReportsRequired()):
+                continue
+            listOfRequiredFiles = plugin.getRequiredFiles()
+            if (not len(listOfRequiredFiles) > 0):
+                message = "The plugin %s requires all the files in the reports." %(plugin.getName())
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+                return []
+            for pathPattern in listOfRequiredFiles:
+                if (not pathPattern in listOfPathPatterns):
+                    listOfPathPatterns.append(pathPattern)
+        return listOfPathPatterns
+
+    def prefetchRequiredFiles(self, listOfReports, listOfEnabledPlugins):
+        """
+        This function will read the files that the enabled plugins
+        require from each report into the content cache of the reports
+        with a pool of threads, so that the plugins do not wait on each
+        file when they read the reports. The files of a virtual report
+        are read in a single pass over the compressed file instead. The
+        files are only read until the budget of the content cache is
+        used.
+
+        @return: Returns the number of files that were read.
+        @rtype: Int
+
+        @param listOfReports: The list of reports.
+        @type listOfReports: Array
+        @param listOfEnabledPlugins: The list of enabled plugins.
+        @type listOfEnabledPlugins: Array
+        """
+        if (not PluginsHelper.PREFETCH_THREADS > 0):
+            return 0
+        # A list of tuples of the report and the path of each file that
+        # will be read.
+        listOfFiles = []
+        # A list of tuples of each virtual report and the paths of the
+        # files that will be read from it.
+        listOfVirtualFiles = []
+        prefetchSize = 0
+        for report in listOfReports:
+            if (prefetchSize > FileContentCache.MAXIMUM_SIZE):
+                # The budget was used by the files of the previous
+                # reports.
+                break
+            listOfPathPatterns = []
+            for plugin in listOfEnabledPlugins:
+                if ((plugin.isReportsRequired()) and (plugin.isValidReportType(report))):
+                    for pathPattern in plugin.getRequiredFiles():
+                        if (not pathPattern in listOfPathPatterns):
+                            listOfPathPatterns.append(pathPattern)
+            if (not len(listOfPathPatterns) > 0):
+                continue
+            listOfPaths = []
+            for pathToFile in report.getFilesMatchingPatterns(listOfPathPatterns):
+                fileSize = report.getFileSize(pathToFile)
+                if ((fileSize < 0) or (fileSize > FileContentCache.MAXIMUM_FILE_SIZE)):
+                    continue
+                prefetchSize += fileSize
+                if (prefetchSize > FileContentCache.MAXIMUM_SIZE):
+                    break
+                listOfPaths.append(pathToFile)
+            if (not len(listOfPaths) > 0):
+                continue
+            elif (report.isVirtual()):
+                # The threads are not used for virtual reports since each
+                # thread would decompress the compressed file again.
+                listOfVirtualFiles.append((report, listOfPaths))
+            else:
+                for pathToFile in listOfPaths:
+                    listOfFiles.append((report, pathToFile))
+        filesCount = 0
+        for (report, listOfPaths) in listOfVirtualFiles:
+            message = "Reading %d files from the compressed file of the report %s before the plugins are ran." %(len(listOfPaths), report.getName())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            filesCount += report.cacheDataFromFiles(listOfPaths)
+        if (not len(listOfFiles) > 0):
+            return filesCount
+        message = "Reading %d files from the reports with %d threads before the plugins are ran." %(len(listOfFiles), PluginsHelper.PREFETCH_THREADS)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        pool = ThreadPool(processes=PluginsHelper.PREFETCH_THREADS)
+        try:
+            pool.map(prefetchFile, listOfFiles)
+        finally:
+            pool.close()
+            pool.join()
+        return filesCount + len(listOfFiles)
+
+    def generatePluginReports(self, listOfReports, listOfEnabledPlugins, pluginJobs=1):
+        # Prefetch: read the files the plugins require into the cache
+        self.prefetchRequiredFiles(listOfReports, listOfEnabledPlugins)
 
-        # Execute: run some intense operation that could be used in report/action
+        listOfPlugins = []
         for plugin in listOfEnabledPlugins:
             if ((plugin.isReportsRequired()) and (len(listOfReports) > 0)):
+                listOfPlugins.append(plugin)
+        scheduler = PluginScheduler(listOfPlugins, listOfReports, pluginJobs)
+        if ((pluginJobs <= 1) and (not scheduler.hasDependencies())):
+            # Setup: gather files needed from each report
+            for plugin in listOfPlugins:
+                plugin.setup(listOfReports)
+
+            # Execute: run some intense operation that could be used in report/action
+            for plugin in listOfPlugins:
                 plugin.execute()
 
-        # Reports: write a report to console or file for each plugin
-        for plugin in listOfEnabledPlugins:
-            if ((plugin.isReportsRequired()) and (len(listOfReports) > 0)):
+            # Reports: write a report to console or file for each plugin
+            for plugin in listOfPlugins:
                 plugin.report()
+        else:
+            # Setup, Execute, and Reports: the setup(), execute(), and
+            # report() of each plugin are ran after the plugins it
+            # depends on.
+            scheduler.run()
 
         # Actions: does something that is outside of sx such as opening a
-        # browser, filemanager, etc.
-        for plugin in listOfEnabledPlugins:
-            if ((plugin.isReportsRequired()) and (len(listOfReports) > 0)):
-                plugin.action()
+        # browser, filemanager, etc. The actions are done after every
+        # plugin has written its report. The plugins that override
+        # action() were ran in this process, so the action() has what
+        # the plugin gathered in setup().
+        for plugin in scheduler.getOrderedPlugins():
+            plugin.action()
+
+class PluginScheduler:
+    """
+    This class runs the setup(), execute(), and report() of each plugin
+    after the plugins that it depends on. The plugins that are parallel
+    safe(see PluginBase.isParallelSafe()) are ran in a pool of processes
+    at the same time as the other plugins and the rest of the plugins
+    are ran one at a time in this process. If the number of jobs is 1 then all the plugins are ran
+    in this process in the order of their dependencies. When the plugins
+    have no dependencies and the number of jobs is 1, the PluginsHelper
+    runs the setup() of every plugin, then the execute() of every plugin,
+    and then the report() of every plugin instead of the scheduler.
+
+    A plugin that is ran in the pool of processes is ran on a copy of the
+    plugin, so only the files it writes and its analysis reports are
+    returned to this process.
+
+    @cvar CURRENT: The scheduler that is running the plugins. The
+    processes of the pool use it to find the plugins.
+    @type CURRENT: PluginScheduler
+    @cvar PLUGIN_JOB_TIMEOUT: The number of seconds to wait for a plugin
+    that is ran in the pool of processes to finish.
+    @type PLUGIN_JOB_TIMEOUT: Int
+    @cvar POLL_INTERVAL: The number of seconds to wait for a plugin
+    that is ran in the pool of processes before checking if other
+    plugins can be started.
+    @type POLL_INTERVAL: Float
+    """
+    CURRENT = None
+    PLUGIN_JOB_TIMEOUT = 86400
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, listOfPlugins, listOfReports, pluginJobs=1):
+        """
+        @param listOfPlugins: The list of plugins that will be ran.
+        @type listOfPlugins: Array
+        @param listOfReports: The list of reports.
+        @type listOfReports: Array
+        @param pluginJobs: The number of plugins that will be ran in
+        parallel.
+        @type pluginJobs: Int
+        """
+        self.__listOfPlugins = listOfPlugins
+        self.__listOfReports = listOfReports
+        self.__pluginJobs = pluginJobs
+        # A map of the index of each plugin to the list of the indexes
+        # of the plugins that it depends on.
+        self.__dependenciesMap = self.__getDependenciesMap()
+        self.__listOfOrderedIndexes = self.__getOrderedIndexes()
+
+    def __getDependenciesMap(self):
+        """
+        Returns a map of the index of each plugin to the list of the
+        indexes of the plugins that it depends on. The dependencies
+        that are not enabled are ignored.
+
+        @return: Returns a map of the index of each plugin to the list
+        of the indexes of the plugins that it depends on.
+        @rtype: Dictionary
+        """
+        dependenciesMap = {}
+        for index in range(0, len(self.__listOfPlugins)):
+            plugin = self.__listOfPlugins[index]
+            dependenciesMap[index] = []
+            for dependency in plugin.getDependencies():
+                found = False
+                for dIndex in range(0, len(self.__listOfPlugins)):
+                    if ((not dIndex == index) and (self.__listOfPlugins[dIndex].isNamed(dependency))):
+                        if (not dIndex in dependenciesMap[index]):
+                            dependenciesMap[index].append(dIndex)
+                        found = True
+                        break
+                if (not found):
+                    message = "The plugin %s depends on the plugin %s which is not enabled." %(plugin.getName(), dependency)
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return dependenciesMap
+
+    def __getOrderedIndexes(self):
+        """
+        Returns the list of the indexes of the plugins where each plugin
+        is after the plugins that it depends on. Otherwise the plugins
+        keep the order they were enabled in. If the dependencies have a
+        cycle then the dependencies are ignored and the order the plugins
+        were enabled in is used.
+
+        @return: Returns the list of the indexes of the plugins in the
+        order of their dependencies.
+        @rtype: Array
+        """
+        listOfOrderedIndexes = []
+        while (len(listOfOrderedIndexes) < len(self.__listOfPlugins)):
+            found = False
+            for index in range(0, len(self.__listOfPlugins)):
+                if (index in listOfOrderedIndexes):
+                    continue
+                isReady = True
+                for dIndex in self.__dependenciesMap.get(index):
+                    if (not dIndex in listOfOrderedIndexes):
+                        isReady = False
+                        break
+                if (isReady):
+                    listOfOrderedIndexes.append(index)
+                    found = True
+                    break
+            if (not found):
+                message = "The dependencies of the plugins have a cycle, so the dependencies will be ignored."
+                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                for index in self.__dependenciesMap.keys():
+                    self.__dependenciesMap[index] = []
+                return range(0, len(self.__listOfPlugins))
+        return listOfOrderedIndexes
+
+    def hasDependencies(self):
+        """
+        Returns True if a plugin depends on another plugin that is
+        enabled.
+
+        @return: Returns True if a plugin depends on another plugin
+        that is enabled.
+        @rtype: Boolean
+        """
+        for index in self.__dependenciesMap.keys():
+            if (len(self.__dependenciesMap.get(index)) > 0):
+                return True
+        return False
+
+    def getOrderedPlugins(self):
+        """
+        Returns the list of plugins where each plugin is after the
+        plugins that it depends on.
+
+        @return: Returns the list of plugins in the order of their
+        dependencies.
+        @rtype: Array
+        """
+        return [self.__listOfPlugins[index] for index in self.__listOfOrderedIndexes]
+
+    def runPlugin(self, index):
+        """
+        Runs the setup(), execute(), and report() of the plugin.
+
+        @return: Returns the analysis reports of the plugin.
+        @rtype: Array
+
+        @param index: The index of the plugin.
+        @type index: Int
+        """
+        plugin = self.__listOfPlugins[index]
+        plugin.setup(self.__listOfReports)
+        plugin.execute()
+        plugin.report()
+        return plugin.getAnalysisReports()
+
+    def run(self):
+        """
+        Runs the setup(), execute(), and report() of each plugin after
+        the plugins it depends on have finished.
+        """
+        listOfParallelIndexes = []
+        if (self.__pluginJobs > 1):
+            for index in self.__listOfOrderedIndexes:
+                if (self.__listOfPlugins[index].isParallelSafe()):
+                    listOfParallelIndexes.append(index)
+        if (not len(listOfParallelIndexes) > 1):
+            for index in self.__listOfOrderedIndexes:
+                self.runPlugin(index)
+            return
+        message = "Running %d plugins with %d parallel jobs." %(len(listOfParallelIndexes), self.__pluginJobs)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+        # The processes are forked when the pool is created, so the
+        # scheduler has to be set before.
+        PluginScheduler.CURRENT = self
+        pool = multiprocessing.Pool(processes=min(self.__pluginJobs, len(listOfParallelIndexes)))
+        listOfPendingIndexes = list(self.__listOfOrderedIndexes)
+        listOfFinishedIndexes = []
+        # A map of the index of each plugin that is running in the pool to
+        # the result of the plugin and the time it was started.
+        runningMap = {}
+        try:
+            while ((len(listOfPendingIndexes) > 0) or (len(runningMap.keys()) > 0)):
+                listOfReadyIndexes = []
+                for index in listOfPendingIndexes:
+                    isReady = True
+                    for dIndex in self.__dependenciesMap.get(index):
+                        if (not dIndex in listOfFinishedIndexes):
+                            isReady = False
+                            break
+                    if (isReady):
+                        listOfReadyIndexes.append(index)
+                # Start the plugins that are ready in the pool, then run the
+                # first plugin that is ready and not parallel safe in this
+                # process while the pool runs the others.
+                serialIndex = None
+                for index in listOfReadyIndexes:
+                    if (index in listOfParallelIndexes):
+                        listOfPendingIndexes.remove(index)
+                        runningMap[index] = (pool.apply_async(runScheduledPlugin, (index,)), time.time())
+                    elif (serialIndex == None):
+                        serialIndex = index
+                if (not serialIndex == None):
+                    listOfPendingIndexes.remove(serialIndex)
+                    self.runPlugin(serialIndex)
+                    listOfFinishedIndexes.append(serialIndex)
+                # Collect the plugins that have finished in the pool.
+                listOfDoneIndexes = []
+                for index in runningMap.keys():
+                    (asyncResult, startTime) = runningMap.get(index)
+                    if (asyncResult.ready()):
+                        listOfDoneIndexes.append(index)
+                    elif (time.time() - startTime > PluginScheduler.PLUGIN_JOB_TIMEOUT):
+                        raise multiprocessing.TimeoutError("The plugin %s did not finish." %(self.__listOfPlugins[index].getName()))
+                if ((not len(listOfDoneIndexes) > 0) and (serialIndex == None) and (len(runningMap.keys()) > 0)):
+                    # A timeout is used so that control-c can interrupt the wait.
+                    runningMap.values()[0][0].wait(PluginScheduler.POLL_INTERVAL)
+                for index in listOfDoneIndexes:
+                    (asyncResult, startTime) = runningMap.pop(index)
+                    plugin = self.__listOfPlugins[index]
+                    for analysisReport in asyncResult.get(PluginScheduler.PLUGIN_JOB_TIMEOUT):
+                        plugin.addAnalysisReport(analysisReport)
+                    listOfFinishedIndexes.append(index)
+                    message = "The plugin %s finished in a parallel job." %(plugin.getName())
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            pool.close()
+        except:
+            pool.terminate()
+            PluginScheduler.CURRENT = None
+            raise
+        pool.join()
+        PluginScheduler.CURRENT = None
 
 class PluginBase:
     """
     This is the base class for all plugins.
+
+    The module of a plugin should assign a dictionary literal to the
+    variable PLUGIN_METADATA with the keys: name, description,
+    reportTypes, enabled, requireReports, and options. The metadata is
+    read without importing the module so that only the plugins that are
+    enabled are imported, which is why it has to be a literal and not
+    built from other variables. The plugin passes the same dictionary to
+    __init__() as the metadataMap. A plugin without metadata is imported
+    every time the plugins are listed.
+
+    @cvar REQUIRED_FILES: A list of path patterns(shell-style
+    wildcards that are relative to the root of the report) for the
+    files that the plugin reads from the reports. If the list is
+    empty then the plugin requires every file in the reports.
+    @type REQUIRED_FILES: Array
+    @cvar DEPENDENCIES: A list of the names of the plugins whose
+    report() has to finish before the setup() of this plugin is
+    ran. The plugins that are not enabled are ignored.
+    @type DEPENDENCIES: Array
+    @cvar PARALLEL_SAFE: If True then the setup(), execute(), and
+    report() of the plugin can be ran in another process at the same
+    time as other plugins. The action() is always ran in the main
+    process after every plugin has written its report, and the main
+    process does not have anything the plugin gathered in setup() in
+    another process. A plugin that overrides action() is therefore
+    never ran in another process, even if this is True.
+    @type PARALLEL_SAFE: Boolean
     """
+    REQUIRED_FILES = []
+    DEPENDENCIES = []
+    PARALLEL_SAFE = False
     def __init__(self,
-                 name,
-                 description,
-                 validReportTypes,
-                 enabled,
-                 requireReports,
-                 options,
-                 pathToPluginReportDir="") :
+                 name="",
+                 description="",
+                 validReportTypes=[],
+                 enabled=False,
+                 requireReports=True,
+                 options={},
+                 pathToPluginReportDir="",
+                 metadataMap=None) :
         """
         This is the default initialized function for a plugin. The
         options dictionary will contain keys and values. The keys is
@@ -176,7 +730,19 @@ class PluginBase:
         @param pathToPluginReportDir: Path to location where the reports
         will be written.
         @type pathToPluginReportDir: String
+        @param metadataMap: The PLUGIN_METADATA of the module of the
+        plugin. If it is not None then the name, description, valid
+        report types, enabled, requireReports, and options are read from
+        it instead.
+        @type metadataMap: Dictionary
         """
+        if (not metadataMap == None):
+            name = metadataMap.get("name")
+            description = metadataMap.get("description")
+            validReportTypes = list(metadataMap.get("reportTypes"))
+            enabled = metadataMap.get("enabled")
+            requireReports = metadataMap.get("requireReports")
+            options = dict(metadataMap.get("options"))
         self.__name = name
         self.__description = description
         self.__enabled = enabled
@@ -276,6 +842,45 @@ class PluginBase:
         """
         return self.__pathToPluginReportDir
 
+    def getRequiredFiles(self) :
+        """
+        Returns a list of path patterns for the files that the plugin
+        reads from the reports. An empty list is returned if the plugin
+        requires every file in the reports.
+
+        @return: Returns a list of path patterns for the files that
+        the plugin reads from the reports.
+        @rtype: Array
+        """
+        return self.REQUIRED_FILES
+
+    def getDependencies(self) :
+        """
+        Returns a list of the names of the plugins that have to write
+        their reports before this plugin is ran.
+
+        @return: Returns a list of the names of the plugins that this
+        plugin depends on.
+        @rtype: Array
+        """
+        return self.DEPENDENCIES
+
+    def isParallelSafe(self) :
+        """
+        Returns True if the plugin can be ran in another process at the
+        same time as other plugins. False is returned if the plugin
+        overrides action(), since the action() is ran in this process
+        and would not have what the plugin gathered in the other
+        process.
+
+        @return: Returns True if the plugin can be ran in another
+        process at the same time as other plugins.
+        @rtype: Boolean
+        """
+        if (not self.__class__.action.im_func is PluginBase.action.im_func):
+            return False
+        return self.PARALLEL_SAFE
+
     def getReportTypes(self) :
         """
         Returns an array of valid report types.
@@ -399,11 +1004,28 @@ class PluginBase:
         @param name: The name that will be compared.
         @type name: String
         """
+        return PluginBase.isMatchingName(name, self.getName(), self.__class__.__name__)
+
+    def isMatchingName(name, pluginName, className) :
+        """
+        Returns True if the name that is given is same as the name of
+        the plugin or the name of the class of the plugin. It compares
+        all names via lower cases. This is not case senstive.
+
+        @return: Returns True if the name that is given is same as the
+        name of the plugin or the name of the class of the plugin.
+        @rtype: Boolean
+
+        @param name: The name that will be compared.
+        @type name: String
+        @param pluginName: The name of the plugin.
+        @type pluginName: String
+        @param className: The name of the class of the plugin.
+        @type className: String
+        """
         # The name of the plugin and the class name can be different.
-        if ((name.lower() == self.getName().lower()) or
-            (name.lower() == self.__class__.__name__.lower())):
-            return True
-        return False
+        return ((name.lower() == pluginName.lower()) or (name.lower() == className.lower()))
+    isMatchingName = staticmethod(isMatchingName)
 
     # #######################################################################
     # Functions to get listing of files and removal of files.
@@ -25,6 +25,13 @@ from sx.analysisreport import AnalysisReport
 from sx.analysisreport import ARSection
 from sx.analysisreport import ARSectionItem
 
+PLUGIN_METADATA = {"name":"Checksysreport",
+                   "description":"This plugin creates a checksysreport based on each extracted sosreport/sysreport.",
+                   "reportTypes":["Sosreport", "Sysreport"],
+                   "enabled":False,
+                   "requireReports":True,
+                   "options":{"enable_binary":"Enables running of binary checksysreport command instead of native call(options: on/off). "}}
+
 class Checksysreport(sx.plugins.PluginBase):
     """
     A class that can run checksysreport against a report and then
@@ -40,6 +47,7 @@ class Checksysreport(sx.plugins.PluginBase):
     CHECKSYSREPORT_LIBS = "/usr/share/checksysreport"
     CHECKSYSREPORT_EXE = "/usr/bin/checksysreport"
     CHEKCSYSREPORT_CONFIG_FILE = os.environ['HOME']+"/.checksysreportrc"
+    PARALLEL_SAFE = True
     def __init__(self, pathToPluginReportDir="") :
         """
         This init takes the root path to where the reports will be
@@ -50,9 +58,7 @@ class Checksysreport(sx.plugins.PluginBase):
         the report files will be written.
         @type pathToPluginReportDir: String
         """
-        sx.plugins.PluginBase.__init__(self, "Checksysreport",
-                                       "This plugin creates a checksysreport based on each extracted sosreport/sysreport.",
-                                       ["Sosreport", "Sysreport"], False, True, {"enable_binary":"Enables running of binary checksysreport command instead of native call(options: on/off). "}, pathToPluginReportDir)
+        sx.plugins.PluginBase.__init__(self, pathToPluginReportDir=pathToPluginReportDir, metadataMap=PLUGIN_METADATA)
         self.__chksysData = {}
         self.__installedRPMSPath = {}
         self.setOptionValue("enable_binary", "on");
@@ -165,7 +171,12 @@ class Checksysreport(sx.plugins.PluginBase):
                                    "installed-rpms"]
 
         for report in reports:
-            if (self.isValidReportType(report)) :
+            if ((self.isValidReportType(report)) and (report.isVirtual())):
+                # checksysreport runs against the directory of the report,
+                # which does not exist for a virtual report.
+                message = "The report will be skipped because it was not extracted: %s" %(report.getPathToExtractedReport())
+                logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
+            elif (self.isValidReportType(report)) :
                 (head, tail) = os.path.split(report.getPathToExtractedReport())
                 self.__chksysData[report.getPathToExtractedReport()] =  ""
                 # Find the installed rpm file that is required.
@@ -37,11 +37,31 @@ from sx.plugins.lib.clusterha.clusterhastorage import ClusterHAStorage
 from sx.reports.sosreport import Sosreport
 from sx.reports.sysreport import Sysreport
 
+PLUGIN_METADATA = {"name":"Cluster",
+                   "description":"This plugin will analyze the configuration of the High Availability and Resilient Storage cluster from the information gathered in the sosreports.",
+                   "reportTypes":["Sosreport", "Sysreport"],
+                   "enabled":True,
+                   "requireReports":True,
+                   "options":{"isStretchCluster":"If the option is set 1 then the plugin will analyze the reports as a stretch cluster."}}
+
 class Clusterha(sx.plugins.PluginBase):
     """
     This class will run various validation tests and gather
     information about Report Objects that are cluster nodes.
+
+    @cvar REQUIRED_FILES: A list of path patterns for the files that
+    the plugin reads from the reports.
+    @type REQUIRED_FILES: Array
     """
+    PARALLEL_SAFE = True
+    REQUIRED_FILES = ["etc/cluster/*", "etc/sysconfig/cluster", "sos_commands/cluster/*",
+                      "etc/redhat-release", "etc/hosts", "etc/modprobe.conf", "etc/sysconfig/network-scripts/*",
+                      "ifconfig", "proc/net/*", "sos_commands/networking/*",
+                      "chkconfig", "sos_commands/startup/*", "etc/fstab", "etc/exports", "etc/samba/smb.conf",
+                      "etc/lvm/lvm.conf", "etc/multipath.conf", "mount", "proc/devices",
+                      "proc/filesystems", "proc/partitions", "proc/scsi/*", "sos_commands/devicemapper/*",
+                      "sos_commands/filesys/*", "sos_commands/kernel/*",
+                      "uname", "dmidecode", "sos_commands/hardware/*"]
     def __init__(self, pathToPluginReportDir="") :
         """
         This init takes the root path to where the reports will be
@@ -52,9 +72,7 @@ class Clusterha(sx.plugins.PluginBase):
         the report files will be written.
         @type pathToPluginReportDir: String
         """
-        sx.plugins.PluginBase.__init__(self, "Cluster",
-                                       "This plugin will analyze the configuration of the High Availability and Resilient Storage cluster from the information gathered in the sosreports.",
-                                       ["Sosreport", "Sysreport"], True, True, {"isStretchCluster":"If the option is set 1 then the plugin will analyze the reports as a stretch cluster."}, pathToPluginReportDir)
+        sx.plugins.PluginBase.__init__(self, pathToPluginReportDir=pathToPluginReportDir, metadataMap=PLUGIN_METADATA)
 
         # Set the default options for the plugin
         self.setOptionValue("isStretchCluster", "0");
@@ -82,7 +100,12 @@ class Clusterha(sx.plugins.PluginBase):
                 # reports into the correct bin in case there are multiple
                 # clusters uploaded.
                 pathToClusterConfFile = report.getPathForFile("etc/cluster/cluster.conf")
-                if ((not len(pathToClusterConfFile) > 0) or (not os.path.exists(pathToClusterConfFile))) :
+                if ((len(pathToClusterConfFile) > 0) and (report.isVirtual())):
+                    # The file of a virtual report is not on disk, so it is parsed
+                    # from the data that is read from the compressed file.
+                    ClusterHAConfAnalyzer.setClusterConfData(pathToClusterConfFile, report.getDataFromFile("etc/cluster/cluster.conf"))
+                if ((not len(pathToClusterConfFile) > 0) or
+                    ((not os.path.exists(pathToClusterConfFile)) and (not report.isVirtual()))) :
                     message = "The cluster.conf file could not be located for this report."
                     logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
                     return False
@@ -30,12 +30,29 @@ from sx.reports.sosreport import Sosreport
 from sx.plugins.lib.gluster.glusterpeernodes import GlusterPeerNodes
 from sx.plugins.lib.gluster.glusterpeernode import GlusterPeerNode
 
+PLUGIN_METADATA = {"name":"Gluster",
+                   "description":"This plugin will analyze sosreports that are using gluster.",
+                   "reportTypes":["Sosreport"],
+                   "enabled":True,
+                   "requireReports":True,
+                   "options":{}}
+
 class Gluster(sx.plugins.PluginBase):
+    """
+    A class that can analyze the gluster peers in the sosreports.
+
+    @cvar REQUIRED_FILES: A list of path patterns for the files that
+    the plugin reads from the reports.
+    @type REQUIRED_FILES: Array
+    """
+    PARALLEL_SAFE = True
+    REQUIRED_FILES = ["etc/redhat-release", "etc/hosts", "etc/modprobe.conf", "etc/sysconfig/network-scripts/*",
+                      "ifconfig", "proc/net/*", "sos_commands/networking/*",
+                      "chkconfig", "sos_commands/startup/*", "proc/filesystems", "mount", "sos_commands/filesys/*",
+                      "etc/fstab", "ps", "sos_commands/process/*",
+                      "var/lib/glusterd/*", "etc/glusterd.info", "etc/peers/*", "etc/vols/*"]
     def __init__(self, pathToPluginReportDir="") :
-        sx.plugins.PluginBase.__init__(self, "Gluster",
-                                       "This plugin will analyze sosreports that are using gluster.",
-                                       ["Sosreport"], True, True, {},
-                                       pathToPluginReportDir)
+        sx.plugins.PluginBase.__init__(self, pathToPluginReportDir=pathToPluginReportDir, metadataMap=PLUGIN_METADATA)
 
         self.__glusterPeerNodes = GlusterPeerNodes()
 
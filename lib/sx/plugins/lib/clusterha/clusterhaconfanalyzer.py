@@ -614,7 +614,30 @@ class ClusterHAConfAnalyzer :
     """
     This class does various operations on a cluster.conf file that is
     in xml format.
+
+    @cvar CLUSTER_CONF_DATA_MAP: A map of the path to a cluster.conf
+    file to the lines of the file, for the files of virtual reports
+    that are not on disk.
+    @type CLUSTER_CONF_DATA_MAP: Dictionary
     """
+    CLUSTER_CONF_DATA_MAP = {}
+
+    def setClusterConfData(pathToClusterConf, clusterConfReadLines):
+        """
+        Sets the lines of a cluster.conf file that is not on disk, such
+        as a file of a virtual report, so that the file is parsed from
+        the lines instead of read from the path. Nothing is set if the
+        lines are None.
+
+        @param pathToClusterConf: Path to the cluster.conf file.
+        @type pathToClusterConf: String
+        @param clusterConfReadLines: The lines of the cluster.conf file.
+        @type clusterConfReadLines: Array
+        """
+        if (not clusterConfReadLines == None):
+            ClusterHAConfAnalyzer.CLUSTER_CONF_DATA_MAP[pathToClusterConf] = clusterConfReadLines
+    setClusterConfData = staticmethod(setClusterConfData)
+
     def __init__(self, pathToClusterConf) :
         """
         Setups the cluster xml xpathcontext for the file. It will add
@@ -631,8 +654,10 @@ class ClusterHAConfAnalyzer :
         self.__pathToClusterConf = pathToClusterConf
         self.__ccRootElement = None
 
-        if (os.path.exists(self.__pathToClusterConf)) :
-            clusterConfReadLines = []
+        clusterConfReadLines = []
+        if (ClusterHAConfAnalyzer.CLUSTER_CONF_DATA_MAP.has_key(self.__pathToClusterConf)):
+            clusterConfReadLines = ClusterHAConfAnalyzer.CLUSTER_CONF_DATA_MAP.get(self.__pathToClusterConf)
+        elif (os.path.exists(self.__pathToClusterConf)) :
             try:
                 clusterConfFile = open(self.__pathToClusterConf, "r")
                 clusterConfReadLines = clusterConfFile.readlines()
@@ -640,38 +665,38 @@ class ClusterHAConfAnalyzer :
             except IOError:
                 message = "There was an error reading the file: %s" %(self.__pathToClusterConf)
                 logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
-            # Create the XML data string and replace/remove some text
-            # in the XML file to make sure it parses with no errros.
-            clusterConfString = ""
-            for line in clusterConfReadLines:
-                # Sometimes parser errors are thrown to console from
-                # cluster.conf when parsing the file. Example:
-                # parser warning : Unsupported version '1.1' <?xml version="1.1"?>
-                # I will skip the header declaration to avoid these.
-                if (not line.startswith("<?xml")):
-                    if (line.find("=***") >= 0):
-                        line = re.sub("=\*\*\*", "=\"***\"", line)
-                    if (line.find('"<') >=0):
-                        line = re.sub('="<', '="', line)
-                    if (line.find('>"') >=0):
-                        line = re.sub('>"', '"', line)
-                    clusterConfString += line
-            if (len(clusterConfString) > 0):
-                # #######################################################################
-                # Try to do xml parsing with elementtree instead of libxml2.
-                # #######################################################################
-                try:
-                    self.__ccRootElement = fromstring(clusterConfString)
-                except IOError:
-                    message = "There was an IO error on parsing the file: %s." %(self.__pathToClusterConf)
-                    logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
-                except ParseError:
-                    message = "There was an XML parsing error analyzing the file: %s." %(self.__pathToClusterConf)
-                    logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
         else:
             message = "The cluster.conf file does not exist: %s" %(self.__pathToClusterConf)
             logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
             return
+        # Create the XML data string and replace/remove some text
+        # in the XML file to make sure it parses with no errros.
+        clusterConfString = ""
+        for line in clusterConfReadLines:
+            # Sometimes parser errors are thrown to console from
+            # cluster.conf when parsing the file. Example:
+            # parser warning : Unsupported version '1.1' <?xml version="1.1"?>
+            # I will skip the header declaration to avoid these.
+            if (not line.startswith("<?xml")):
+                if (line.find("=***") >= 0):
+                    line = re.sub("=\*\*\*", "=\"***\"", line)
+                if (line.find('"<') >=0):
+                    line = re.sub('="<', '="', line)
+                if (line.find('>"') >=0):
+                    line = re.sub('>"', '"', line)
+                clusterConfString += line
+        if (len(clusterConfString) > 0):
+            # #######################################################################
+            # Try to do xml parsing with elementtree instead of libxml2.
+            # #######################################################################
+            try:
+                self.__ccRootElement = fromstring(clusterConfString)
+            except IOError:
+                message = "There was an IO error on parsing the file: %s." %(self.__pathToClusterConf)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
+            except ParseError:
+                message = "There was an XML parsing error analyzing the file: %s." %(self.__pathToClusterConf)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
 
     # #######################################################################
     # Private IS Functions
@@ -751,6 +776,14 @@ class ClusterHAConfAnalyzer :
     def isClusterConfFilesIdentical(self, listOfFiles) :
         if (not len(listOfFiles) > 1):
             return False
+        # The files that are not on disk are compared with the lines
+        # that were set for them.
+        listOfContents = []
+        for pathToFile in listOfFiles:
+            if (ClusterHAConfAnalyzer.CLUSTER_CONF_DATA_MAP.has_key(pathToFile)):
+                listOfContents.append("".join(ClusterHAConfAnalyzer.CLUSTER_CONF_DATA_MAP.get(pathToFile)).rstrip())
+        if (len(listOfContents) == len(listOfFiles)):
+            return (len(set(listOfContents)) == 1)
         return  FileUtil.isFilesIdentical(listOfFiles)
 
     def isQDiskEnabledWithHeurtistics(self):
@@ -372,13 +372,18 @@ class ClusterNodes:
         # Verify that cluster.conf exists and plugin will work
         # with the distro release
         pathToClusterConfFile = report.getPathForFile("etc/cluster/cluster.conf")
-        if ((not len(pathToClusterConfFile) > 0) or (not os.path.exists(pathToClusterConfFile))) :
+        if ((len(pathToClusterConfFile) > 0) and (report.isVirtual())):
+            # The file of a virtual report is not on disk, so it is parsed
+            # from the data that is read from the compressed file.
+            ClusterHAConfAnalyzer.setClusterConfData(pathToClusterConfFile, report.getDataFromFile("etc/cluster/cluster.conf"))
+        if ((not len(pathToClusterConfFile) > 0) or
+            ((not os.path.exists(pathToClusterConfFile)) and (not report.isVirtual()))) :
             message = "The cluster.conf file could not be located for this report."
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
             return False
         # cca will verify that cluster.conf is valid xml
         cca = ClusterHAConfAnalyzer(pathToClusterConfFile)
-        distroRelease = DistroReleaseParser.parseEtcRedHatReleaseRedhatReleaseData(report.getDataFromFile("etc/redhat-release"))
+        distroRelease = DistroReleaseParser.parseEtcRedHatReleaseRedhatReleaseData(report.getDistroReleaseData())
         # ###############################################################
         # If distro release is not supported or cluster.conf
         # does not validate to be true then the node will not
@@ -405,10 +410,8 @@ class ClusterNodes:
         # ###############################################################
         clusterCommandsMap = report.getDataFromDir("sos_commands/cluster")
         # Create the network maps
-        ifconfigData = report.getDataFromFile("sos_commands/networking/ifconfig_-a")
-        if (ifconfigData == None):
-            ifconfigData = report.getDataFromFile("ifconfig")
-        networkInterfaces = NetworkDeviceParser.parseIfconfigData(ifconfigData)
+        networkInterfaces = report.getParsedDataFromFile(NetworkDeviceParser.parseIfconfigData,
+                                                         ["sos_commands/networking/ifconfig_-a", "ifconfig"])
 
         # ###############################################################
         # Get more network interfaces might need to add this at some point for
@@ -462,10 +465,8 @@ class ClusterNodes:
         # ###############################################################
         # Check the services
         # ###############################################################
-        chkConfigData = report.getDataFromFile("chkconfig")
-        if (chkConfigData == None):
-            chkConfigData = report.getDataFromFile("sos_commands/startup/chkconfig_--list")
-        chkConfigList = RunLevelParser.parseChkConfigData(chkConfigData)
+        chkConfigList = report.getParsedDataFromFile(RunLevelParser.parseChkConfigData,
+                                                     ["chkconfig", "sos_commands/startup/chkconfig_--list"])
 
         # ###############################################################
         # Find any GFS1/GFS2 filesystems
@@ -501,7 +502,7 @@ class ClusterNodes:
         unameA = KernelParser.parseUnameAData(unameAData)
 
         # Maybe I should return a map of stanza or dmidecode object just maps them. Need to code for NODE.
-        dmidecodeStanzas = DmiDecodeParser.parseDmiDecodeData(report.getDataFromFile("dmidecode"))
+        dmidecodeStanzas = report.getParsedDataFromFile(DmiDecodeParser.parseDmiDecodeData, ["dmidecode"])
 
         # ###############################################################
         # Create the node since it is valid then append to collection
@@ -36,7 +36,7 @@ class GlusterPeerNodes:
         return self.__glusterPeerNodes
 
     def add(self, report) :
-        distroRelease = DistroReleaseParser.parseEtcRedHatReleaseRedhatReleaseData(report.getDataFromFile("etc/redhat-release"))
+        distroRelease = DistroReleaseParser.parseEtcRedHatReleaseRedhatReleaseData(report.getDistroReleaseData())
         # ###############################################################
         # If distro release is not supported or cluster.conf
         # does not validate to be true then the node will not
@@ -52,10 +52,8 @@ class GlusterPeerNodes:
             logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
             return False
         # Create the network maps
-        ifconfigData = report.getDataFromFile("sos_commands/networking/ifconfig_-a")
-        if (ifconfigData == None):
-            ifconfigData = report.getDataFromFile("ifconfig")
-        networkInterfaces = NetworkDeviceParser.parseIfconfigData(ifconfigData)
+        networkInterfaces = report.getParsedDataFromFile(NetworkDeviceParser.parseIfconfigData,
+                                                         ["sos_commands/networking/ifconfig_-a", "ifconfig"])
 
         etcHostsMap = NetworkDeviceParser.parseEtcHostsData(report.getDataFromFile("etc/hosts"))
         modprobeConfCommands = ModulesParser.parseEtcModprobeConf(report.getDataFromFile("etc/modprobe.conf"))
@@ -83,10 +81,8 @@ class GlusterPeerNodes:
         # ###############################################################
         # Check the services
         # ###############################################################
-        chkConfigData = report.getDataFromFile("chkconfig")
-        if (chkConfigData == None):
-            chkConfigData = report.getDataFromFile("sos_commands/startup/chkconfig_--list")
-        chkConfigList = RunLevelParser.parseChkConfigData(chkConfigData)
+        chkConfigList = report.getParsedDataFromFile(RunLevelParser.parseChkConfigData,
+                                                     ["chkconfig", "sos_commands/startup/chkconfig_--list"])
 
         # ###############################################################
         # Find Filesystems
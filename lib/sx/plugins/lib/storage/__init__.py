@@ -17,6 +17,7 @@ from sx.plugins.lib.storage.procparser import ProcFilesystems
 from sx.plugins.lib.storage.procparser import ProcMounts
 from sx.plugins.lib.storage.procparser import ProcDevices
 from sx.plugins.lib.storage.procparser import ProcScsiScsi
+from sx.plugins.lib.storage.devicemapperparser import DeviceMapperParser
 from sx.plugins.lib.kernel.modulesparser import ModulesParser
 from sx.plugins.lib.kernel.modulesparser import LSMod
 from sx.plugins.lib.storage.filesysparser import FilesysParser
@@ -199,7 +200,7 @@ class StorageDataGenerator:
         @type reports: Array
         """
         storageData = None
-        distroRelease = DistroReleaseParser.parseEtcRedHatReleaseRedhatReleaseData(report.getDataFromFile("etc/redhat-release"))
+        distroRelease = DistroReleaseParser.parseEtcRedHatReleaseRedhatReleaseData(report.getDistroReleaseData())
         procFilesystemsList = ProcParser.parseProcFilesystemsData(report.getDataFromFile("proc/filesystems"))
         fsTypes = []
         for procFilesystem in procFilesystemsList:
@@ -210,13 +211,14 @@ class StorageDataGenerator:
         filesysMountsList = FilesysParser.parseFilesysMountData(mountData, fsTypes)
 
         dmCommandsMap = report.getDataFromDir("sos_commands/devicemapper")
-        blockDeviceTree = BlockDeviceTree(ProcParser.parseProcPartitionsData(report.getDataFromFile("proc/partitions")),
+        blockDeviceTree = BlockDeviceTree(report.getParsedDataFromFile(ProcParser.parseProcPartitionsData, ["proc/partitions"]),
                                           procFilesystemsList,
                                           ProcParser.parseProcDevicesData(report.getDataFromFile("proc/devices")),
                                           ProcParser.parseProcScsiScsiData(report.getDataFromFile("proc/scsi/scsi")),
                                           filesysMountsList,
                                           dmCommandsMap.get("dmsetup_info_-c"),
-                                          dmCommandsMap.get("dmsetup_table"))
+                                          report.getParsedDataFromFile(DeviceMapperParser.parseDMSetupTableData,
+                                                                       ["sos_commands/devicemapper/dmsetup_table"]))
         lvmConfData = report.getDataFromFile("etc/lvm/lvm.conf")
         # Empty array for now while system log parser is reworked.
         varLogMessagesList = []
@@ -148,7 +148,7 @@ class DeviceMapperBlockDevice(BlockDevice):
 class BlockDeviceTree:
     def __init__(self, procPartitionsList, procFilesystemsList,
                  procDevicesList, procScsiScsiList,
-                 filesysMountList, dmsetupInfoCData, dmsetupTableData):
+                 filesysMountList, dmsetupInfoCData, dmsetupTableList):
 
         self.__validTargetTypes = ["linear", "striped", "mirror", "snapshot-origin",
                                    "snapshot", "error", "zero", "multipath"]
@@ -160,7 +160,7 @@ class BlockDeviceTree:
         self.__filesysMountList = filesysMountList
 
         self.__dmsetupInfoCMap = DeviceMapperParser.parseDMSetupInfoCData(dmsetupInfoCData)
-        self.__dmsetupTableList = DeviceMapperParser.parseDMSetupTableData(dmsetupTableData)
+        self.__dmsetupTableList = dmsetupTableList
 
 
     def __str__(self):
@@ -29,6 +29,14 @@ from sx.plugins.lib.kernel.modulesparser import ModulesParser
 from sx.analysisreport import AnalysisReport
 from sx.analysisreport import ARSection
 from sx.analysisreport import ARSectionItem
+
+PLUGIN_METADATA = {"name":"Networking",
+                   "description":"This plugin analyzes the networking data colleted from sosreports/sysreports.",
+                   "reportTypes":["Sosreport"],
+                   "enabled":True,
+                   "requireReports":True,
+                   "options":{}}
+
 class NetworkingData:
     def __init__(self, hostname, uptime, distroRelease, uname, networkMaps):
         """
@@ -109,7 +117,14 @@ class NetworkingData:
 class Networking(sx.plugins.PluginBase):
     """
     A class that can run analyze the networking aspect of a sosreport/sysreport.
+
+    @cvar REQUIRED_FILES: A list of path patterns for the files that
+    the plugin reads from the reports.
+    @type REQUIRED_FILES: Array
     """
+    PARALLEL_SAFE = True
+    REQUIRED_FILES = ["etc/redhat-release", "etc/hosts", "etc/modprobe.conf", "etc/sysconfig/network-scripts/*",
+                      "ifconfig", "proc/net/*", "sos_commands/networking/*"]
     def __init__(self, pathToPluginReportDir="") :
         """
         This init takes the root path to where the reports will be
@@ -123,9 +138,7 @@ class Networking(sx.plugins.PluginBase):
         the report files will be written.
         @type pathToPluginReportDir: String
         """
-        sx.plugins.PluginBase.__init__(self, "Networking",
-                                       "This plugin analyzes the networking data colleted from sosreports/sysreports.",
-                                       ["Sosreport"], True, True, {}, pathToPluginReportDir)
+        sx.plugins.PluginBase.__init__(self, pathToPluginReportDir=pathToPluginReportDir, metadataMap=PLUGIN_METADATA)
 
         # This will contain a list of NetworkingData objects that
         # contains information found in sosreports.
@@ -149,13 +162,11 @@ class Networking(sx.plugins.PluginBase):
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
 
             if (self.isValidReportType(report)) :
-                distroRelease = DistroReleaseParser.parseEtcRedHatReleaseRedhatReleaseData(report.getDataFromFile("etc/redhat-release"))
+                distroRelease = DistroReleaseParser.parseEtcRedHatReleaseRedhatReleaseData(report.getDistroReleaseData())
                 # Create the network maps
 
-                ifconfigData = report.getDataFromFile("sos_commands/networking/ifconfig_-a")
-                if (ifconfigData == None):
-                    ifconfigData = report.getDataFromFile("ifconfig")
-                networkInterfaces = NetworkDeviceParser.parseIfconfigData(ifconfigData)
+                networkInterfaces = report.getParsedDataFromFile(NetworkDeviceParser.parseIfconfigData,
+                                                                 ["sos_commands/networking/ifconfig_-a", "ifconfig"])
                 etcHostsMap = NetworkDeviceParser.parseEtcHostsData(report.getDataFromFile("etc/hosts"))
                 # Appears this is not collect on rhel6
                 # modprobeConfdList = report.getDataFromDir("etc/modprobe.conf.d")
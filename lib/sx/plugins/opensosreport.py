@@ -24,6 +24,13 @@ import sx
 import sx.plugins
 from sx.logwriter import LogWriter
 
+PLUGIN_METADATA = {"name":"OpenSOSReport",
+                   "description":"This plugin opens the html report generated by sosreport in a browser.",
+                   "reportTypes":["Sosreport"],
+                   "enabled":False,
+                   "requireReports":True,
+                   "options":{"fileviewer":"This is the browser that will be used to open reports."}}
+
 class Opensosreport(sx.plugins.PluginBase):
     """
     This is that will open a webbrowser for an html file contain in sosreport.
@@ -38,10 +45,7 @@ class Opensosreport(sx.plugins.PluginBase):
         the report files will be written.
         @type pathToPluginReportDir: String
         """
-        sx.plugins.PluginBase.__init__(self, "OpenSOSReport",
-                                       "This plugin opens the html report generated by sosreport in a browser.",
-                                       ["Sosreport"], False, True, {"fileviewer":"This is the browser that will be used to open reports."},
-                                       pathToPluginReportDir)
+        sx.plugins.PluginBase.__init__(self, pathToPluginReportDir=pathToPluginReportDir, metadataMap=PLUGIN_METADATA)
 
         self.__pathToHTMLReportMap = {}
 
@@ -14,10 +14,22 @@ import sx
 import sx.plugins
 from sx.logwriter import LogWriter
 
+PLUGIN_METADATA = {"name":"RHEV",
+                   "description":"This plugin will run on report on RHEV log collector report files.",
+                   "reportTypes":["Rhevlogcollector", "sosreport", "sysreport"],
+                   "enabled":True,
+                   "requireReports":True,
+                   "options":{}}
+
 class Rhev(sx.plugins.PluginBase):
     """
     This is that will do a report on RHEV log collector.
+
+    @cvar REQUIRED_FILES: A list of path patterns for the files that
+    the plugin reads from the reports.
+    @type REQUIRED_FILES: Array
     """
+    REQUIRED_FILES = ["ps", "sos_commands/process/*"]
     def __init__(self, pathToPluginReportDir=""):
         """
         This init takes the root path to where the reports will be
@@ -28,10 +40,7 @@ class Rhev(sx.plugins.PluginBase):
         the report files will be written.
         @type pathToPluginReportDir: String
         """
-        sx.plugins.PluginBase.__init__(self, "RHEV",
-                                       "This plugin will run on report on RHEV log collector report files.",
-                                       ["Rhevlogcollector", "sosreport", "sysreport"], True, True, {},
-                                       pathToPluginReportDir)
+        sx.plugins.PluginBase.__init__(self, pathToPluginReportDir=pathToPluginReportDir, metadataMap=PLUGIN_METADATA)
 
         self.__psDataMap = {}
     # #######################################################################
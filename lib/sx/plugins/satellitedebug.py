@@ -16,11 +16,23 @@ import sx.plugins
 from sx.logwriter import LogWriter
 from sx.reports.satellitedebug import Satellitedebug
 
+PLUGIN_METADATA = {"name":"SatelliteDebug",
+                   "description":"This plugin verifies an rhn satellite server debug file that is created.",
+                   "reportTypes":["Satellitedebug"],
+                   "enabled":False,
+                   "requireReports":True,
+                   "options":{}}
+
 class Satellitedebug(sx.plugins.PluginBase):
     """
     This is a plugin for rhnsatellite debug that will perform various
     validation tests.
+
+    @cvar REQUIRED_FILES: A list of path patterns for the files that
+    the plugin reads from the reports.
+    @type REQUIRED_FILES: Array
     """
+    REQUIRED_FILES = ["timestamp", "rpm-manifest"]
     def __init__(self, pathToPluginReportDir=""):
         """
         This init takes the root path to where the reports will be
@@ -31,10 +43,7 @@ class Satellitedebug(sx.plugins.PluginBase):
         the report files will be written.
         @type pathToPluginReportDir: String
         """
-        sx.plugins.PluginBase.__init__(self, "SatelliteDebug",
-                                       "This plugin verifies an rhn satellite server debug file that is created.",
-                                       ["Satellitedebug"], False, True, {},
-                                       pathToPluginReportDir)
+        sx.plugins.PluginBase.__init__(self, pathToPluginReportDir=pathToPluginReportDir, metadataMap=PLUGIN_METADATA)
 
         self.__rhnSatDebugReports = []
 
@@ -58,7 +67,7 @@ class Satellitedebug(sx.plugins.PluginBase):
                     timestamp = [""]
                 rsdr = RHNSatelliteDebugReport(timestamp[0].rstrip())
                 self.__rhnSatDebugReports.append(rsdr)
-                rsdr.setInstalledSatellitePackages(report.getPathForFile("rpm-manifest"))
+                rsdr.setInstalledSatellitePackages(report.getDataFromFile("rpm-manifest"))
 
     def report(self) :
         """
@@ -97,23 +106,20 @@ class RHNSatelliteDebugReport:
         self.__timestamp = timestamp
         self.__installedSatellitePackages = []
 
-    def setInstalledSatellitePackages(self, pathToRpmManifest):
+    def setInstalledSatellitePackages(self, rpmManifestData):
         """
-        Function sets the path to the rpm-manifest file.
+        Function sets the installed satellite packages from the data of
+        the rpm-manifest file, which is read from the report so that it
+        does not have to be on disk.
 
-        @param pathToRpmManifest: The path to the rpm manifest file.
-        @type pathToRpmManifest: String
+        @param rpmManifestData: The lines of the rpm manifest file.
+        @type rpmManifestData: Array
         """
-        print pathToRpmManifest
-        try:
-            fin = open(pathToRpmManifest, "r")
-            lines = fin.readlines()
-            fin.close()
-        except (IOError, os.error):
-            message = "An i/o error occured in reading the file getting the file: \n\t%s" %(pathToRpmManifest)
+        if (rpmManifestData == None):
+            message = "The rpm-manifest file could not be read from the report."
             logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
             return []
-        for package in lines:
+        for package in rpmManifestData:
             if "rhns" in package:
                 self.__installedSatellitePackages.append(package)
             elif "rhnmd" in package:
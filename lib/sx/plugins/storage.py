@@ -25,10 +25,26 @@ from sx.plugins.lib.storage.storageevaluator import StorageEvaluator
 from sx.analysisreport import AnalysisReport
 from sx.analysisreport import ARSection
 from sx.analysisreport import ARSectionItem
+
+PLUGIN_METADATA = {"name":"Storage",
+                   "description":"This plugin analyzes the storage data colleted from sosreports.",
+                   "reportTypes":["Sosreport"],
+                   "enabled":True,
+                   "requireReports":True,
+                   "options":{}}
+
 class Storage(sx.plugins.PluginBase):
     """
     A class that can run analyze the storage aspect of a sosreport.
+
+    @cvar REQUIRED_FILES: A list of path patterns for the files that
+    the plugin reads from the reports.
+    @type REQUIRED_FILES: Array
     """
+    PARALLEL_SAFE = True
+    REQUIRED_FILES = ["etc/redhat-release", "etc/lvm/lvm.conf", "etc/multipath.conf", "mount", "proc/devices",
+                      "proc/filesystems", "proc/partitions", "proc/scsi/*", "sos_commands/devicemapper/*",
+                      "sos_commands/filesys/*", "sos_commands/kernel/*"]
     def __init__(self, pathToPluginReportDir="") :
         """
         This init takes the root path to where the reports will be
@@ -42,9 +58,7 @@ class Storage(sx.plugins.PluginBase):
         the report files will be written.
         @type pathToPluginReportDir: String
         """
-        sx.plugins.PluginBase.__init__(self, "Storage",
-                                       "This plugin analyzes the storage data colleted from sosreports.",
-                                       ["Sosreport"], True, True, {}, pathToPluginReportDir)
+        sx.plugins.PluginBase.__init__(self, pathToPluginReportDir=pathToPluginReportDir, metadataMap=PLUGIN_METADATA)
 
         # This will contain a list of StorageData objects that
         # contains information found in sosreports.
@@ -8,15 +8,32 @@ base class that all report types should inherit.
 @version   :  2.17
 @copyright :  GPLv2
 """
+import sys
 import os
 import os.path
 import shutil
 import re
 import logging
+import collections
+import threading
+import fnmatch
+import glob
+import gzip
+import bz2
+import mmap
+import array
+import bisect
+import json
+import hashlib
+import tempfile
+import cPickle
+from cStringIO import StringIO
 
 import sx
 from sx.logwriter import LogWriter
 from sx.tools import ConsoleUtil
+from sx.tools import FileUtil
+from sx.extractors import Extractor
 from sx.modulesloader import ReportsLoader
 
 class ReportsHelper:
@@ -44,11 +61,770 @@ class ReportsHelper:
                                       report.getDescription())
 
 
+class FileContentCache:
+    """
+    This class is a cache of the contents of the files that are read
+    from the reports. All the reports share one cache that has a
+    memory budget and the least recently used files are evicted when
+    the budget is exceeded. A file that does not exist is cached as
+    None.
+
+    @cvar MAXIMUM_SIZE: The maximum number of bytes of file contents
+    that are cached.
+    @type MAXIMUM_SIZE: Int
+    @cvar MAXIMUM_FILE_SIZE: The maximum number of bytes of a single
+    file that will be cached. Larger files are not cached so that one
+    file does not evict all the other files.
+    @type MAXIMUM_FILE_SIZE: Int
+    """
+    MAXIMUM_SIZE = 67108864
+    MAXIMUM_FILE_SIZE = 8388608
+
+    def __init__(self):
+        # A map of the key to a tuple of the size and the contents in
+        # the order that the keys were used.
+        self.__contentsMap = collections.OrderedDict()
+        # The files can be added by the threads that prefetch files.
+        self.__lock = threading.RLock()
+        self.__size = 0
+        self.__hits = 0
+        self.__misses = 0
+
+    def __str__(self):
+        rstring = "%d files(%s) cached with %d hits and %d misses" %(len(self.__contentsMap.keys()),
+                                                                      FileUtil.convertBytesToString(self.__size),
+                                                                      self.__hits, self.__misses)
+        return rstring
+
+    def getHits(self):
+        return self.__hits
+
+    def getMisses(self):
+        return self.__misses
+
+    def getSize(self):
+        return self.__size
+
+    def get(self, key):
+        """
+        Returns a tuple of True and a copy of the contents of the file
+        if the file is cached, otherwise a tuple of False and None is
+        returned. The contents are None if the file does not exist. A
+        copy is returned so that the callers can modify the list. The
+        hit and miss counters are updated.
+
+        @return: Returns a tuple of True if the file is cached and a
+        copy of the contents of the file.
+        @rtype: Tuple
+
+        @param key: The key of the file.
+        @type key: Tuple
+        """
+        self.__lock.acquire()
+        try:
+            if (not self.__contentsMap.has_key(key)):
+                self.__misses += 1
+                return (False, None)
+            self.__hits += 1
+            (size, data) = self.__contentsMap.pop(key)
+            # The key is added again so that it is the most recently used.
+            self.__contentsMap[key] = (size, data)
+        finally:
+            self.__lock.release()
+        if (data == None):
+            return (True, None)
+        return (True, list(data))
+
+    def has_key(self, key):
+        self.__lock.acquire()
+        try:
+            return self.__contentsMap.has_key(key)
+        finally:
+            self.__lock.release()
+
+    def add(self, key, data):
+        """
+        Adds the contents of the file to the cache and evicts the least
+        recently used files if the cache is larger than the budget.
+
+        @param key: The key of the file.
+        @type key: Tuple
+        @param data: The contents of the file or None if the file does
+        not exist.
+        @type data: Array
+        """
+        size = 0
+        if (not data == None):
+            for line in data:
+                size += len(line)
+            data = list(data)
+        if (size > FileContentCache.MAXIMUM_FILE_SIZE):
+            return
+        self.__lock.acquire()
+        try:
+            self.remove(key)
+            self.__contentsMap[key] = (size, data)
+            self.__size += size
+            while ((self.__size > FileContentCache.MAXIMUM_SIZE) and (len(self.__contentsMap.keys()) > 0)):
+                (evictedKey, (evictedSize, evictedData)) = self.__contentsMap.popitem(last=False)
+                self.__size -= evictedSize
+        finally:
+            self.__lock.release()
+
+    def remove(self, key):
+        self.__lock.acquire()
+        try:
+            if (self.__contentsMap.has_key(key)):
+                (size, data) = self.__contentsMap.pop(key)
+                self.__size -= size
+        finally:
+            self.__lock.release()
+
+    def removeReport(self, reportKey):
+        """
+        Removes all the files that are cached for a report.
+
+        @param reportKey: The first item of the key for each file in the
+        report.
+        @type reportKey: String
+        """
+        self.__lock.acquire()
+        try:
+            for key in self.__contentsMap.keys():
+                if (key[0] == reportKey):
+                    self.remove(key)
+        finally:
+            self.__lock.release()
+
+class ParsedDataCache:
+    """
+    This class is a cache on disk of the results of the parsers that
+    parse the files in an extracted report. The files in an extracted
+    report do not change, so the result of a parser is saved the first
+    time that a file is parsed and then loaded from the cache when the
+    plugins are ran on the report again.
+
+    The key of a result is the name and the version of the parser, the
+    path to the file and the size and modification time of the
+    file. The version of a parser is the size and modification time of
+    the module that contains the parser, so the files are parsed again
+    when the parser is changed.
+
+    @cvar VERSION: The version of the format of the cache.
+    @type VERSION: Int
+    @cvar FILE_EXTENSION: The file extension of the files in the cache.
+    @type FILE_EXTENSION: String
+    """
+    VERSION = 1
+    FILE_EXTENSION = ".pickle"
+
+    def __init__(self, pathToCacheDir):
+        """
+        @param pathToCacheDir: The path to the directory of the cache.
+        @type pathToCacheDir: String
+        """
+        self.__pathToCacheDir = pathToCacheDir
+        # The plugins can be ran in parallel.
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__writes = 0
+
+    def __str__(self):
+        (entries, size) = self.getStats()
+        rstring = "%d parsed files(%s) cached with %d hits, %d misses and %d writes" %(entries, FileUtil.convertBytesToString(size),
+                                                                                      self.__hits, self.__misses, self.__writes)
+        return rstring
+
+    def getPathToCacheDir(self):
+        return self.__pathToCacheDir
+
+    def getHits(self):
+        return self.__hits
+
+    def getMisses(self):
+        return self.__misses
+
+    def getWrites(self):
+        return self.__writes
+
+    def getPathToCacheDirForReport(pathToExtractedReport):
+        """
+        Returns the path to the cache of an extracted report, which is a
+        hidden directory next to the extracted report so that it is not
+        loaded as a report.
+
+        @return: Returns the path to the cache of an extracted report.
+        @rtype: String
+
+        @param pathToExtractedReport: The path to the extracted report.
+        @type pathToExtractedReport: String
+        """
+        (head, tail) = os.path.split(os.path.normpath(pathToExtractedReport))
+        return os.path.join(head, ".%s.parsed" %(tail))
+    getPathToCacheDirForReport = staticmethod(getPathToCacheDirForReport)
+
+    def getListOfCaches(pathToExtractedReports):
+        """
+        Returns a list of the caches of the extracted reports in a
+        directory.
+
+        @return: Returns a list of the caches of the extracted reports
+        in a directory.
+        @rtype: Array
+
+        @param pathToExtractedReports: The path to the directory of the
+        extracted reports.
+        @type pathToExtractedReports: String
+        """
+        listOfCaches = []
+        if (os.path.isdir(pathToExtractedReports)):
+            for filename in sorted(os.listdir(pathToExtractedReports)):
+                pathToCacheDir = os.path.join(pathToExtractedReports, filename)
+                if ((filename.startswith(".")) and (filename.endswith(".parsed")) and (os.path.isdir(pathToCacheDir))):
+                    listOfCaches.append(ParsedDataCache(pathToCacheDir))
+        return listOfCaches
+    getListOfCaches = staticmethod(getListOfCaches)
+
+    def getKey(parseFunction, pathToFile, fileStat):
+        """
+        Returns the key of the result of a parser for a file.
+
+        @return: Returns the key of the result of a parser for a file.
+        @rtype: String
+
+        @param parseFunction: The function that parses the file.
+        @type parseFunction: Function
+        @param pathToFile: The path to the file, which is relative to
+        the root report directory.
+        @type pathToFile: String
+        @param fileStat: The result of os.stat() of the file.
+        @type fileStat: posix.stat_result
+        """
+        parserVersion = ""
+        pathToModule = getattr(sys.modules.get(parseFunction.__module__), "__file__", "")
+        if (len(pathToModule) > 0):
+            # Use the source file of the module if there is one since the
+            # compiled file is not always written again.
+            if ((pathToModule.endswith(".pyc")) or (pathToModule.endswith(".pyo"))):
+                if (os.path.isfile(pathToModule[:-1])):
+                    pathToModule = pathToModule[:-1]
+            try:
+                moduleStat = os.stat(pathToModule)
+                parserVersion = "%d:%r" %(moduleStat.st_size, moduleStat.st_mtime)
+            except os.error:
+                pass
+        keyString = repr((ParsedDataCache.VERSION, parseFunction.__module__, parseFunction.__name__, parserVersion,
+                          pathToFile, fileStat.st_size, fileStat.st_mtime))
+        return hashlib.sha1(keyString).hexdigest()
+    getKey = staticmethod(getKey)
+
+    def getStats(self):
+        """
+        Returns a tuple of the number of results in the cache and the
+        size of the cache in bytes.
+
+        @return: Returns a tuple of the number of results in the cache
+        and the size of the cache in bytes.
+        @rtype: Tuple
+        """
+        entries = 0
+        size = 0
+        if (os.path.isdir(self.__pathToCacheDir)):
+            for filename in os.listdir(self.__pathToCacheDir):
+                if (filename.endswith(ParsedDataCache.FILE_EXTENSION)):
+                    try:
+                        size += os.path.getsize(os.path.join(self.__pathToCacheDir, filename))
+                        entries += 1
+                    except os.error:
+                        continue
+        return (entries, size)
+
+    def __increment(self, counterName):
+        self.__lock.acquire()
+        try:
+            if (counterName == "hits"):
+                self.__hits += 1
+            elif (counterName == "misses"):
+                self.__misses += 1
+            elif (counterName == "writes"):
+                self.__writes += 1
+        finally:
+            self.__lock.release()
+
+    def get(self, key):
+        """
+        Returns a tuple of True and the result of the parser if the
+        result is cached, otherwise a tuple of False and None is
+        returned. A result that cannot be loaded is removed from the
+        cache.
+
+        @return: Returns a tuple of True if the result is cached and
+        the result of the parser.
+        @rtype: Tuple
+
+        @param key: The key of the result.
+        @type key: String
+        """
+        pathToEntry = os.path.join(self.__pathToCacheDir, "%s%s" %(key, ParsedDataCache.FILE_EXTENSION))
+        if (not os.path.isfile(pathToEntry)):
+            self.__increment("misses")
+            return (False, None)
+        try:
+            fin = open(pathToEntry, "rb")
+            try:
+                parsedData = cPickle.load(fin)
+            finally:
+                fin.close()
+        except (IOError, os.error, EOFError, cPickle.UnpicklingError, AttributeError, ImportError, ValueError, TypeError):
+            message = "The parsed data in the cache could not be loaded and will be removed: %s." %(pathToEntry)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            try:
+                os.remove(pathToEntry)
+            except os.error:
+                pass
+            self.__increment("misses")
+            return (False, None)
+        self.__increment("hits")
+        return (True, parsedData)
+
+    def add(self, key, parsedData):
+        """
+        Adds the result of a parser to the cache. The result is written
+        to a temporary file that is renamed so that a partial result is
+        never loaded.
+
+        @return: Returns True if the result was added to the cache.
+        @rtype: Boolean
+
+        @param key: The key of the result.
+        @type key: String
+        @param parsedData: The result of the parser.
+        @type parsedData: Object
+        """
+        pathToTmpEntry = ""
+        try:
+            if (not os.path.isdir(self.__pathToCacheDir)):
+                try:
+                    os.makedirs(self.__pathToCacheDir)
+                except os.error:
+                    # Another process could have created the directory.
+                    if (not os.path.isdir(self.__pathToCacheDir)):
+                        raise
+            (fd, pathToTmpEntry) = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=self.__pathToCacheDir)
+            fout = os.fdopen(fd, "wb")
+            try:
+                cPickle.dump(parsedData, fout, cPickle.HIGHEST_PROTOCOL)
+            finally:
+                fout.close()
+            os.rename(pathToTmpEntry, os.path.join(self.__pathToCacheDir, "%s%s" %(key, ParsedDataCache.FILE_EXTENSION)))
+        except (IOError, os.error, cPickle.PicklingError, TypeError, AttributeError):
+            message = "The parsed data could not be added to the cache: %s." %(self.__pathToCacheDir)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            if ((len(pathToTmpEntry) > 0) and (os.path.exists(pathToTmpEntry))):
+                try:
+                    os.remove(pathToTmpEntry)
+                except os.error:
+                    pass
+            return False
+        self.__increment("writes")
+        return True
+
+    def purge(self):
+        """
+        Removes the cache and returns a tuple of the number of results
+        and the number of bytes that were removed.
+
+        @return: Returns a tuple of the number of results and the
+        number of bytes that were removed.
+        @rtype: Tuple
+        """
+        (entries, size) = self.getStats()
+        if (os.path.isdir(self.__pathToCacheDir)):
+            try:
+                shutil.rmtree(self.__pathToCacheDir)
+            except OSError:
+                message = "There was an error removing the directory: %s" %(self.__pathToCacheDir)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                return (0, 0)
+        return (entries, size)
+
+class ReportPathIndex:
+    """
+    This class is an index of the paths in an extracted report. A
+    directory is listed the first time that a path in it is used, and
+    then the existence of a path and the listing of a directory are
+    answered from memory. Only the directories that are used are
+    listed, and the entries in a directory are not stat'ed when it is
+    listed.
+
+    A path is a directory if it can be listed, so symlinks to
+    directories are followed like os.path.isdir() follows them. A
+    symlink that points to nothing exists in the index, like
+    os.path.lexists(). A path outside of the report is checked on the
+    filesystem.
+    """
+    def __init__(self, pathToRoot):
+        """
+        @param pathToRoot: The path to the root directory of the
+        extracted report.
+        @type pathToRoot: String
+        """
+        self.__pathToRoot = os.path.normpath(pathToRoot)
+        # A map of the path of each directory that was listed, relative
+        # to the root, to a map of the names in the directory. The value
+        # is None if the path is not a directory.
+        self.__childrenMap = {}
+
+    def __getChildren(self, relativePath):
+        """
+        Returns a map of the names in the directory or None if the path
+        is not a directory. The directory is listed the first time it
+        is used.
+
+        @return: Returns a map of the names in the directory.
+        @rtype: Dictionary
+
+        @param relativePath: The path relative to the root of the report.
+        @type relativePath: String
+        """
+        if (not self.__childrenMap.has_key(relativePath)):
+            childrenMap = None
+            try:
+                childrenMap = dict.fromkeys(os.listdir(os.path.join(self.__pathToRoot, relativePath)), True)
+            except OSError:
+                pass
+            self.__childrenMap[relativePath] = childrenMap
+        return self.__childrenMap.get(relativePath)
+
+    def __getRelativePath(self, pathToFile):
+        """
+        Returns the path relative to the root of the report or None if
+        the path has to be checked on the filesystem.
+
+        @return: Returns the path relative to the root of the report.
+        @rtype: String
+
+        @param pathToFile: The full path to the file.
+        @type pathToFile: String
+        """
+        pathToFile = os.path.normpath(pathToFile)
+        if (pathToFile == self.__pathToRoot):
+            return ""
+        elif (not pathToFile.startswith(self.__pathToRoot + os.sep)):
+            return None
+        return pathToFile[len(self.__pathToRoot) + 1:]
+
+    def getFilePaths(self):
+        """
+        Returns the paths of all the files in the report, which are
+        relative to the root of the report. Every directory is listed,
+        but the files in the directories that a symlink points to are
+        not included.
+
+        @return: Returns the paths of all the files in the report.
+        @rtype: Array
+        """
+        listOfPaths = []
+        listOfDirs = [""]
+        while (len(listOfDirs) > 0):
+            pathToDir = listOfDirs.pop()
+            for name in self.__getChildren(pathToDir).keys():
+                pathToName = os.path.join(pathToDir, name)
+                if (self.__getChildren(pathToName) == None):
+                    listOfPaths.append(pathToName)
+                elif (not os.path.islink(os.path.join(self.__pathToRoot, pathToName))):
+                    listOfDirs.append(pathToName)
+        return listOfPaths
+
+    def exists(self, pathToFile):
+        relativePath = self.__getRelativePath(pathToFile)
+        if (relativePath == None):
+            return os.path.exists(pathToFile)
+        elif (not len(relativePath) > 0):
+            return (not self.__getChildren(relativePath) == None)
+        (head, tail) = os.path.split(relativePath)
+        childrenMap = self.__getChildren(head)
+        return ((not childrenMap == None) and (childrenMap.has_key(tail)))
+
+    def isDir(self, pathToFile):
+        relativePath = self.__getRelativePath(pathToFile)
+        if (relativePath == None):
+            return os.path.isdir(pathToFile)
+        return (not self.__getChildren(relativePath) == None)
+
+    def isFile(self, pathToFile):
+        relativePath = self.__getRelativePath(pathToFile)
+        if (relativePath == None):
+            return os.path.isfile(pathToFile)
+        return ((self.exists(pathToFile)) and (self.__getChildren(relativePath) == None))
+
+    def getSize(self, pathToFile):
+        """
+        Returns the size of the path. -1 is returned if the path does not
+        exist.
+
+        @return: Returns the size of the path.
+        @rtype: Long
+
+        @param pathToFile: The full path to the file.
+        @type pathToFile: String
+        """
+        if (not self.exists(pathToFile)):
+            return -1
+        try:
+            return os.path.getsize(pathToFile)
+        except OSError:
+            return -1
+
+    def listDir(self, pathToDir):
+        """
+        Returns the names in the directory. An empty list is returned if
+        the path is not a directory.
+
+        @return: Returns the names in the directory.
+        @rtype: Array
+
+        @param pathToDir: The full path to the directory.
+        @type pathToDir: String
+        """
+        relativePath = self.__getRelativePath(pathToDir)
+        if (relativePath == None):
+            if (os.path.isdir(pathToDir)):
+                return os.listdir(pathToDir)
+            return []
+        childrenMap = self.__getChildren(relativePath)
+        if (childrenMap == None):
+            return []
+        return childrenMap.keys()
+
+class MappedFile:
+    """
+    This class is a read-only memory-mapped view of a file with an
+    index of the offset of each line. The data can be sliced and
+    searched with the re module without reading the file into a
+    list, and a line is found by its index without reading the lines
+    before it. The index of the lines is built the first time that it
+    is used, except for the lines that are counted from the end of the
+    file which are found by searching backwards.
+
+    Example:
+    mappedFile = report.getMappedFile("var/log/messages")
+    for match in re.finditer("kernel: .*", mappedFile.getData()):
+    print mappedFile.getLines(-10)
+    mappedFile.close()
+    """
+    def __init__(self, pathToFile, data=None):
+        """
+        @param pathToFile: The path to the file that will be mapped.
+        @type pathToFile: String
+        @param data: The data of the file. If not None then the file is
+        not mapped and the data is used instead, such as for a file in a
+        virtual report that is not on disk.
+        @type data: String
+        """
+        self.__pathToFile = pathToFile
+        self.__data = ""
+        # The offset of the start of each line in the file.
+        self.__lineOffsets = None
+        if (not data == None):
+            self.__data = data
+            return
+        fin = open(pathToFile, "rb")
+        try:
+            # An empty file cannot be mapped.
+            if (os.fstat(fin.fileno()).st_size > 0):
+                self.__data = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            fin.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exceptionType, exceptionValue, traceback):
+        self.close()
+
+    def getPathToFile(self):
+        return self.__pathToFile
+
+    def getData(self):
+        """
+        Returns the mapped data of the file, which can be sliced and
+        searched like a String.
+
+        @return: Returns the mapped data of the file.
+        @rtype: mmap
+        """
+        return self.__data
+
+    def getSize(self):
+        return len(self.__data)
+
+    def __getLineOffsets(self):
+        if (self.__lineOffsets == None):
+            self.__lineOffsets = array.array("L")
+            offset = 0
+            while (offset < len(self.__data)):
+                self.__lineOffsets.append(offset)
+                offset = self.__data.find("\n", offset)
+                if (offset < 0):
+                    break
+                offset += 1
+        return self.__lineOffsets
+
+    def __getLastLineOffsets(self, count):
+        """
+        Returns the offsets of the start of the last lines in the file,
+        which are found by searching backwards from the end of the file
+        so that the index of all the lines is not built. Fewer offsets
+        are returned if the file has fewer lines.
+
+        @return: Returns the offsets of the start of the last lines in
+        the order of the lines.
+        @rtype: Array
+
+        @param count: The number of lines from the end of the file.
+        @type count: Int
+        """
+        listOfOffsets = []
+        if (not len(self.__data) > 0):
+            return listOfOffsets
+        searchEnd = len(self.__data)
+        # The newline at the end of the file ends the last line.
+        if (self.__data[searchEnd - 1] == "\n"):
+            searchEnd -= 1
+        while (len(listOfOffsets) < count):
+            offset = self.__data.rfind("\n", 0, searchEnd)
+            listOfOffsets.insert(0, offset + 1)
+            if (offset < 0):
+                break
+            searchEnd = offset
+        return listOfOffsets
+
+    def getLineCount(self):
+        return len(self.__getLineOffsets())
+
+    def getLine(self, index):
+        """
+        Returns the line at the index. A negative index counts from the
+        last line. The newline is included.
+
+        @return: Returns the line at the index.
+        @rtype: String
+
+        @param index: The index of the line.
+        @type index: Int
+        """
+        if ((index < 0) and (self.__lineOffsets == None)):
+            lineOffsets = self.__getLastLineOffsets(-index)
+            if (len(lineOffsets) < -index):
+                raise IndexError("The line index is out of range: %d" %(index))
+            elif (len(lineOffsets) > 1):
+                return self.__data[lineOffsets[0]:lineOffsets[1]]
+            return self.__data[lineOffsets[0]:]
+        lineOffsets = self.__getLineOffsets()
+        if (index < 0):
+            index += len(lineOffsets)
+        if ((index < 0) or (index >= len(lineOffsets))):
+            raise IndexError("The line index is out of range: %d" %(index))
+        if (index + 1 < len(lineOffsets)):
+            return self.__data[lineOffsets[index]:lineOffsets[index + 1]]
+        return self.__data[lineOffsets[index]:]
+
+    def getLines(self, start=0, end=None):
+        """
+        Returns a list of the lines from the start index up to the end
+        index. The indexes are used like the indexes of a slice.
+
+        @return: Returns a list of the lines from the start index up to
+        the end index.
+        @rtype: Array
+
+        @param start: The index of the first line.
+        @type start: Int
+        @param end: The index after the last line. If None then the lines
+        up to the last line are returned.
+        @type end: Int
+        """
+        listOfLines = []
+        if ((start < 0) and ((end == None) or (end < 0)) and (self.__lineOffsets == None)):
+            # The last lines are found from the end of the file, so the
+            # index of all the lines is not built for a tail.
+            lineOffsets = self.__getLastLineOffsets(-start)
+            for index in range(0, len(lineOffsets)):
+                if (index + 1 < len(lineOffsets)):
+                    listOfLines.append(self.__data[lineOffsets[index]:lineOffsets[index + 1]])
+                else:
+                    listOfLines.append(self.__data[lineOffsets[index]:])
+            return listOfLines[:end]
+        for index in range(*slice(start, end).indices(self.getLineCount())):
+            listOfLines.append(self.getLine(index))
+        return listOfLines
+
+    def getLineIndex(self, offset):
+        """
+        Returns the index of the line that contains the offset, such as
+        the offset of a match that was found with the re module.
+
+        @return: Returns the index of the line that contains the offset.
+        @rtype: Int
+
+        @param offset: The offset in the file.
+        @type offset: Int
+        """
+        return bisect.bisect_right(self.__getLineOffsets(), offset) - 1
+
+    def close(self):
+        if (isinstance(self.__data, mmap.mmap)):
+            self.__data.close()
+        self.__data = ""
+        self.__lineOffsets = None
+
 class Report:
     """
     This class is a container for different kind of reports. This is
     the base class that all report types should inherit.
+
+    @cvar TYPE_DETECTION_FILE: This is a path to file that can
+    uniquely indentify the report object. Each report type sets it.
+    @type TYPE_DETECTION_FILE: String
+    @cvar DETECTION_PRIORITY: The priority of the report type when the
+    type detection files of more than one report type match the same
+    file. The report type with the highest priority is used.
+    @type DETECTION_PRIORITY: Int
+    @cvar PROBE_FILES: A list of paths to files that are read from
+    the compressed report before it is extracted, such as the files
+    that contain the hostname.
+    @type PROBE_FILES: Array
+    @cvar REQUIRED_FILES: A list of path patterns for the files that
+    the functions of the report read, such as the files that contain
+    the date or the installed rpms. These files are always extracted
+    when only some of the files in the report are extracted.
+    @type REQUIRED_FILES: Array
+    @cvar CONTENT_CACHE: The cache of the contents of the files that
+    are read from all the reports.
+    @type CONTENT_CACHE: FileContentCache
+    @cvar COMPRESSED_FILE_EXTENSIONS: The extensions of the compressed
+    files that are decompressed when a file is streamed.
+    @type COMPRESSED_FILE_EXTENSIONS: Array
+    @cvar METADATA_VERSION: The version of the format of the metadata
+    file. A metadata file with a different version is not used.
+    @type METADATA_VERSION: Int
+    @cvar METADATA_FUNCTIONS: A list of tuples of the key and the name
+    of the function that returns the value for each item in the
+    metadata. The items are only added for the reports that have the
+    function.
+    @type METADATA_FUNCTIONS: Array
     """
+    TYPE_DETECTION_FILE = ""
+    DETECTION_PRIORITY = 0
+    PROBE_FILES = []
+    REQUIRED_FILES = []
+    CONTENT_CACHE = FileContentCache()
+    COMPRESSED_FILE_EXTENSIONS = [".gz", ".bz2"]
+    METADATA_VERSION = 1
+    METADATA_FUNCTIONS = [("hostname", "getHostname"), ("uname", "getUname"), ("date", "getDate"),
+                          ("uptime", "getUptime"), ("arch", "getArch"), ("distroRelease", "getDistroReleaseData")]
     def __init__(self, name, description, stripDirectoriesDepth=1) :
         """
         @param name: The name of the report.
@@ -67,6 +843,21 @@ class Report:
 
         self.__pathToExtractedReport = ""
         self.__pathToTmpExtractedReport = ""
+        # The path patterns of the files that will be extracted. If
+        # empty then every file is extracted.
+        self.__listOfExtractPathPatterns = []
+        # If True then the report is read from the compressed file with
+        # the extractor instead of being extracted.
+        self.__virtualReport = False
+        self.__extractor = None
+        # The index of the paths in the extracted report that is built
+        # when it is first used.
+        self.__pathIndex = None
+        # The metadata that was loaded from the metadata file.
+        self.__metadataMap = {}
+        # The cache of the results of the parsers that is created when
+        # it is first used.
+        self.__parsedDataCache = None
 
     def __str__(self) :
         """
@@ -122,9 +913,264 @@ class Report:
         @type pathToExtractedReport: String
         """
         self.__pathToExtractedReport = pathToExtractedReport
+        self.__parsedDataCache = None
+        # Any files cached or indexed for a report at this path are from
+        # a previous extraction.
+        self.invalidateFileIndex()
         (head, tail) = os.path.split(self.__pathToExtractedReport)
         self.__pathToTmpExtractedReport = os.path.join(head, ".%s" %(tail))
 
+    def invalidateFileIndex(self):
+        """
+        Removes the index of the paths and the cached contents of the
+        files in the extracted report, so that they are read again the
+        next time that they are used. This should be called if the files
+        in the extracted report were changed, such as when the report
+        was extracted in another process.
+        """
+        self.__pathIndex = None
+        self.__metadataMap = {}
+        Report.CONTENT_CACHE.removeReport(self.__pathToExtractedReport)
+
+    def __getPathIndex(self):
+        if (self.__pathIndex == None):
+            self.__pathIndex = ReportPathIndex(self.__pathToExtractedReport)
+        return self.__pathIndex
+
+    # ##########################################################################
+    # Metadata functions
+    # ##########################################################################
+    def getPathToMetadata(self):
+        """
+        Returns the path to the metadata file of the report, which is a
+        hidden file next to the extracted report so that it is not
+        loaded as a report. Empty string is returned if the report does
+        not have a path.
+
+        @return: Returns the path to the metadata file of the report.
+        @rtype: String
+        """
+        if (not len(self.__pathToExtractedReport) > 0):
+            return ""
+        (head, tail) = os.path.split(self.__pathToExtractedReport)
+        return os.path.join(head, ".%s.metadata" %(tail))
+
+    def getDistroReleaseData(self):
+        """
+        Returns the data in the file that contains the release of the
+        distribution. None is returned if the file is not found.
+
+        @return: Returns the data in the file that contains the release
+        of the distribution.
+        @rtype: Array
+        """
+        if (self.hasMetadata("distroRelease")):
+            return self.getMetadataValue("distroRelease")
+        return self.getDataFromFile("etc/redhat-release")
+
+    def getMetadata(self):
+        """
+        Returns a map of the metadata of the report, such as the type,
+        hostname, uname, date, distribution release, number of files,
+        and the size of the files.
+
+        @return: Returns a map of the metadata of the report.
+        @rtype: Dictionary
+        """
+        metadataMap = {"version":Report.METADATA_VERSION, "type":self.getType(), "name":self.getName()}
+        for (key, functionName) in Report.METADATA_FUNCTIONS:
+            if (hasattr(self, functionName)):
+                metadataMap[key] = getattr(self, functionName)()
+        fileCount = 0
+        byteSize = 0
+        if (self.isVirtual()):
+            archiveIndex = self.__extractor.getArchiveIndex()
+            if (not archiveIndex == None):
+                for memberPath in archiveIndex.getMemberPaths():
+                    if (self.__extractor.isFile(memberPath)):
+                        fileCount += 1
+                        byteSize += max(self.__extractor.getFileSize(memberPath), 0)
+        else:
+            for pathToFile in self.__getPathIndex().getFilePaths():
+                fileCount += 1
+                byteSize += max(self.__getPathIndex().getSize(os.path.join(self.__pathToExtractedReport, pathToFile)), 0)
+        metadataMap["fileCount"] = fileCount
+        metadataMap["byteSize"] = byteSize
+        return metadataMap
+
+    def writeMetadata(self):
+        """
+        Writes the metadata of the report to the metadata file, so that
+        the report can be loaded again without reading the files that
+        the metadata is created from.
+
+        @return: Returns True if the metadata file was written.
+        @rtype: Boolean
+        """
+        pathToMetadata = self.getPathToMetadata()
+        if (not len(pathToMetadata) > 0):
+            return False
+        try:
+            fout = open(pathToMetadata, "w")
+            json.dump(self.getMetadata(), fout, sort_keys=True, indent=1)
+            fout.close()
+        except (IOError, os.error, TypeError, ValueError):
+            message = "There was an error writing the metadata file: %s." %(pathToMetadata)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return False
+        return True
+
+    def readMetadata(pathToExtractedReport):
+        """
+        Returns a map of the metadata in the metadata file of the
+        extracted report. An empty map is returned if there is no valid
+        metadata file.
+
+        @return: Returns a map of the metadata in the metadata file.
+        @rtype: Dictionary
+
+        @param pathToExtractedReport: The path to the extracted report.
+        @type pathToExtractedReport: String
+        """
+        (head, tail) = os.path.split(os.path.normpath(pathToExtractedReport))
+        pathToMetadata = os.path.join(head, ".%s.metadata" %(tail))
+        if (not os.path.isfile(pathToMetadata)):
+            return {}
+        try:
+            fin = open(pathToMetadata, "r")
+            metadataMap = json.load(fin)
+            fin.close()
+        except (IOError, os.error, ValueError):
+            message = "There was an error reading the metadata file: %s." %(pathToMetadata)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return {}
+        if ((not isinstance(metadataMap, dict)) or (not metadataMap.get("version") == Report.METADATA_VERSION)):
+            return {}
+        # The strings are converted from unicode so that they are the
+        # same as the strings that are read from the files.
+        for key in metadataMap.keys():
+            value = metadataMap.pop(key)
+            if (isinstance(value, unicode)):
+                value = value.encode("utf-8")
+            elif (isinstance(value, list)):
+                value = [item.encode("utf-8") for item in value]
+            metadataMap[key.encode("utf-8")] = value
+        return metadataMap
+    readMetadata = staticmethod(readMetadata)
+
+    def loadMetadata(self):
+        """
+        Loads the metadata file of the report so that the functions
+        that return the metadata do not read the files in the
+        report. Returns False if there is no valid metadata file for
+        this type of report.
+
+        @return: Returns True if the metadata file was loaded.
+        @rtype: Boolean
+        """
+        metadataMap = Report.readMetadata(self.__pathToExtractedReport)
+        if (not metadataMap.get("type") == self.getType()):
+            return False
+        self.__metadataMap = metadataMap
+        return True
+
+    def hasMetadata(self, key):
+        return self.__metadataMap.has_key(key)
+
+    def getMetadataValue(self, key):
+        return self.__metadataMap.get(key)
+
+    def isExtracted(self):
+        """
+        Returns True if the file that identifies the report type exists
+        in the extracted report.
+
+        @return: Returns True if the file that identifies the report
+        type exists in the extracted report.
+        @rtype: Boolean
+        """
+        if ((not len(self.getPathToExtractedReport()) > 0) or
+            (not len(self.TYPE_DETECTION_FILE) > 0)):
+            return False
+        elif (self.isVirtual()):
+            return self.__extractor.isFile(self.TYPE_DETECTION_FILE)
+        return os.path.exists(os.path.join(self.getPathToExtractedReport(), self.TYPE_DETECTION_FILE))
+
+    def setExtractPathPatterns(self, listOfPathPatterns):
+        """
+        Sets the path patterns of the files that will be extracted,
+        such as the files that the enabled plugins require. If the
+        list is empty then every file in the report will be extracted.
+
+        @param listOfPathPatterns: A list of path patterns that are
+        relative to the root of the report.
+        @type listOfPathPatterns: Array
+        """
+        self.__listOfExtractPathPatterns = listOfPathPatterns
+
+    def getExtractPathPatterns(self):
+        """
+        Returns the path patterns of the files that will be
+        extracted. The files that the report itself reads are included.
+        An empty list is returned if every file will be extracted,
+        which is always the case for reports that include other reports.
+
+        @return: Returns the path patterns of the files that will be
+        extracted.
+        @rtype: Array
+        """
+        if ((not len(self.__listOfExtractPathPatterns) > 0) or (self.includesOtherReports())):
+            return []
+        listOfPathPatterns = [self.TYPE_DETECTION_FILE] + self.PROBE_FILES + self.REQUIRED_FILES
+        for pathPattern in self.__listOfExtractPathPatterns:
+            if (not pathPattern in listOfPathPatterns):
+                listOfPathPatterns.append(pathPattern)
+        return listOfPathPatterns
+
+    def setVirtual(self, virtualReport):
+        """
+        If True then the report will not be extracted. The files in the
+        report will be read from the compressed file instead. Reports
+        that include other reports are always extracted.
+
+        @param virtualReport: If True then the report will not be
+        extracted.
+        @type virtualReport: Boolean
+        """
+        self.__virtualReport = virtualReport
+
+    def isVirtual(self):
+        """
+        Returns True if the files in the report are read from the
+        compressed file because the report was not extracted.
+
+        @return: Returns True if the files in the report are read from
+        the compressed file.
+        @rtype: Boolean
+        """
+        return (not self.__extractor == None)
+
+    def getExtractor(self):
+        """
+        Returns the extractor that the files of a virtual report are
+        read with. None is returned if the report is not virtual.
+
+        @return: Returns the extractor that the files of a virtual
+        report are read with.
+        @rtype: Extractor
+        """
+        return self.__extractor
+
+    def setExtractor(self, extractor):
+        """
+        Sets the extractor that the files of a virtual report are read
+        with, such as when the compressed file was moved.
+
+        @param extractor: The extractor for the compressed file.
+        @type extractor: Extractor
+        """
+        self.__extractor = extractor
+
     def includesOtherReports(self):
         """
         By default it will return False. If the other report contains
@@ -146,6 +1192,7 @@ class Report:
         Remove the temporary location of files that were copied from
         extracted report.
         """
+        Report.CONTENT_CACHE.removeReport(self.__pathToExtractedReport)
         if os.path.exists(self.__pathToTmpExtractedReport):
             try:
                 shutil.rmtree(self.__pathToTmpExtractedReport)
@@ -164,8 +1211,14 @@ class Report:
         """
         listOfFiles = []
         fullPathToDir = self.getPathForFile(pathToDir)
-        if ((os.path.isdir(fullPathToDir)) and (len(fullPathToDir) > 0)):
-            for filename in os.listdir(fullPathToDir):
+        if (self.isVirtual()):
+            # The listing of a virtual report comes from the index of the
+            # compressed file.
+            if ((len(fullPathToDir) > 0) and (self.__extractor.isDir(pathToDir))):
+                for filename in self.__extractor.listDir(pathToDir):
+                    listOfFiles.append(os.path.join(fullPathToDir, filename))
+        elif ((len(fullPathToDir) > 0) and (self.__getPathIndex().isDir(fullPathToDir))):
+            for filename in self.__getPathIndex().listDir(fullPathToDir):
                 listOfFiles.append(os.path.join(fullPathToDir, filename))
         return listOfFiles
 
@@ -175,6 +1228,9 @@ class Report:
         newline in file is a seperate item in the array. This should
         really just be used on relatively small files.
 
+        The contents are cached in Report.CONTENT_CACHE, so a file that
+        is read by several plugins is only read once.
+
         None is returned if no file is found.
 
         @return: Returns an array of Strings, where each newline in
@@ -185,6 +1241,123 @@ class Report:
         the root report directory.
         @type pathToFile: String
         """
+        if (not len(self.__pathToExtractedReport) > 0):
+            return self.__readDataFromFile(pathToFile)
+        key = (self.__pathToExtractedReport, pathToFile)
+        (isCached, data) = Report.CONTENT_CACHE.get(key)
+        if (isCached):
+            return data
+        data = self.__readDataFromFile(pathToFile)
+        Report.CONTENT_CACHE.add(key, data)
+        return data
+
+    def cacheDataFromFiles(self, listOfPathsToFiles):
+        """
+        This function will read the files that are not cached into
+        Report.CONTENT_CACHE. The files of a virtual report are read
+        together, so that the compressed file is decompressed once for
+        all the files instead of once for each file.
+
+        @return: Returns the number of files that were read.
+        @rtype: Int
+
+        @param listOfPathsToFiles: The paths to the files, which are
+        relative to the root report directory.
+        @type listOfPathsToFiles: Array
+        """
+        if (not len(self.__pathToExtractedReport) > 0):
+            return 0
+        listOfUncachedPaths = []
+        for pathToFile in listOfPathsToFiles:
+            if (not Report.CONTENT_CACHE.has_key((self.__pathToExtractedReport, pathToFile))):
+                listOfUncachedPaths.append(pathToFile)
+        if (not self.isVirtual()):
+            for pathToFile in listOfUncachedPaths:
+                Report.CONTENT_CACHE.add((self.__pathToExtractedReport, pathToFile), self.__readDataFromFile(pathToFile))
+            return len(listOfUncachedPaths)
+        self.__getDataFromVirtualFiles(listOfUncachedPaths)
+        return len(listOfUncachedPaths)
+
+    def getParsedDataCache(self):
+        """
+        Returns the cache of the results of the parsers for this
+        report. None is returned if the report is not extracted to a
+        path.
+
+        @return: Returns the cache of the results of the parsers for
+        this report.
+        @rtype: ParsedDataCache
+        """
+        if ((self.isVirtual()) or (not len(self.__pathToExtractedReport) > 0)):
+            return None
+        if (self.__parsedDataCache == None):
+            self.__parsedDataCache = ParsedDataCache(ParsedDataCache.getPathToCacheDirForReport(self.__pathToExtractedReport))
+        return self.__parsedDataCache
+
+    def getParsedDataFromFile(self, parseFunction, listOfPathsToFiles):
+        """
+        This function will return the result of the parser for the
+        first file in the list that exists. The result is saved in the
+        cache of the parsers, so the file is not read or parsed again
+        the next time that the plugins are ran on the report. The
+        parser is passed None if none of the files exist.
+
+        @return: Returns the result of the parser.
+        @rtype: Object
+
+        @param parseFunction: The function that parses the data of the
+        file.
+        @type parseFunction: Function
+        @param listOfPathsToFiles: The paths to the files in the order
+        that they are tried, which are relative to the root report
+        directory.
+        @type listOfPathsToFiles: Array
+        """
+        parsedDataCache = self.getParsedDataCache()
+        if (parsedDataCache == None):
+            data = None
+            for pathToFile in listOfPathsToFiles:
+                data = self.getDataFromFile(pathToFile)
+                if (not data == None):
+                    break
+            return parseFunction(data)
+        for pathToFile in listOfPathsToFiles:
+            fullPathToFile = self.getPathForFile(pathToFile)
+            if (not len(fullPathToFile) > 0):
+                continue
+            try:
+                fileStat = os.stat(fullPathToFile)
+            except os.error:
+                continue
+            key = ParsedDataCache.getKey(parseFunction, pathToFile, fileStat)
+            (isCached, parsedData) = parsedDataCache.get(key)
+            if (isCached):
+                return parsedData
+            data = self.getDataFromFile(pathToFile)
+            if (data == None):
+                continue
+            parsedData = parseFunction(data)
+            parsedDataCache.add(key, parsedData)
+            return parsedData
+        return parseFunction(None)
+
+    def __readDataFromFile(self, pathToFile) :
+        """
+        This function will read the file from the report. None is
+        returned if no file is found.
+
+        @return: Returns an array of Strings, where each newline in
+        file is an item in the array.
+        @rtype: Array
+
+        @param pathToFile: The path to the file, which is relative to
+        the root report directory.
+        @type pathToFile: String
+        """
+        if (self.isVirtual()):
+            if (not self.__extractor.isFile(pathToFile)):
+                return None
+            return self.__extractor.getDataFromFile(pathToFile)
         pathToFile = self.getPathForFile(pathToFile)
         if (len(pathToFile) > 0) :
             try:
@@ -199,6 +1372,231 @@ class Report:
                 fin.close()
         return None
 
+    # ##########################################################################
+    # Streaming functions for large files
+    # ##########################################################################
+    def __getRotatedLogKey(self, pathToFile):
+        """
+        Returns a key that sorts the rotated logs from the oldest to the
+        newest. Logs rotated with a number(messages.1) are older when the
+        number is larger, logs rotated with a date(messages-20140102)
+        are older when the date is smaller, and the log that is not
+        rotated is the newest.
+
+        @return: Returns a key that sorts the rotated logs from the
+        oldest to the newest.
+        @rtype: Tuple
+
+        @param pathToFile: The path to the file.
+        @type pathToFile: String
+        """
+        filename = pathToFile
+        for extension in Report.COMPRESSED_FILE_EXTENSIONS:
+            if (filename.endswith(extension)):
+                filename = filename[:-len(extension)]
+                break
+        rotationMatch = re.match("^(?P<name>.*?)([.-](?P<rotation>[0-9]+))$", filename)
+        if (rotationMatch == None):
+            return (filename, 1, 0)
+        name = rotationMatch.group("name")
+        rotation = int(rotationMatch.group("rotation"))
+        if (len(rotationMatch.group("rotation")) < 8):
+            # The larger numbers are the older logs.
+            rotation = -rotation
+        return (name, 0, rotation)
+
+    def getFilesMatching(self, pathPattern):
+        """
+        Returns a list of paths to the files in the report that match
+        the path pattern, such as "var/log/messages*". The rotated logs
+        are sorted from the oldest to the newest. For reports that are
+        not extracted, only the last component of the pattern can
+        contain wildcards.
+
+        @return: Returns a list of paths to the files in the report that
+        match the path pattern. The paths are relative to the root of
+        the report.
+        @rtype: Array
+
+        @param pathPattern: The path pattern, which is relative to the
+        root report directory.
+        @type pathPattern: String
+        """
+        pathPattern = pathPattern.strip().strip("/")
+        listOfPaths = []
+        if (self.isVirtual()):
+            (pathToDir, filenamePattern) = os.path.split(pathPattern)
+            for filename in self.__extractor.listDir(pathToDir):
+                pathToFile = os.path.join(pathToDir, filename)
+                if ((fnmatch.fnmatchcase(filename, filenamePattern)) and (self.__extractor.isFile(pathToFile))):
+                    listOfPaths.append(pathToFile)
+        elif (len(self.__pathToExtractedReport) > 0):
+            for pathToFile in glob.glob(os.path.join(self.__pathToExtractedReport, pathPattern)):
+                if (os.path.isfile(pathToFile)):
+                    listOfPaths.append(os.path.relpath(pathToFile, self.__pathToExtractedReport))
+        listOfPaths.sort(key=self.__getRotatedLogKey)
+        return listOfPaths
+
+    def getFilesMatchingPatterns(self, listOfPathPatterns):
+        """
+        Returns a list of paths to all the files in the report that
+        match one of the path patterns, using the same matching as the
+        path patterns of the files that are extracted. The list of paths
+        is found with the index of the report, so the files are not
+        listed again.
+
+        @return: Returns a list of paths to the files in the report that
+        match the path patterns. The paths are relative to the root of
+        the report.
+        @rtype: Array
+
+        @param listOfPathPatterns: A list of path patterns that are
+        relative to the root of the report.
+        @type listOfPathPatterns: Array
+        """
+        listOfPaths = []
+        if (self.isVirtual()):
+            archiveIndex = self.__extractor.getArchiveIndex()
+            if (not archiveIndex == None):
+                for memberPath in archiveIndex.getMemberPaths():
+                    if (self.__extractor.isFile(memberPath)):
+                        listOfPaths.append(memberPath)
+        elif (len(self.__pathToExtractedReport) > 0):
+            listOfPaths = self.__getPathIndex().getFilePaths()
+        listOfMatchingPaths = []
+        for pathToFile in listOfPaths:
+            if (Extractor.isMatchingPath(pathToFile, listOfPathPatterns)):
+                listOfMatchingPaths.append(pathToFile)
+        listOfMatchingPaths.sort()
+        return listOfMatchingPaths
+
+    def __openFile(self, pathToFile):
+        """
+        Returns a file object for reading the file. Files that are
+        compressed with gzip or bzip2 are decompressed as they are
+        read. None is returned if the file cannot be opened.
+
+        @return: Returns a file object for reading the file.
+        @rtype: File
+
+        @param pathToFile: The path to the file, which is relative to
+        the root report directory.
+        @type pathToFile: String
+        """
+        try:
+            if (self.isVirtual()):
+                # The extractor can only return all the data of a file.
+                data = self.__readDataFromFile(pathToFile)
+                if (data == None):
+                    return None
+                data = "".join(data)
+                if (pathToFile.endswith(".gz")):
+                    return gzip.GzipFile(fileobj=StringIO(data), mode="rb")
+                elif (pathToFile.endswith(".bz2")):
+                    return StringIO(bz2.decompress(data))
+                return StringIO(data)
+            pathToFile = self.getPathForFile(pathToFile)
+            if (not os.path.isfile(pathToFile)):
+                return None
+            elif (pathToFile.endswith(".gz")):
+                return gzip.open(pathToFile, "rb")
+            elif (pathToFile.endswith(".bz2")):
+                return bz2.BZ2File(pathToFile, "r")
+            return open(pathToFile, "r")
+        except (IOError, os.error, EOFError):
+            message = "An error occured reading the file: %s." %(pathToFile)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+        return None
+
+    def iterateLines(self, pathPattern):
+        """
+        This function is a generator that yields each line of every
+        file that matches the path pattern, so that large files can be
+        read without reading the whole file into memory. The rotated
+        logs are read from the oldest to the newest and compressed logs
+        are decompressed as they are read.
+
+        Example:
+        for line in report.iterateLines("var/log/messages*"):
+
+        @return: Yields each line of every file that matches the path
+        pattern.
+        @rtype: Generator
+
+        @param pathPattern: The path pattern, which is relative to the
+        root report directory.
+        @type pathPattern: String
+        """
+        for pathToFile in self.getFilesMatching(pathPattern):
+            fin = self.__openFile(pathToFile)
+            if (fin == None):
+                continue
+            try:
+                for line in fin:
+                    yield line
+            finally:
+                fin.close()
+
+    def iterateChunks(self, pathPattern, chunkSize=65536):
+        """
+        This function is a generator that yields the data of every file
+        that matches the path pattern in chunks of bytes. The rotated
+        logs are read from the oldest to the newest and compressed logs
+        are decompressed as they are read.
+
+        @return: Yields the data of every file that matches the path
+        pattern in chunks.
+        @rtype: Generator
+
+        @param pathPattern: The path pattern, which is relative to the
+        root report directory.
+        @type pathPattern: String
+        @param chunkSize: The maximum number of bytes in each chunk.
+        @type chunkSize: Int
+        """
+        for pathToFile in self.getFilesMatching(pathPattern):
+            fin = self.__openFile(pathToFile)
+            if (fin == None):
+                continue
+            try:
+                data = fin.read(chunkSize)
+                while (len(data) > 0):
+                    yield data
+                    data = fin.read(chunkSize)
+            finally:
+                fin.close()
+
+    def getMappedFile(self, pathToFile):
+        """
+        Returns a read-only memory-mapped view of the file with an index
+        of the offset of each line. The file is not decompressed. None is
+        returned if the file does not exist or cannot be mapped. The
+        caller should close the view when it is done.
+
+        @return: Returns a read-only memory-mapped view of the file.
+        @rtype: MappedFile
+
+        @param pathToFile: The path to the file, which is relative to
+        the root report directory.
+        @type pathToFile: String
+        """
+        fullPathToFile = self.getPathForFile(pathToFile)
+        if (self.isVirtual()):
+            # The file of a virtual report is not on disk, so the view is
+            # of the data that is read from the compressed file.
+            data = self.getDataFromFile(pathToFile)
+            if (data == None):
+                return None
+            return MappedFile(fullPathToFile, "".join(data))
+        elif (not os.path.isfile(fullPathToFile)):
+            return None
+        try:
+            return MappedFile(fullPathToFile)
+        except (IOError, os.error, mmap.error, ValueError):
+            message = "An error occured mapping the file: %s." %(fullPathToFile)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+        return None
+
     def __getPathForDir(self, pathToDir):
         """
         This function will return the path to the directory. If
@@ -216,7 +1614,7 @@ class Report:
         """
         if (len(pathToDir) > 0):
             src = os.path.join(self.__pathToExtractedReport, pathToDir).strip()
-            if (os.path.isdir(src)):
+            if (self.__getPathIndex().isDir(src)):
                 return src
         # This function will not make a copy of the directory.
         return ""
@@ -242,7 +1640,10 @@ class Report:
         the root report directory.
         @type pathToDir: String
         """
+        if (self.isVirtual()):
+            return self.__getDataFromVirtualDir(pathToDir)
         fileDataMap = {}
+        pathIndex = self.__getPathIndex()
         fullPathToDir = self.getPathForFile(pathToDir)
         # If a directory is requested with ending astericks then get all the
         # files in its subdirectories and root directory.
@@ -252,33 +1653,33 @@ class Report:
             # of the directory and in its sub directories.
             pathToDirMod = pathToDir.rstrip('/*')
             fullPathToDir = self.__getPathForDir(pathToDirMod)
-            if (os.path.exists(fullPathToDir)):
-                dirList = os.listdir(fullPathToDir)
+            if (len(fullPathToDir) > 0):
+                dirList = pathIndex.listDir(fullPathToDir)
                 for currentFilename in dirList:
                     fullPathToCurrentFilename = os.path.join(fullPathToDir, currentFilename)
-                    if (os.path.isdir(fullPathToCurrentFilename)):
-                        subDirList = os.listdir(fullPathToCurrentFilename)
+                    if (pathIndex.isDir(fullPathToCurrentFilename)):
+                        subDirList = pathIndex.listDir(fullPathToCurrentFilename)
                         for subFilename in subDirList:
                             fullPathToSubFilename = os.path.join(fullPathToCurrentFilename, subFilename)
-                            if (os.path.isfile(fullPathToSubFilename)):
+                            if (pathIndex.isFile(fullPathToSubFilename)):
                                 splitPath = fullPathToSubFilename.split("%s/" %(self.__pathToExtractedReport))
                                 if (len(splitPath) == 2):
                                     currentData = self.getDataFromFile(splitPath[1])
                                     if (not currentData == None):
                                         fileDataMap[splitPath[1]] = currentData
-                    elif (os.path.exists(fullPathToCurrentFilename)):
+                    elif (pathIndex.exists(fullPathToCurrentFilename)):
                         splitPath = fullPathToCurrentFilename.split("%s/" %(self.__pathToExtractedReport))
                         if (len(splitPath) == 2):
                             currentData = self.getDataFromFile(splitPath[1])
                             if (not currentData == None):
                                 fileDataMap[splitPath[1]] = currentData
-        elif (os.path.isdir(fullPathToDir)):
+        elif ((len(fullPathToDir) > 0) and (pathIndex.isDir(fullPathToDir))):
             try:
                 # Add all files in this directory to the list and sort later.
-                dirList = os.listdir(fullPathToDir)
+                dirList = pathIndex.listDir(fullPathToDir)
                 for currentFilename in dirList:
                     # Skip directories
-                    if (not os.path.isdir(os.path.join(fullPathToDir, currentFilename))):
+                    if (not pathIndex.isDir(os.path.join(fullPathToDir, currentFilename))):
                         currentData = self.getDataFromFile("%s/%s" %(pathToDir, currentFilename))
                         if (not currentData == None):
                             fileDataMap[currentFilename] = currentData
@@ -287,6 +1688,80 @@ class Report:
                 logging.getLogger(sx.MAIN_LOGGER_NAME).warn(message)
         return fileDataMap
 
+    def __getDataFromVirtualDir(self, pathToDir):
+        """
+        This function will create a dictionary that contains all the
+        data from every file in a directory of a virtual report. The
+        keys are the same as the keys that getDataFromDir() returns for
+        an extracted report. The files are read together, so that the
+        compressed file is decompressed once for all the files.
+
+        @return: Returns a dictionary that contains the data for all
+        files in that directory.
+        @rtype: Dictionary
+
+        @param pathToDir: The path to the directory, which is relative to
+        the root report directory.
+        @type pathToDir: String
+        """
+        # A map of the path to each file to the key of the file in the
+        # dictionary that is returned.
+        keysMap = {}
+        if (pathToDir.endswith('/*')):
+            pathToDirMod = pathToDir.rstrip('/*')
+            for currentFilename in self.__extractor.listDir(pathToDirMod):
+                pathToCurrentFilename = "%s/%s" %(pathToDirMod, currentFilename)
+                listOfPaths = [pathToCurrentFilename]
+                if (self.__extractor.isDir(pathToCurrentFilename)):
+                    listOfPaths = []
+                    for subFilename in self.__extractor.listDir(pathToCurrentFilename):
+                        listOfPaths.append("%s/%s" %(pathToCurrentFilename, subFilename))
+                for pathToFile in listOfPaths:
+                    keysMap[pathToFile] = pathToFile
+        elif (self.__extractor.isDir(pathToDir)):
+            for currentFilename in self.__extractor.listDir(pathToDir):
+                keysMap["%s/%s" %(pathToDir, currentFilename)] = currentFilename
+        fileDataMap = {}
+        filesMap = self.__getDataFromVirtualFiles(keysMap.keys())
+        for pathToFile in keysMap.keys():
+            currentData = filesMap.get(pathToFile)
+            if (not currentData == None):
+                fileDataMap[keysMap.get(pathToFile)] = currentData
+        return fileDataMap
+
+    def __getDataFromVirtualFiles(self, listOfPathsToFiles):
+        """
+        This function will return a map of each path to the data of the
+        file for the files of a virtual report. The files that are not
+        cached are read from the compressed file in a single pass and
+        added to Report.CONTENT_CACHE. The files that do not exist are
+        not in the map.
+
+        @return: Returns a map of each path to an array of Strings,
+        where each newline in the file is an item in the array.
+        @rtype: Dictionary
+
+        @param listOfPathsToFiles: The paths to the files, which are
+        relative to the root report directory.
+        @type listOfPathsToFiles: Array
+        """
+        filesMap = {}
+        listOfUncachedPaths = []
+        for pathToFile in listOfPathsToFiles:
+            (isCached, data) = Report.CONTENT_CACHE.get((self.__pathToExtractedReport, pathToFile))
+            if (not isCached):
+                listOfUncachedPaths.append(pathToFile)
+            elif (not data == None):
+                filesMap[pathToFile] = data
+        if (len(listOfUncachedPaths) > 0):
+            extractedFilesMap = self.__extractor.getDataFromFiles(listOfUncachedPaths)
+            for pathToFile in listOfUncachedPaths:
+                data = extractedFilesMap.get(pathToFile)
+                Report.CONTENT_CACHE.add((self.__pathToExtractedReport, pathToFile), data)
+                if (not data == None):
+                    filesMap[pathToFile] = data
+        return filesMap
+
     def getFileSize(self, pathToFile):
         """
         Returns the actual filesize of a file in bytes. -1 is returned
@@ -302,11 +1777,11 @@ class Report:
         """
         # -1 means file does not exist.
         fileSize = -1
-        if (len(pathToFile) > 0):
+        if (self.isVirtual()):
+            return self.__extractor.getFileSize(pathToFile)
+        elif (len(pathToFile) > 0):
             src = os.path.join(self.__pathToExtractedReport, pathToFile)
-            if (os.path.exists(src)):
-                fileSize = os.path.getsize(src)
-                return fileSize
+            return self.__getPathIndex().getSize(src)
         return fileSize
 
     def getPathForFile(self, pathToFile):
@@ -314,6 +1789,10 @@ class Report:
         This function will return the path to the temporary file. If
         file does not exist then empty string is returned.
 
+        The path for a file in a virtual report is the path the file
+        would have if the report was extracted, which does not exist.
+        The data of the file is read with getDataFromFile().
+
         @return: Returns the path to the temporary file. Empty string
         is returned if no file is found.
 
@@ -321,13 +1800,52 @@ class Report:
         the root report directory.
         @type pathToFile: String
         """
-        if (len(pathToFile) > 0):
+        if (self.isVirtual()):
+            return self.__getPathForVirtualFile(pathToFile)
+        elif (len(pathToFile) > 0):
             src = os.path.join(self.__pathToExtractedReport, pathToFile).strip()
             # Cannot check if file cause we have symlinks in report
-            if (os.path.exists(src)):
+            if (self.__getPathIndex().exists(src)):
                     return src
         return ""
 
+    def __getPathForVirtualFile(self, pathToFile):
+        """
+        This function will return the path that a file(or directory)
+        of a virtual report would have if the report was extracted. The
+        index of the compressed file is used to check if the file
+        exists, so nothing is written to disk. If file does not exist
+        then empty string is returned.
+
+        @return: Returns the path that the file would have if the
+        report was extracted. Empty string is returned if no file is
+        found.
+
+        @param pathToFile: The path to the file, which is relative to
+        the root report directory.
+        @type pathToFile: String
+        """
+        pathToFile = pathToFile.strip().strip("/")
+        if ((len(pathToFile) > 0) and
+            ((self.__extractor.isFile(pathToFile)) or (self.__extractor.isDir(pathToFile)))):
+            return os.path.join(self.__pathToExtractedReport, pathToFile)
+        return ""
+
+    def __isExtractDirUsed(self, extractDir):
+        """
+        Returns True if the directory or the temporary directory for
+        that directory exists.
+
+        @return: Returns True if the directory or the temporary
+        directory for that directory exists.
+        @rtype: Boolean
+
+        @param extractDir: The full path to directory for extraction.
+        @type extractDir: String
+        """
+        (head, tail) = os.path.split(extractDir)
+        return ((os.path.exists(extractDir)) or (os.path.exists(os.path.join(head, ".%s" %(tail)))))
+
     def extract(self, extractor, extractDir):
         """
         This function will extract the report to the extract
@@ -357,17 +1875,31 @@ class Report:
         logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
         if (not len(extractDir) > 0):
             return False
-        # Check for duplicate extraction point and rename if it exists.
-        if os.path.exists(extractDir) :
+        # Check for duplicate extraction point and rename if it exists. The
+        # temporary directory is checked as well since a virtual report
+        # only creates the temporary directory.
+        if (self.__isExtractDirUsed(extractDir)) :
             for i in range(1, 100) :
                 (head, tail) = os.path.split(extractDir)
                 duplicatePath = os.path.join(head, "%s-duplicate_%s" %(tail, str(i)))
-                if (not os.path.exists(duplicatePath)) :
+                if (not self.__isExtractDirUsed(duplicatePath)) :
                     # Directory does not exist so we can extract to this path
                     extractDir = duplicatePath
                     break;
         # Set path to extraction point and temporary directory
         self.setPathToExtractedReport(extractDir)
+        if ((self.__virtualReport) and (not self.includesOtherReports())):
+            message = "The %s will be read from the compressed file and will not be extracted: %s" %(self.getName(), extractor.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            try:
+                if not os.access(self.__pathToTmpExtractedReport, os.F_OK):
+                    os.makedirs(self.__pathToTmpExtractedReport)
+            except (IOError, os.error):
+                message =  "IO error occured on creating the directory: %s." %(self.__pathToTmpExtractedReport)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                return False
+            self.__extractor = extractor
+            return self.isExtracted()
         # Do the extraction of the file
         try:
             if not os.access(self.__pathToExtractedReport, os.F_OK):
@@ -376,4 +1908,8 @@ class Report:
             message =  "IO error occured on creating the directory: %s." %(self.__pathToExtractedReport)
             logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
             return False
-        return extractor.extract(self.__pathToExtractedReport, self.__stripDirectoriesDepth)
+        listOfPathPatterns = self.getExtractPathPatterns()
+        if (len(listOfPathPatterns) > 0):
+            message = "Only the files that match %d path patterns will be extracted from: %s" %(len(listOfPathPatterns), extractor.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return extractor.extract(self.__pathToExtractedReport, self.__stripDirectoriesDepth, listOfPathPatterns)
@@ -23,9 +23,13 @@ class Rhevlogcollector(Report) :
     @type TYPE_DETECTION_FILE: String
     @cvar REPORT_NAME: The name of the report.
     @type REPORT_NAME: String
+    @cvar PROBE_FILES: A list of paths to files that are read from
+    the compressed report before it is extracted.
+    @type PROBE_FILES: Array
     """
     TYPE_DETECTION_FILE = "RhevManager.exe.config"
     REPORT_NAME = "rhev log collector"
+    PROBE_FILES = [TYPE_DETECTION_FILE]
     def __init__(self) :
         sx.reports.Report.__init__(self,
                                    Rhevlogcollector.REPORT_NAME,
@@ -46,6 +50,8 @@ class Rhevlogcollector(Report) :
         return True
 
     def getHostname(self):
+        if ((not len(self.__hostname) > 0) and (self.hasMetadata("hostname"))):
+            self.__hostname = self.getMetadataValue("hostname")
         return self.__hostname
 
     def extract(self, extractor, extractDir):
@@ -83,7 +89,5 @@ class Rhevlogcollector(Report) :
                     break
         # Now call the parent method
         sx.reports.Report.extract(self, extractor, os.path.join(extractDir, "%s-rhevlogcollector" % (self.__hostname)))
-        if (os.path.exists(os.path.join(self.getPathToExtractedReport(), Rhevlogcollector.TYPE_DETECTION_FILE))):
-            return True
-        return False
+        return self.isExtracted()
 
@@ -82,6 +82,4 @@ class Satellitedebug(Report) :
                         break
         # Now call the parent method
         sx.reports.Report.extract(self, extractor, os.path.join(extractDir, "%s-rhnsatDebug" % (self.__hostname)))
-        if (os.path.exists(os.path.join(self.getPathToExtractedReport(), Satellitedebug.TYPE_DETECTION_FILE))):
-            return True
-        return False
+        return self.isExtracted()
@@ -28,9 +28,17 @@ class Sosreport(sx.reports.Report) :
     @type TYPE_DETECTION_FILE: String
     @cvar REPORT_NAME: The name of the report.
     @type REPORT_NAME: String
+    @cvar PROBE_FILES: A list of paths to files that are read from
+    the compressed report before it is extracted.
+    @type PROBE_FILES: Array
+    @cvar REQUIRED_FILES: A list of path patterns for the files that
+    the functions of the report read.
+    @type REQUIRED_FILES: Array
     """
     TYPE_DETECTION_FILE = "sos_logs/sos.log"
     REPORT_NAME = "sosreport"
+    PROBE_FILES = ["sos_commands/kernel/uname_-a", "sos_commands/general/hostname"]
+    REQUIRED_FILES = ["sos_commands/general/*", "sos_commands/rpm/*", "date", "uptime", "installed-rpms"]
     def __init__(self) :
         sx.reports.Report.__init__(self,
                                    Sosreport.REPORT_NAME,
@@ -44,6 +52,8 @@ class Sosreport(sx.reports.Report) :
         @return: Returns a string of the "uname -a" data.
         @rtype String
         """
+        if (self.hasMetadata("uname")):
+            return self.getMetadataValue("uname")
         unameAData = self.getDataFromFile("sos_commands/kernel/uname_-a")
         if (not unameAData == None) :
             if (len(unameAData) > 0):
@@ -59,6 +69,8 @@ class Sosreport(sx.reports.Report) :
         the report was generated.
         @rtype: String
         """
+        if (self.hasMetadata("date")):
+            return self.getMetadataValue("date")
         dateData = self.getDataFromFile("sos_commands/general/date")
         if (dateData == None):
             dateData = self.getDataFromFile("date")
@@ -76,6 +88,8 @@ class Sosreport(sx.reports.Report) :
         @return: Returns a string of the "uptime" data.
         @rtype String
         """
+        if (self.hasMetadata("uptime")):
+            return self.getMetadataValue("uptime")
         uptime = self.getDataFromFile("sos_commands/general/uptime")
         if (uptime == None) :
             uptime = self.getDataFromFile("uptime")
@@ -92,6 +106,8 @@ class Sosreport(sx.reports.Report) :
         @return: Returns the arch for the report.
         @rtype String
         """
+        if (self.hasMetadata("arch")):
+            return self.getMetadataValue("arch")
         unameAData = self.getUname()
         regexArch = "(?P<arch>noarch|i386|i586|i686|ia64|ppc|s390|s390x|x86_64)"
         remArch = re.compile(regexArch, re.IGNORECASE)
@@ -109,6 +125,8 @@ class Sosreport(sx.reports.Report) :
         -a" data.
         @rtype String
         """
+        if ((not len(self.__hostname) > 0) and (self.hasMetadata("hostname"))):
+            self.__hostname = self.getMetadataValue("hostname")
         if (not len(self.__hostname) > 0):
             # If hostname is not set or need from previous extracted report
             unameAData = self.getUname()
@@ -184,10 +202,7 @@ class Sosreport(sx.reports.Report) :
                 self.__hostname = "unknown_hostname"
         # Now call the parent function to finish the extraction
         sx.reports.Report.extract(self, extractor, os.path.join(extractDir, self.__hostname))
-        if (os.path.exists(os.path.join(self.getPathToExtractedReport(),
-                                        Sosreport.TYPE_DETECTION_FILE))):
-            return True
-        return False
+        return self.isExtracted()
 
 
 
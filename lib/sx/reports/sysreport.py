@@ -27,9 +27,17 @@ class Sysreport(sx.reports.Report) :
     @type TYPE_DETECTION_FILE: String
     @cvar REPORT_NAME: The name of the report.
     @type REPORT_NAME: String
+    @cvar PROBE_FILES: A list of paths to files that are read from
+    the compressed report before it is extracted.
+    @type PROBE_FILES: Array
+    @cvar REQUIRED_FILES: A list of path patterns for the files that
+    the functions of the report read.
+    @type REQUIRED_FILES: Array
     """
     TYPE_DETECTION_FILE = "sysreport.log"
     REPORT_NAME = "sysreport"
+    PROBE_FILES = ["uname"]
+    REQUIRED_FILES = ["date", "uptime", "installed-rpms"]
     def __init__(self) :
         sx.reports.Report.__init__(self,
                                    Sysreport.REPORT_NAME,
@@ -49,6 +57,8 @@ class Sysreport(sx.reports.Report) :
         the report was generated.
         @rtype: String
         """
+        if (self.hasMetadata("date")):
+            return self.getMetadataValue("date")
         dateData = self.getDataFromFile("date")
         # Return empty string if data object was not found.
         date = ""
@@ -64,6 +74,8 @@ class Sysreport(sx.reports.Report) :
         @return: Returns a string of the "uname -a" data.
         @rtype String
         """
+        if (self.hasMetadata("uname")):
+            return self.getMetadataValue("uname")
         unameData = self.getDataFromFile("uname")
         if (not unameData == None) :
             if (len(unameData) > 1):
@@ -77,6 +89,8 @@ class Sysreport(sx.reports.Report) :
         @return: Returns a string of the "uptime" data.
         @rtype String
         """
+        if (self.hasMetadata("uptime")):
+            return self.getMetadataValue("uptime")
         uptime = self.getDataFromFile("uptime")
         if (uptime == None) :
             return ""
@@ -90,6 +104,8 @@ class Sysreport(sx.reports.Report) :
         @return: Returns the arch for the report.
         @rtype String
         """
+        if (self.hasMetadata("arch")):
+            return self.getMetadataValue("arch")
         unameAData = self.getUname()
         regexArch = "(?P<arch>noarch|i386|i586|i686|ia64|ppc|s390|s390x|x86_64)"
         remArch = re.compile(regexArch, re.IGNORECASE)
@@ -107,6 +123,8 @@ class Sysreport(sx.reports.Report) :
         -a" data.
         @rtype String
         """
+        if ((not len(self.__hostname) > 0) and (self.hasMetadata("hostname"))):
+            self.__hostname = self.getMetadataValue("hostname")
         if (not len(self.__hostname) > 0):
             # If hostname is not set or need from previous extracted report
             unameAData = self.getUname()
@@ -158,8 +176,5 @@ class Sysreport(sx.reports.Report) :
             self.__hostname = "unknown_hostname"
         # Now call the parent function to finish the extraction
         sx.reports.Report.extract(self, extractor, os.path.join(extractDir, self.__hostname))
-        if (os.path.exists(os.path.join(self.getPathToExtractedReport(),
-                                        Sysreport.TYPE_DETECTION_FILE))):
-            return True
-        return False
+        return self.isExtracted()
 
@@ -0,0 +1,356 @@
+#!/usr/bin/env python
+"""
+This file contains the SearchIndex class that is an inverted index of
+the text files in the extracted reports in an archive.
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  2.17
+@copyright :  GPLv2
+"""
+import os
+import os.path
+import re
+import stat
+import logging
+import sqlite3
+
+import sx
+from sx.logwriter import LogWriter
+
+class SearchIndex:
+    """
+    This class is an inverted index of the text files in the extracted
+    reports in an archive. The index is a sqlite database with a row
+    for each file, a row for each block of whole lines in the file and
+    the postings of the trigrams of the words in each block. A search
+    finds the blocks that have every trigram of the words in the query
+    and then only those blocks are read to find the lines that contain
+    the query, so the whole archive is not read.
+
+    The files that are not indexed because they are empty or are not
+    text files are recorded without any blocks, so they are skipped
+    when the report is indexed again if the size and modification time
+    of the file did not change.
+
+    The words are indexed in lowercase, so the search is not case
+    sensitive.
+
+    @cvar SCHEMA_VERSION: The version of the tables in the index.
+    @type SCHEMA_VERSION: Int
+    @cvar MAXIMUM_FILE_SIZE: The maximum size of a file that will be
+    indexed.
+    @type MAXIMUM_FILE_SIZE: Int
+    @cvar READ_BLOCK_SIZE: The number of bytes that are read from a
+    file at a time when it is indexed. Each block of the index is the
+    whole lines in a read, so a block is only larger if a line is
+    larger.
+    @type READ_BLOCK_SIZE: Int
+    @cvar MAXIMUM_LINES_PER_FILE: The maximum number of lines that are
+    returned for each file that matches a search.
+    @type MAXIMUM_LINES_PER_FILE: Int
+    @cvar MAXIMUM_QUERY_TRIGRAMS: The maximum number of trigrams of a
+    query that are used to find the blocks. SQLite limits the number of
+    values in a query.
+    @type MAXIMUM_QUERY_TRIGRAMS: Int
+    @cvar WORD_REGEX: The regular expression for a word.
+    @type WORD_REGEX: SRE_Pattern
+    """
+    SCHEMA_VERSION = 2
+    MAXIMUM_FILE_SIZE = 268435456
+    READ_BLOCK_SIZE = 1048576
+    MAXIMUM_LINES_PER_FILE = 10
+    MAXIMUM_QUERY_TRIGRAMS = 500
+    WORD_REGEX = re.compile(r"\w+")
+
+    def __init__(self, pathToIndex):
+        """
+        @param pathToIndex: The path to the file of the index.
+        @type pathToIndex: String
+        """
+        self.__pathToIndex = pathToIndex
+        self.__connection = None
+
+    def getPathToIndex(self):
+        return self.__pathToIndex
+
+    def __connect(self):
+        """
+        Returns the connection to the index and creates the tables if
+        the index is new. None is returned if the index could not be
+        opened.
+
+        @return: Returns the connection to the index.
+        @rtype: sqlite3.Connection
+        """
+        if (not self.__connection == None):
+            return self.__connection
+        try:
+            connection = sqlite3.connect(self.__pathToIndex, timeout=60)
+            connection.text_factory = str
+            schemaVersion = connection.execute("PRAGMA user_version").fetchone()[0]
+            if (schemaVersion == 1):
+                # The first version only had the postings of each file,
+                # so the index is created again.
+                message = "The search index will be created again since it is an older version(%d): %s" %(schemaVersion, self.__pathToIndex)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+                connection.execute("DROP TABLE IF EXISTS postings")
+                connection.execute("DROP TABLE IF EXISTS files")
+                schemaVersion = 0
+            if (schemaVersion == 0):
+                connection.execute("CREATE TABLE IF NOT EXISTS files (id INTEGER PRIMARY KEY, uid TEXT, timestamp TEXT, " +
+                                   "report TEXT, path TEXT, pathToFile TEXT UNIQUE, pathToReport TEXT, size INTEGER, mtime REAL)")
+                connection.execute("CREATE INDEX IF NOT EXISTS filesReportIndex ON files (pathToReport)")
+                connection.execute("CREATE TABLE IF NOT EXISTS blocks (id INTEGER PRIMARY KEY, fileId INTEGER, " +
+                                   "offset INTEGER, length INTEGER, lineNumber INTEGER)")
+                connection.execute("CREATE INDEX IF NOT EXISTS blocksFileIndex ON blocks (fileId)")
+                connection.execute("CREATE TABLE IF NOT EXISTS postings (trigram TEXT, blockId INTEGER, PRIMARY KEY (trigram, blockId))")
+                connection.execute("CREATE INDEX IF NOT EXISTS postingsBlockIndex ON postings (blockId)")
+                connection.execute("PRAGMA user_version = %d" %(SearchIndex.SCHEMA_VERSION))
+                connection.commit()
+            elif (not schemaVersion == SearchIndex.SCHEMA_VERSION):
+                message = "The search index has an unsupported version(%d) and will not be used: %s" %(schemaVersion, self.__pathToIndex)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                connection.close()
+                return None
+        except sqlite3.Error, e:
+            message = "There was an error opening the search index: %s(%s)" %(self.__pathToIndex, str(e))
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return None
+        self.__connection = connection
+        return self.__connection
+
+    def close(self):
+        if (not self.__connection == None):
+            self.__connection.close()
+            self.__connection = None
+
+    def getTrigrams(data):
+        """
+        Returns the set of trigrams of the words in the data. The words
+        are converted to lowercase and words shorter than 3 characters
+        do not have any trigrams.
+
+        @return: Returns the set of trigrams of the words in the data.
+        @rtype: Set
+
+        @param data: The data that will be split into words.
+        @type data: String
+        """
+        trigrams = set()
+        for word in set(SearchIndex.WORD_REGEX.findall(data.lower())):
+            for i in range(len(word) - 2):
+                trigrams.add(word[i:i + 3])
+        return trigrams
+    getTrigrams = staticmethod(getTrigrams)
+
+    def __getFileBlocks(self, pathToFile):
+        """
+        Returns a list of the blocks of whole lines in the file. Each
+        item is a tuple of the offset of the block in the file, the
+        length of the block, the line number of the first line in the
+        block and the set of trigrams of the words in the block. An
+        empty list is returned if the file is empty or is not a text
+        file and None is returned if the file could not be read.
+
+        @return: Returns a list of the blocks of whole lines in the
+        file.
+        @rtype: Array
+
+        @param pathToFile: The path to the file.
+        @type pathToFile: String
+        """
+        listOfBlocks = []
+        try:
+            fin = open(pathToFile, "rb")
+            try:
+                # The end of a read that is not a whole line is
+                # prepended to the next read.
+                remainder = ""
+                offset = 0
+                lineNumber = 1
+                isFirstBlock = True
+                while (True):
+                    data = fin.read(SearchIndex.READ_BLOCK_SIZE)
+                    if (isFirstBlock):
+                        if (data.find("\0") >= 0):
+                            return []
+                        isFirstBlock = False
+                    if (not data):
+                        break
+                    block = remainder + data
+                    index = block.rfind("\n") + 1
+                    if (index == 0):
+                        remainder = block
+                        continue
+                    listOfBlocks.append((offset, index, lineNumber, SearchIndex.getTrigrams(block[:index])))
+                    offset += index
+                    lineNumber += block.count("\n", 0, index)
+                    remainder = block[index:]
+                if (len(remainder) > 0):
+                    listOfBlocks.append((offset, len(remainder), lineNumber, SearchIndex.getTrigrams(remainder)))
+            finally:
+                fin.close()
+        except (IOError, os.error):
+            message = "There was an error reading the file for the search index: %s" %(pathToFile)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return None
+        return listOfBlocks
+
+    def __removeFile(self, connection, fileId):
+        """
+        Removes the file and the blocks and postings of the file from the
+        index.
+
+        @param connection: The connection to the index.
+        @type connection: sqlite3.Connection
+        @param fileId: The id of the file in the index.
+        @type fileId: Int
+        """
+        connection.execute("DELETE FROM postings WHERE blockId IN (SELECT id FROM blocks WHERE fileId = ?)", (fileId,))
+        connection.execute("DELETE FROM blocks WHERE fileId = ?", (fileId,))
+        connection.execute("DELETE FROM files WHERE id = ?", (fileId,))
+
+    def addReport(self, uid, timestamp, pathToExtractedReport):
+        """
+        Adds the text files in the extracted report to the index. The
+        files that have the same size and modification time as when they
+        were indexed or skipped before are skipped and the files that no
+        longer exist are removed from the index.
+
+        @return: Returns a tuple of the number of files that were
+        indexed and the number of files that were removed from the
+        index.
+        @rtype: Tuple
+
+        @param uid: The uid of the report.
+        @type uid: String
+        @param timestamp: The timestamp of the directory that contains
+        the report.
+        @type timestamp: String
+        @param pathToExtractedReport: The path to the extracted report.
+        @type pathToExtractedReport: String
+        """
+        connection = self.__connect()
+        if ((connection == None) or (not os.path.isdir(pathToExtractedReport))):
+            return (0, 0)
+        pathToExtractedReport = os.path.abspath(pathToExtractedReport)
+        reportName = os.path.basename(pathToExtractedReport)
+        filesIndexed = 0
+        filesRemoved = 0
+        try:
+            indexedFilesMap = {}
+            for (fileId, pathToFile, size, mtime) in connection.execute("SELECT id, pathToFile, size, mtime FROM files WHERE pathToReport = ?",
+                                                                        (pathToExtractedReport,)):
+                indexedFilesMap[pathToFile] = (fileId, size, mtime)
+            for (dirpath, dirnames, filenames) in os.walk(pathToExtractedReport):
+                for filename in filenames:
+                    pathToFile = os.path.join(dirpath, filename)
+                    try:
+                        fileStat = os.lstat(pathToFile)
+                    except os.error:
+                        continue
+                    if ((not stat.S_ISREG(fileStat.st_mode)) or (fileStat.st_size > SearchIndex.MAXIMUM_FILE_SIZE)):
+                        continue
+                    if (indexedFilesMap.has_key(pathToFile)):
+                        (fileId, size, mtime) = indexedFilesMap.pop(pathToFile)
+                        if ((size == fileStat.st_size) and (mtime == fileStat.st_mtime)):
+                            continue
+                        self.__removeFile(connection, fileId)
+                    listOfBlocks = self.__getFileBlocks(pathToFile)
+                    if (listOfBlocks == None):
+                        continue
+                    # The files that are empty or are not text files are
+                    # added without any blocks so that they are not read
+                    # again if they do not change.
+                    cursor = connection.execute("INSERT INTO files (uid, timestamp, report, path, pathToFile, pathToReport, size, mtime) " +
+                                                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                                (uid, timestamp, reportName, os.path.relpath(pathToFile, pathToExtractedReport),
+                                                 pathToFile, pathToExtractedReport, fileStat.st_size, fileStat.st_mtime))
+                    fileId = cursor.lastrowid
+                    blocksIndexed = 0
+                    for (offset, length, lineNumber, trigrams) in listOfBlocks:
+                        if (not len(trigrams) > 0):
+                            continue
+                        cursor = connection.execute("INSERT INTO blocks (fileId, offset, length, lineNumber) VALUES (?, ?, ?, ?)",
+                                                    (fileId, offset, length, lineNumber))
+                        blockId = cursor.lastrowid
+                        connection.executemany("INSERT INTO postings (trigram, blockId) VALUES (?, ?)",
+                                               ((trigram, blockId) for trigram in trigrams))
+                        blocksIndexed += 1
+                    if (blocksIndexed > 0):
+                        filesIndexed += 1
+            # Remove the files that were indexed before but no longer exist.
+            for (fileId, size, mtime) in indexedFilesMap.values():
+                self.__removeFile(connection, fileId)
+                filesRemoved += 1
+            connection.commit()
+        except sqlite3.Error, e:
+            connection.rollback()
+            message = "There was an error adding the report to the search index: %s(%s)" %(pathToExtractedReport, str(e))
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return (0, 0)
+        return (filesIndexed, filesRemoved)
+
+    def search(self, query):
+        """
+        Returns a list of the files that contain the query. Each item is
+        a tuple of the uid, the timestamp, the name of the report, the
+        path to the file relative to the report, the path to the file,
+        and a list of tuples of the line number and the line for the
+        first lines that contain the query.
+
+        @return: Returns a list of the files that contain the query.
+        @rtype: Array
+
+        @param query: The string that will be searched for.
+        @type query: String
+        """
+        connection = self.__connect()
+        trigrams = list(SearchIndex.getTrigrams(query))[:SearchIndex.MAXIMUM_QUERY_TRIGRAMS]
+        if ((connection == None) or (not len(trigrams) > 0)):
+            return []
+        results = []
+        try:
+            cursor = connection.execute("SELECT files.uid, files.timestamp, files.report, files.path, files.pathToFile, " +
+                                        "blocks.offset, blocks.length, blocks.lineNumber FROM blocks " +
+                                        "JOIN files ON files.id = blocks.fileId WHERE blocks.id IN " +
+                                        "(SELECT blockId FROM postings WHERE trigram IN (%s) " %(", ".join(["?"] * len(trigrams))) +
+                                        "GROUP BY blockId HAVING COUNT(*) = ?) " +
+                                        "ORDER BY files.uid, files.timestamp, files.report, files.path, blocks.offset",
+                                        trigrams + [len(trigrams)])
+            listOfCandidates = cursor.fetchall()
+        except sqlite3.Error, e:
+            message = "There was an error searching the search index: %s(%s)" %(self.__pathToIndex, str(e))
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return []
+        # The candidate blocks have all the trigrams of the query, but the
+        # trigrams might not be next to each other so only the blocks are
+        # read to find the lines with the query.
+        query = query.lower()
+        # A map of the path to the file to the item in the results for the
+        # file.
+        resultsMap = {}
+        for (uid, timestamp, report, path, pathToFile, offset, length, lineNumber) in listOfCandidates:
+            if (not resultsMap.has_key(pathToFile)):
+                resultsMap[pathToFile] = (uid, timestamp, report, path, pathToFile, [])
+                results.append(resultsMap[pathToFile])
+            listOfLines = resultsMap[pathToFile][5]
+            if (len(listOfLines) >= SearchIndex.MAXIMUM_LINES_PER_FILE):
+                continue
+            try:
+                fin = open(pathToFile, "rb")
+                try:
+                    fin.seek(offset)
+                    block = fin.read(length)
+                finally:
+                    fin.close()
+            except (IOError, os.error):
+                continue
+            for line in block.split("\n"):
+                if (line.lower().find(query) >= 0):
+                    listOfLines.append((lineNumber, line))
+                    if (len(listOfLines) >= SearchIndex.MAXIMUM_LINES_PER_FILE):
+                        break
+                lineNumber += 1
+        return [result for result in results if (len(result[5]) > 0)]
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+"""
+This file contains the StartupProfiler class that records how long the
+modules take to import and how long each phase of the startup of
+sxconsole takes.
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  2.17
+@copyright :  GPLv2
+"""
+import sys
+import time
+import json
+import __builtin__
+
+class StartupProfiler:
+    """
+    This class records the time that each module takes to be imported
+    and the time of each phase of the startup. The imports are recorded
+    by replacing the builtin import function, so the import hook has to
+    be installed before the modules are imported.
+
+    The cumulative time of a module includes the time to import the
+    modules that it imports and the self time does not. Only the first
+    import of a module is recorded since the later imports are found in
+    sys.modules.
+
+    @cvar MAXIMUM_TABLE_ROWS: The maximum number of modules that are
+    written to the table of imports.
+    @type MAXIMUM_TABLE_ROWS: Int
+    """
+    MAXIMUM_TABLE_ROWS = 30
+
+    def __init__(self, startTime=None):
+        """
+        @param startTime: The time the startup began. If None then the
+        current time is used.
+        @type startTime: Float
+        """
+        self.__startTime = startTime
+        if (self.__startTime == None):
+            self.__startTime = time.time()
+        # A list of tuples of the name of the phase and the seconds it
+        # took.
+        self.__listOfPhases = []
+        self.__currentPhase = None
+        # A map of the module name to a list of the cumulative seconds
+        # and the self seconds of the import.
+        self.__importsMap = {}
+        # The seconds that the imports of the child modules took for
+        # each import that is in progress.
+        self.__importStack = []
+        self.__originalImport = None
+
+    def installImportHook(self):
+        """
+        Replaces the builtin import function so that the imports are
+        recorded.
+        """
+        if (self.__originalImport == None):
+            self.__originalImport = __builtin__.__import__
+            __builtin__.__import__ = self.__import
+
+    def removeImportHook(self):
+        """
+        Restores the builtin import function.
+        """
+        if (not self.__originalImport == None):
+            __builtin__.__import__ = self.__originalImport
+            self.__originalImport = None
+
+    def __getModuleName(self, name, globals, level):
+        """
+        Returns the name of the module that the import statement
+        imported. Implicit relative imports are resolved to the module in
+        the package of the importing module if it was imported.
+
+        @return: Returns the name of the module that was imported.
+        @rtype: String
+
+        @param name: The name of the module in the import statement.
+        @type name: String
+        @param globals: The globals of the importing module.
+        @type globals: Dictionary
+        @param level: The level of the import.
+        @type level: Int
+        """
+        if ((level == 0) or (globals == None) or (not globals.has_key("__name__"))):
+            return name
+        packageName = globals.get("__name__")
+        if (not globals.has_key("__path__")):
+            packageName = packageName.rpartition(".")[0]
+        if (len(packageName) > 0):
+            relativeName = "%s.%s" %(packageName, name)
+            if (not sys.modules.get(relativeName) == None):
+                return relativeName
+        return name
+
+    def __import(self, name, globals=None, locals=None, fromlist=None, level=-1):
+        """
+        The import function that records the time of the imports of the
+        modules that are not already imported.
+        """
+        if ((level <= 0) and (sys.modules.has_key(name)) and (not sys.modules.get(name) == None)):
+            return self.__originalImport(name, globals, locals, fromlist, level)
+        self.__importStack.append(0.0)
+        startTime = time.time()
+        try:
+            return self.__originalImport(name, globals, locals, fromlist, level)
+        finally:
+            seconds = time.time() - startTime
+            childSeconds = self.__importStack.pop()
+            if (len(self.__importStack) > 0):
+                self.__importStack[-1] += seconds
+            moduleName = self.__getModuleName(name, globals, level)
+            if (not self.__importsMap.has_key(moduleName)):
+                self.__importsMap[moduleName] = [seconds, seconds - childSeconds]
+
+    def startPhase(self, name):
+        """
+        Starts a phase of the startup. The current phase is stopped.
+
+        @param name: The name of the phase.
+        @type name: String
+        """
+        self.stopPhase()
+        self.__currentPhase = (name, time.time())
+
+    def stopPhase(self):
+        """
+        Stops the current phase of the startup.
+        """
+        if (not self.__currentPhase == None):
+            (name, startTime) = self.__currentPhase
+            self.__listOfPhases.append((name, time.time() - startTime))
+            self.__currentPhase = None
+
+    def addPhase(self, name, startTime, stopTime=None):
+        """
+        Adds a phase of the startup that was timed outside of the
+        profiler.
+
+        @param name: The name of the phase.
+        @type name: String
+        @param startTime: The time the phase started.
+        @type startTime: Float
+        @param stopTime: The time the phase stopped. If None then the
+        current time is used.
+        @type stopTime: Float
+        """
+        if (stopTime == None):
+            stopTime = time.time()
+        self.__listOfPhases.append((name, stopTime - startTime))
+
+    def getPhases(self):
+        """
+        Returns a list of tuples of the name of each phase and the
+        seconds it took in the order they were ran.
+
+        @return: Returns a list of tuples of the name of each phase and
+        the seconds it took.
+        @rtype: Array
+        """
+        return list(self.__listOfPhases)
+
+    def getImports(self):
+        """
+        Returns a list of tuples of the module name, the cumulative
+        seconds, and the self seconds of each import sorted by the
+        cumulative seconds.
+
+        @return: Returns a list of tuples of the module name, the
+        cumulative seconds, and the self seconds of each import.
+        @rtype: Array
+        """
+        listOfImports = []
+        for moduleName in self.__importsMap.keys():
+            (cumulativeSeconds, selfSeconds) = self.__importsMap.get(moduleName)
+            listOfImports.append((moduleName, cumulativeSeconds, selfSeconds))
+        listOfImports.sort(key=lambda item: (-item[1], item[0]))
+        return listOfImports
+
+    def getTotalTime(self):
+        """
+        Returns the seconds since the startup began.
+
+        @return: Returns the seconds since the startup began.
+        @rtype: Float
+        """
+        return time.time() - self.__startTime
+
+    def getTable(self):
+        """
+        Returns the phases and the slowest imports as tables. The times
+        are in milliseconds.
+
+        @return: Returns the phases and the slowest imports as tables.
+        @rtype: String
+        """
+        table = "%-40s %14s\n" %("Phase", "ms")
+        for (name, seconds) in self.getPhases():
+            table += "%-40s %14.2f\n" %(name, seconds * 1000)
+        table += "%-40s %14.2f\n\n" %("total", self.getTotalTime() * 1000)
+        listOfImports = self.getImports()
+        table += "%-40s %14s %14s\n" %("Module", "cumulative ms", "self ms")
+        for (moduleName, cumulativeSeconds, selfSeconds) in listOfImports[:StartupProfiler.MAXIMUM_TABLE_ROWS]:
+            table += "%-40s %14.2f %14.2f\n" %(moduleName, cumulativeSeconds * 1000, selfSeconds * 1000)
+        if (len(listOfImports) > StartupProfiler.MAXIMUM_TABLE_ROWS):
+            table += "(%d more modules were imported)\n" %(len(listOfImports) - StartupProfiler.MAXIMUM_TABLE_ROWS)
+        return table
+
+    def getJSON(self):
+        """
+        Returns the phases and all the imports as JSON. The times are in
+        seconds.
+
+        @return: Returns the phases and all the imports as JSON.
+        @rtype: String
+        """
+        profile = {"total":self.getTotalTime(), "phases":[], "imports":[]}
+        for (name, seconds) in self.getPhases():
+            profile["phases"].append({"name":name, "seconds":seconds})
+        for (moduleName, cumulativeSeconds, selfSeconds) in self.getImports():
+            profile["imports"].append({"module":moduleName, "cumulative":cumulativeSeconds, "self":selfSeconds})
+        return json.dumps(profile, indent=2, sort_keys=True)
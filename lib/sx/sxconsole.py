@@ -16,6 +16,7 @@ import os
 import os.path
 import shutil
 import logging
+import multiprocessing
 
 import sx
 from sx.logwriter import LogWriter
@@ -27,8 +28,15 @@ from sx import ArchivedLayout
 from sx import ModifiedArchiveLayout
 from sx import ModifiedArchivedLayout
 from sx.extractors import Extractor
+from sx.extractors import DeferredExtractor
+from sx.extractors import ArchiveIndex
+from sx.extractors import ExtractionCache
+from sx.extractors import CachedExtractor
+from sx.extractors.tarextractor import Tarextractor
 from sx.reports import Report
 from sx.plugins import PluginsHelper
+from sx.searchindex import SearchIndex
+from sx.archivecatalog import ArchiveCatalog
 from sx.modulesloader import ReportsLoader
 from sx.modulesloader import ExtractorsLoader
 
@@ -36,10 +44,56 @@ from sx.analysisreport import AnalysisReport
 from sx.analysisreport import ARSection
 from sx.analysisreport import ARSectionItem
 
+"""
+@cvar EXTRACTION_JOB_TIMEOUT: The number of seconds to wait for a
+parallel extraction of a report to finish.
+@type EXTRACTION_JOB_TIMEOUT: Int
+"""
+EXTRACTION_JOB_TIMEOUT = 86400
+
+def extractReport(extractorClass, pathToFilename, extractDir, stripDirectoriesDepth, listOfPathPatterns, pathToCacheDir=""):
+    """
+    This function will extract a file with a new extractor. This
+    function is ran by the processes that do parallel extractions.
+
+    @return: Returns True if there was no fatal errors.
+    @rtype: Boolean
+
+    @param extractorClass: The class of the extractor for the file.
+    @type extractorClass: Class
+    @param pathToFilename: The path to the file that will be extracted.
+    @type pathToFilename: String
+    @param extractDir: The full path to directory for extraction.
+    @type extractDir: String
+    @param stripDirectoriesDepth: The number of leading directories
+    that will be removed.
+    @type stripDirectoriesDepth: Int
+    @param listOfPathPatterns: The path patterns of the files that will
+    be extracted. If empty then every file is extracted.
+    @type listOfPathPatterns: Array
+    @param pathToCacheDir: The path to the directory of the extraction
+    cache. If empty then the extraction cache is not used.
+    @type pathToCacheDir: String
+    """
+    extractor = extractorClass(pathToFilename)
+    if (len(pathToCacheDir) > 0):
+        extractor = CachedExtractor(extractor, ExtractionCache(pathToCacheDir))
+    return extractor.extract(extractDir, stripDirectoriesDepth, listOfPathPatterns)
+
 class SXConsole:
     def __init__(self, optionsMap, uid):
         self.__optionsMap = optionsMap
         self.__uid = uid
+        # The path patterns of the files that will be extracted from the
+        # reports. If empty then every file is extracted.
+        self.__listOfExtractPathPatterns = []
+        # If True then the reports are read from the compressed files
+        # instead of being extracted.
+        self.__virtualReports = self.__optionsMap.get("virtualReports", False)
+        # The cache of extracted reports that is used if enabled.
+        self.__extractionCache = None
+        if (self.__optionsMap.get("extractionCache", False)):
+            self.__extractionCache = ExtractionCache()
         lwObjSXC = LogWriter(sx.MAIN_LOGGER_NAME,
                              logging.INFO,
                              sx.MAIN_LOGGER_FORMAT,
@@ -50,6 +104,10 @@ class SXConsole:
             message = "Debugging has been enabled."
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
 
+        # Select how tarballs are decompressed. If the backend is not valid
+        # then the default backend is used.
+        Tarextractor.setDecompressionBackend(self.__optionsMap.get("decompressionBackend", Tarextractor.DECOMPRESSION_BACKEND))
+
         # Make sure that ~ is expanded on any path variable that is path to some
         # file or directory.
         if (self.__optionsMap.get("archivePath").startswith("~")):
@@ -72,6 +130,9 @@ class SXConsole:
             logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
 
         self.__al = None
+        # The catalog of the archive that is opened when the archive
+        # directories are created.
+        self.__catalog = None
         # Archive Layout
         if (self.__validateOptions(self.getUID(), self.__optionsMap.get("pathToExtractedReports"))):
             try:
@@ -117,6 +178,13 @@ class SXConsole:
             logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
             return False
         elif ((len(pathToExtractedReports) > 0) and (not os.path.exists(pathToExtractedReports))):
+            # The extracted reports can be removed to save space and then
+            # they are extracted again from the compressed reports.
+            pathToCompressedReports = ArchivedLayout(pathToExtractedReports).getPathToCompressedReports()
+            if ((pathToExtractedReports.find("ereports") > 0) and (os.path.isdir(pathToCompressedReports))):
+                message = "The extracted reports do not exist and will be extracted again from the compressed reports: %s" %(pathToCompressedReports)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+                return True
             # If path has greater length than zero and path does not exist
             message = "The path passed with -p option is not a valid path of archived reports."
             logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
@@ -233,12 +301,21 @@ class SXConsole:
             message = "The archive directories do not exist. The application will exit."
             logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
             sys.exit(1)
+        # The catalog is only read when reports are loaded.
+        self.__catalog = ArchiveCatalog(al.getPathToCatalog(), (len(pathToExtractedReports) > 0))
         # #######################################################################
         # Extract or load the reports
         # #######################################################################
         if (len(pathToExtractedReports) > 0) :
-            # Load reports that were already extracted.
+            # Read any reports that were removed from the archive from the
+            # compressed reports, then load reports that were already
+            # extracted.
+            reportsRehydrated = self.__rehydrate(al, includeUserDefinedModules)
             reportsExtracted = self.__load(pathToExtractedReports, includeUserDefinedModules)
+            # The virtual reports do not have a directory that can be loaded.
+            for report in reportsRehydrated:
+                if (report.isVirtual()):
+                    reportsExtracted.append(report)
             message = "There was %d reports found and loaded." %(len(reportsExtracted))
             logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
         else:
@@ -246,6 +323,9 @@ class SXConsole:
             message = "The list of reports are being analyzed to verify that they are known report types."
             logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
             listOfReports = self.__getListOfReports(listOfReports, pathToReportsDirectory)
+            # Record the run in the catalog of the archive so that it can be
+            # found without listing the directories in the archive.
+            self.__catalog.addRun(al)
             message = "The reports will be extracted to the following directory: %s" %(al.getPathToExtractedReports())
             logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
             message = "Extracting %d reports."%(len(listOfReports))
@@ -269,6 +349,9 @@ class SXConsole:
         sosreports. The sosreports that are in the RHEV report will be
         extracted as well.
 
+        If more than 1 extraction job is enabled then the reports will
+        be extracted in parallel with a pool of processes.
+
         @return: Returns a list of all the report objects that were
         successfully extracted.
         @rtype: Array
@@ -290,50 +373,160 @@ class SXConsole:
         extractorsLoader = ExtractorsLoader()
         reportsLoader = ReportsLoader()
 
+        # When every member is extracted, the tarballs are extracted while
+        # they are indexed for the detection of the report type so each
+        # tarball is only decompressed once.
+        if ((not self.__virtualReports) and (not len(self.__listOfExtractPathPatterns) > 0) and
+            (self.__extractionCache == None)):
+            Tarextractor.setStagingDir(os.path.join(pathToExtractedReports, ".staging"))
+        # A list of tuples of the path to the file, the report, and the
+        # extractor for each known report type.
+        listOfKnownReports = []
         for pathToFilename in listOfUnextractedReports:
             report = reportsLoader.getReport(pathToFilename, includeUserDefinedModules)
             if (not report == None):
+                report.setExtractPathPatterns(self.__listOfExtractPathPatterns)
+                report.setVirtual(self.__virtualReports)
                 # The reason I have to find extractor again is because I moved
                 # the file from orginal location so I dont want an extractor in
                 # object if the file it extracts no longer exists.
                 extractor = extractorsLoader.getExtractor(pathToFilename, includeUserDefinedModules)
-                if (report.extract(extractor, pathToExtractedReports)):
-                    # Add the report to the list of valid reports that were found.
-                    listOfReports.append(report)
-                    # Move the file if it was extracted correctly.
-                    pathToNewFilename = os.path.join(pathToCompressedReports, os.path.basename(pathToFilename))
-                    if (not self.__moveReport(pathToFilename, pathToNewFilename)):
-                        message = "There was an error moving the file: %s\n\t  to %s." %(pathToFilename, pathToNewFilename)
-                        logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
-                        # If the report contains or could contain other known
-                        # report types then we will see if any of the files
-                        # within that report can be added to the list of reports
-                        # that need to be extracted.
-                    if (report.includesOtherReports()):
-                        pathToExtractedReport = report.getPathToExtractedReport()
-                        # List of full path to files within the report that was
-                        # extracted. Just top dir for now, will not goto deep it
-                        # for now. I also moving these out which might be
-                        # desired.
-                        listOfFilesInExtractedReports = []
-                        for currentFilename in os.listdir(pathToExtractedReport):
-                            listOfFilesInExtractedReports.append(os.path.join(pathToExtractedReport, currentFilename))
-                        if (len(listOfFilesInExtractedReports) > 0):
-                            message =  "The %s report contains %d files and the %s report will be analyzed " %(report.getName(),
-                                                                                                               len(listOfUnextractedReports),
-                                                                                                               report.getName())
-                            message += "to see if contain any other known report types."
-                            logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
-                            # Now do a little recursion
-                            reportsWithinReportList += self.__extract(listOfFilesInExtractedReports, pathToCompressedReports,
-                                                                      pathToExtractedReports, includeUserDefinedModules)
-                else:
-                    message = "There was an error extracting the report: %s." %(str(extractor))
+                if ((not self.__extractionCache == None) and (not self.__virtualReports) and (not extractor == None)):
+                    extractor = CachedExtractor(extractor, self.__extractionCache)
+                listOfKnownReports.append((pathToFilename, report, extractor))
+
+        # A list of the result of each extraction in the same order as the
+        # list of known reports.
+        listOfExtractionResults = []
+        extractionJobs = self.__optionsMap.get("extractionJobs", 1)
+        if ((extractionJobs > 1) and (len(listOfKnownReports) > 1) and (not self.__virtualReports)):
+            listOfExtractionResults = self.__extractInParallel(listOfKnownReports, pathToExtractedReports, extractionJobs)
+        else:
+            for (pathToFilename, report, extractor) in listOfKnownReports:
+                listOfExtractionResults.append(report.extract(extractor, pathToExtractedReports))
+        # The tarballs that were not extracted are removed from the
+        # staging directory.
+        Tarextractor.clearStagedDirs()
+
+        for index in range(0, len(listOfKnownReports)):
+            (pathToFilename, report, extractor) = listOfKnownReports[index]
+            if (listOfExtractionResults[index]):
+                # Add the report to the list of valid reports that were found.
+                listOfReports.append(report)
+                # The files of an extracted report are read from the
+                # directory, so the index of the file is not needed.
+                if (not report.isVirtual()):
+                    ArchiveIndex.remove(pathToFilename)
+                # Move the file if it was extracted correctly.
+                pathToNewFilename = os.path.join(pathToCompressedReports, os.path.basename(pathToFilename))
+                if (not self.__moveReport(pathToFilename, pathToNewFilename)):
+                    message = "There was an error moving the file: %s\n\t  to %s." %(pathToFilename, pathToNewFilename)
                     logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                elif ((report.isVirtual()) and (not os.path.exists(pathToFilename))):
+                    # The virtual report has to read from the file at its
+                    # new location.
+                    report.setExtractor(extractorsLoader.getExtractor(pathToNewFilename, includeUserDefinedModules))
+                # Write the metadata so the report can be loaded again
+                # without reading the files the metadata came from.
+                report.writeMetadata()
+                self.__catalog.addReport(self.__al, report, pathToNewFilename)
+                # If the report contains or could contain other known
+                # report types then we will see if any of the files
+                # within that report can be added to the list of reports
+                # that need to be extracted.
+                if (report.includesOtherReports()):
+                    pathToExtractedReport = report.getPathToExtractedReport()
+                    # List of full path to files within the report that was
+                    # extracted. Just top dir for now, will not goto deep it
+                    # for now. I also moving these out which might be
+                    # desired.
+                    listOfFilesInExtractedReports = []
+                    for currentFilename in os.listdir(pathToExtractedReport):
+                        listOfFilesInExtractedReports.append(os.path.join(pathToExtractedReport, currentFilename))
+                    if (len(listOfFilesInExtractedReports) > 0):
+                        message =  "The %s report contains %d files and the %s report will be analyzed " %(report.getName(),
+                                                                                                           len(listOfUnextractedReports),
+                                                                                                           report.getName())
+                        message += "to see if contain any other known report types."
+                        logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
+                        # Now do a little recursion
+                        reportsWithinReportList += self.__extract(listOfFilesInExtractedReports, pathToCompressedReports,
+                                                                  pathToExtractedReports, includeUserDefinedModules)
+            else:
+                message = "There was an error extracting the report: %s." %(str(extractor))
+                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
         # Add reports extracted that were in other reports
         listOfReports += reportsWithinReportList
         return listOfReports
 
+    def __extractInParallel(self, listOfKnownReports, pathToExtractedReports, extractionJobs):
+        """
+        This function will extract the reports with a pool of processes
+        and returns a list of the result of each extraction in the same
+        order as the list of reports.
+
+        The reports are prepared one at a time in this process so that
+        the extraction directories(and the renaming of duplicate
+        directories) are the same as a serial extraction. Only the
+        extraction of the files is done by the pool of processes.
+
+        @return: Returns a list of the result of each extraction.
+        @rtype: Array
+
+        @param listOfKnownReports: A list of tuples of the path to the
+        file, the report, and the extractor.
+        @type listOfKnownReports: Array
+        @param pathToExtractedReports: The path to the directory where
+        the reports will be extracted.
+        @type pathToExtractedReports: String
+        @param extractionJobs: The number of processes that will do the
+        extractions.
+        @type extractionJobs: Int
+        """
+        message = "Extracting %d reports with %d parallel jobs." %(len(listOfKnownReports), extractionJobs)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+        listOfDeferredExtractors = []
+        for (pathToFilename, report, extractor) in listOfKnownReports:
+            deferredExtractor = DeferredExtractor(extractor)
+            # The result is ignored since nothing has been extracted yet.
+            report.extract(deferredExtractor, pathToExtractedReports)
+            listOfDeferredExtractors.append(deferredExtractor)
+        pool = multiprocessing.Pool(processes=extractionJobs)
+        listOfAsyncResults = []
+        try:
+            for deferredExtractor in listOfDeferredExtractors:
+                if (not len(deferredExtractor.getExtractDir()) > 0):
+                    listOfAsyncResults.append(None)
+                    continue
+                extractor = deferredExtractor.getExtractor()
+                pathToCacheDir = ""
+                if (isinstance(extractor, CachedExtractor)):
+                    pathToCacheDir = extractor.getExtractionCache().getPathToCacheDir()
+                    extractor = extractor.getExtractor()
+                listOfAsyncResults.append(pool.apply_async(extractReport, (extractor.__class__, extractor.getPathToFile(),
+                                                                           deferredExtractor.getExtractDir(),
+                                                                           deferredExtractor.getStripDirectoriesDepth(),
+                                                                           deferredExtractor.getPathPatterns(),
+                                                                           pathToCacheDir)))
+            pool.close()
+            listOfExtractionResults = []
+            for index in range(0, len(listOfKnownReports)):
+                report = listOfKnownReports[index][1]
+                asyncResult = listOfAsyncResults[index]
+                if (asyncResult == None):
+                    listOfExtractionResults.append(False)
+                    continue
+                # A timeout is used so that control-c can interrupt the wait.
+                asyncResult.get(EXTRACTION_JOB_TIMEOUT)
+                # The files were extracted by another process.
+                report.invalidateFileIndex()
+                listOfExtractionResults.append(report.isExtracted())
+        except:
+            pool.terminate()
+            raise
+        pool.join()
+        return listOfExtractionResults
+
     def __load(self, pathToExtractedReports, includeUserDefinedModules):
         """
         Returns the list of report paths that have already been
@@ -354,17 +547,122 @@ class SXConsole:
         # Zero out the list because this is new load of reports
         listOfReports = []
         reportsLoader = ReportsLoader()
-        for filename in os.listdir(pathToExtractedReports):
+        # The directory is always listed so that a report that is not in
+        # the catalog is loaded. The catalog is only used to find the type
+        # of a report without searching the report.
+        mapOfReportNames = {}
+        for (pathToFilename, name, pathToCompressedReport) in self.__catalog.getReportsForRun(pathToExtractedReports):
+            mapOfReportNames[os.path.abspath(pathToFilename)] = name
+        for filename in sorted(os.listdir(pathToExtractedReports)):
             if (filename == "reports"):
                 continue
             elif (filename.startswith(".")):
                 continue
             else:
                 pathToFilename = os.path.join(pathToExtractedReports, filename)
-                report = reportsLoader.getReport(pathToFilename, includeUserDefinedModules)
+                # The type of the report is read from the catalog or the
+                # metadata file if there is one, so the report does not have
+                # to be searched.
+                report = None
+                name = mapOfReportNames.get(os.path.abspath(pathToFilename), "")
+                if (not len(name) > 0):
+                    name = Report.readMetadata(pathToFilename).get("name", "")
+                if ((len(name) > 0) and (os.path.isdir(pathToFilename))):
+                    report = reportsLoader.getReportByName(name, includeUserDefinedModules)
+                if (report == None):
+                    report = reportsLoader.getReport(pathToFilename, includeUserDefinedModules)
                 if (not report == None) :
                     report.setPathToExtractedReport(pathToFilename)
+                    if ((not report.loadMetadata()) and (os.access(pathToExtractedReports, os.W_OK))):
+                        report.writeMetadata()
+                    if (not mapOfReportNames.has_key(os.path.abspath(pathToFilename))):
+                        self.__catalog.addReport(self.__al, report)
+                    listOfReports.append(report)
+        return listOfReports
+
+    def __rehydrate(self, al, includeUserDefinedModules):
+        """
+        Returns the list of reports for the compressed reports in the
+        archive whose extracted reports were removed. The reports are
+        not extracted again. Each one is a virtual report that reads its
+        files from the compressed report the first time they are used.
+
+        The catalog is used to find which extracted reports were removed
+        and their report types, so the compressed reports are not read
+        until a file is used. If the run is not in the catalog and there
+        are no extracted reports, then the type of each compressed
+        report is searched for. The compressed reports that are in
+        another compressed report are skipped, since they are read from
+        the report that contains them.
+
+        @return: Returns the list of reports whose extracted reports
+        were removed.
+        @rtype: Array
+
+        @param al: The archive layout of the extracted reports.
+        @type al: ArchiveLayout
+        @param includeUserDefinedModules: If True then user defined
+        reports/plugins are enabled.
+        @type includeUserDefinedModules: Boolean
+        """
+        pathToExtractedReports = al.getPathToExtractedReports()
+        pathToCompressedReports = al.getPathToCompressedReports()
+        if (not os.path.isdir(pathToCompressedReports)):
+            return []
+        listOfReports = []
+        extractorsLoader = ExtractorsLoader()
+        reportsLoader = ReportsLoader()
+        listOfCatalogReports = self.__catalog.getReportsForRun(pathToExtractedReports)
+        if (len(listOfCatalogReports) > 0):
+            for (pathToExtractedReport, name, pathToCompressedReport) in listOfCatalogReports:
+                if ((os.path.isdir(pathToExtractedReport)) or (not os.path.isfile(pathToCompressedReport))):
+                    continue
+                report = reportsLoader.getReportByName(name, includeUserDefinedModules)
+                extractor = extractorsLoader.getExtractor(pathToCompressedReport, includeUserDefinedModules)
+                if ((report == None) or (extractor == None)):
+                    continue
+                # The path of the report is known, so the report is not
+                # extracted to find it.
+                report.setPathToExtractedReport(pathToExtractedReport)
+                report.setExtractor(extractor)
+                report.loadMetadata()
+                listOfReports.append(report)
+        else:
+            for filename in os.listdir(pathToExtractedReports):
+                if ((not filename == "reports") and (not filename.startswith("."))):
+                    # There are extracted reports so nothing was removed.
+                    return []
+            # A list of tuples of the path to the compressed report, the
+            # report and the extractor.
+            listOfKnownReports = []
+            # The names of the files in the reports that include other
+            # reports, which were moved to the directory of compressed
+            # reports when they were extracted.
+            mapOfIncludedFilenames = {}
+            for filename in sorted(os.listdir(pathToCompressedReports)):
+                pathToCompressedReport = os.path.join(pathToCompressedReports, filename)
+                if (not os.path.isfile(pathToCompressedReport)):
+                    continue
+                report = reportsLoader.getReport(pathToCompressedReport, includeUserDefinedModules)
+                extractor = extractorsLoader.getExtractor(pathToCompressedReport, includeUserDefinedModules)
+                if ((report == None) or (extractor == None)):
+                    continue
+                if (report.includesOtherReports()):
+                    for includedFilename in extractor.listDir(""):
+                        mapOfIncludedFilenames[includedFilename] = True
+                listOfKnownReports.append((pathToCompressedReport, report, extractor))
+            for (pathToCompressedReport, report, extractor) in listOfKnownReports:
+                if (mapOfIncludedFilenames.has_key(os.path.basename(pathToCompressedReport))):
+                    continue
+                report.setVirtual(True)
+                if (report.extract(extractor, pathToExtractedReports)):
                     listOfReports.append(report)
+                else:
+                    message = "There was an error reading the report: %s." %(pathToCompressedReport)
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+        if (len(listOfReports) > 0):
+            message = "There are %d reports that were removed from the directory that will be read from the compressed reports: %s" %(len(listOfReports), pathToExtractedReports)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
         return listOfReports
 
     # ##############################################################################
@@ -396,6 +694,7 @@ class SXConsole:
         else:
             try:
                 shutil.move(src, dst)
+                ArchiveIndex.move(src, dst)
             except (IOError, os.error):
                 message = "Cannot move the file %s to %s." %(src, dst)
                 logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
@@ -404,6 +703,113 @@ class SXConsole:
             return True
         return False
 
+    def __getPathsToReportDirs(self, pathToExtractedReports):
+        """
+        Returns the list of paths to the directories of the reports that
+        were extracted to a directory. The directory of the plugin
+        reports and the hidden files are not included, since they are
+        written by sx and could be modified in place.
+
+        @return: Returns the list of paths to the directories of the
+        extracted reports.
+        @rtype: Array
+
+        @param pathToExtractedReports: The path to the directory the
+        reports were extracted to.
+        @type pathToExtractedReports: String
+        """
+        listOfPathsToDirs = []
+        if (not os.path.isdir(pathToExtractedReports)):
+            return listOfPathsToDirs
+        for filename in sorted(os.listdir(pathToExtractedReports)):
+            pathToDir = os.path.join(pathToExtractedReports, filename)
+            if ((filename == "reports") or (filename.startswith(".")) or
+                (os.path.islink(pathToDir)) or (not os.path.isdir(pathToDir))):
+                continue
+            listOfPathsToDirs.append(pathToDir)
+        return listOfPathsToDirs
+
+    def __deduplicate(self, deduplicateFiles):
+        """
+        This function will replace the files that are identical with
+        hardlinks to a single file. If deduplicateFiles is "reports"
+        then the files in the reports that were extracted are
+        deduplicated. If it is "archive" then the files in all the
+        reports that were extracted to the archive are deduplicated.
+        The plugin reports, the non-report files, and the catalog are
+        never deduplicated.
+
+        @param deduplicateFiles: Where the files are deduplicated:
+        none, reports, or archive.
+        @type deduplicateFiles: String
+        """
+        listOfPathsToDirs = []
+        pathToDir = ""
+        if (deduplicateFiles == "reports"):
+            pathToDir = self.__al.getPathToExtractedReports()
+            listOfPathsToDirs = self.__getPathsToReportDirs(pathToDir)
+        elif (deduplicateFiles == "archive"):
+            pathToDir = os.path.join(self.__al.getPathToArchiveRoot(), "ereports")
+            if (os.path.isdir(pathToDir)):
+                for uid in sorted(os.listdir(pathToDir)):
+                    pathToUIDDir = os.path.join(pathToDir, uid)
+                    if ((uid.startswith(".")) or (not os.path.isdir(pathToUIDDir))):
+                        continue
+                    for timestamp in sorted(os.listdir(pathToUIDDir)):
+                        # The non-report files are copied by the user.
+                        if ((timestamp == "files") or (timestamp.startswith("."))):
+                            continue
+                        listOfPathsToDirs += self.__getPathsToReportDirs(os.path.join(pathToUIDDir, timestamp))
+        else:
+            return
+        if (not len(listOfPathsToDirs) > 0):
+            return
+        message = "Replacing the identical files with hardlinks in the reports in the directory: %s" %(pathToDir)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
+        (filesLinked, bytesFreed) = FileUtil.deduplicateFiles(listOfPathsToDirs)
+        message = "There was %d identical files replaced with hardlinks which freed %s." %(filesLinked, FileUtil.convertBytesToString(bytesFreed))
+        logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+
+    def __addPluginRuns(self, listOfEnabledPlugins):
+        """
+        This function will add the files that each plugin created to the
+        catalog of the archive.
+
+        @param listOfEnabledPlugins: The list of plugins that were ran.
+        @type listOfEnabledPlugins: Array
+        """
+        for plugin in listOfEnabledPlugins:
+            listOfFiles = plugin.getFileList()
+            if (not len(listOfFiles) > 0):
+                self.__catalog.addPluginRun(self.__al, plugin.getName())
+            for pathToFile in listOfFiles:
+                self.__catalog.addPluginRun(self.__al, plugin.getName(), pathToFile)
+
+    def __index(self, listOfReports):
+        """
+        This function will add the text files in the extracted reports
+        to the search index of the archive, so that the reports can be
+        searched with the query option.
+
+        @param listOfReports: The list of reports that will be indexed.
+        @type listOfReports: Array
+        """
+        searchIndex = SearchIndex(self.__al.getPathToSearchIndex())
+        message = "Adding the extracted reports to the search index: %s" %(searchIndex.getPathToIndex())
+        logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
+        totalFilesIndexed = 0
+        for report in listOfReports:
+            if ((report.isVirtual()) or (not len(report.getPathToExtractedReport()) > 0)):
+                continue
+            (filesIndexed, filesRemoved) = searchIndex.addReport(self.__al.getUID(), self.__al.getTimestamp(), report.getPathToExtractedReport())
+            message = "There was %d files added and %d files removed from the search index for the report: %s" %(filesIndexed, filesRemoved,
+                                                                                                            report.getPathToExtractedReport())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            totalFilesIndexed += filesIndexed
+        searchIndex.close()
+        message = "There was %d files added to the search index." %(totalFilesIndexed)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+
     def __getListOfReports(self, cmdLineListOfReports, cmdLineReportPath):
         """
         This function returns a list of paths to reports based on
@@ -491,11 +897,17 @@ class SXConsole:
         # /tmp/sx-*. All tarballs extract to here.
         # #######################################################################
         Extractor.clean()
+        message = "The file content cache of the reports: %s." %(str(Report.CONTENT_CACHE))
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
         # #######################################################################
         # The plugins are done running and post-sxconsole action is done.
         # Remove tmp files since we are done with reportExtractor object
         # #######################################################################
         for report in listOfReportsExtracted:
+            parsedDataCache = report.getParsedDataCache()
+            if (not parsedDataCache == None):
+                message = "The parsed data cache of the report %s: %s." %(report.getPathToExtractedReport(), str(parsedDataCache))
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
             report.clean()
 
 
@@ -514,6 +926,34 @@ class SXConsole:
         listOfEnabledPlugins = []
         if (not self.__al == None):
             # #######################################################################
+            # Get list of enabled plugins. The plugins are found before the
+            # extraction so that only the files they require can be extracted.
+            # #######################################################################
+            pluginsHelper = PluginsHelper()
+            # For now this map is empty
+            listOfEnabledPlugins = pluginsHelper.getEnabledPluginsList(self.__al.getPathToExtractedReports(),
+                                                                       self.__optionsMap.get("enableAllPlugins"),
+                                                                       self.__optionsMap.get("disableAllPlugins"),
+                                                                       self.__optionsMap.get("enablePlugins"),
+                                                                       self.__optionsMap.get("disablePlugins"),
+                                                                       self.__getPluginOptions(self.__optionsMap.get("pluginOptions")),
+                                                                       (not self.__optionsMap.get("disableUserDefinedModules")))
+            if (self.__virtualReports):
+                for plugin in listOfEnabledPlugins:
+                    if ((plugin.isReportsRequired()) and (not len(plugin.getRequiredFiles()) > 0)):
+                        message = "The reports will be extracted because the plugin %s requires all the files in the reports." %(plugin.getName())
+                        logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+                        self.__virtualReports = False
+                        break
+            if (self.__optionsMap.get("selectiveExtraction")):
+                self.__listOfExtractPathPatterns = pluginsHelper.getRequiredFiles(listOfEnabledPlugins)
+                if (len(self.__listOfExtractPathPatterns) > 0):
+                    message = "Only the files required by the enabled plugins will be extracted from the reports."
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+                else:
+                    message = "All the files will be extracted from the reports because the enabled plugins require all the files."
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+            # #######################################################################
             # Get the list of extracted reports that were extracted or loaded.
             # #######################################################################
             listOfReportsExtracted = self.__extractReports(self.__al,
@@ -521,28 +961,29 @@ class SXConsole:
                                                            self.__optionsMap.get("listOfReports"),
                                                            self.__optionsMap.get("reportPath"),
                                                            (not self.__optionsMap.get("disableUserDefinedModules")))
+            self.__deduplicate(self.__optionsMap.get("deduplicateFiles", "none"))
+            if ((self.__optionsMap.get("indexReports")) and (len(listOfReportsExtracted) > 0)):
+                self.__index(listOfReportsExtracted)
 
             # Set archive location if there was reports load/extracted.
             if (len(listOfReportsExtracted) > 0):
                 # #######################################################################
                 # Run the plugins on the extracted reports
                 # #######################################################################
-                # Get list of enabled plugins.
-                pluginsHelper = PluginsHelper()
-                # For now this map is empty
-                listOfEnabledPlugins = pluginsHelper.getEnabledPluginsList(self.__al.getPathToExtractedReports(),
-                                                                           self.__optionsMap.get("enableAllPlugins"),
-                                                                           self.__optionsMap.get("disableAllPlugins"),
-                                                                           self.__optionsMap.get("enablePlugins"),
-                                                                           self.__optionsMap.get("disablePlugins"),
-                                                                           self.__getPluginOptions(self.__optionsMap.get("pluginOptions")),
-                                                                           (not self.__optionsMap.get("disableUserDefinedModules")))
                 # Print a list of enabled plugins.
                 if (len(listOfEnabledPlugins) > 0) :
                     message = "There was %d plugins enabled." %(len(listOfEnabledPlugins))
                     logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
                     # Generate map of all plugins reports that were created after they run.
-                    pluginsHelper.generatePluginReports(listOfReportsExtracted, listOfEnabledPlugins)
+                    # The plugins of virtual reports are not ran in parallel since
+                    # the processes would share the open compressed files.
+                    pluginJobs = self.__optionsMap.get("pluginJobs", 1)
+                    if ((pluginJobs > 1) and (self.__virtualReports)):
+                        message = "The plugins will not be ran in parallel because the reports are virtual."
+                        logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+                        pluginJobs = 1
+                    pluginsHelper.generatePluginReports(listOfReportsExtracted, listOfEnabledPlugins, pluginJobs)
+                    self.__addPluginRuns(listOfEnabledPlugins)
                 else:
                     logging.getLogger(sx.MAIN_LOGGER_NAME).info("Skipping plugins since there was no plugins enabled.")
 
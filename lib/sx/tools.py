@@ -15,6 +15,7 @@ import string
 import re
 import logging
 import shutil
+import stat
 import hashlib
 import datetime
 import textwrap
@@ -653,6 +654,128 @@ class FileUtil:
             logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
     touch = staticmethod(touch)
 
+    def getFileDigest(pathToFile, blockSize=1048576):
+        """
+        Returns the sha1 digest of the file. The file is read in blocks
+        so that large files are not read into memory. Empty string is
+        returned if the file cannot be read.
+
+        @return: Returns the sha1 digest of the file.
+        @rtype: String
+
+        @param pathToFile: The path to the file.
+        @type pathToFile: String
+        @param blockSize: The number of bytes read at a time.
+        @type blockSize: Int
+        """
+        sha1 = hashlib.sha1()
+        try:
+            fin = open(pathToFile, "rb")
+            try:
+                data = fin.read(blockSize)
+                while (len(data) > 0):
+                    sha1.update(data)
+                    data = fin.read(blockSize)
+            finally:
+                fin.close()
+        except (IOError, OSError):
+            message = "There was an error reading the file: %s." %(pathToFile)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return ""
+        return sha1.hexdigest()
+    getFileDigest = staticmethod(getFileDigest)
+
+    def deduplicateFiles(listOfPathsToDirs):
+        """
+        This function will replace the files that are identical in the
+        directories with hardlinks to a single file. The files are
+        grouped by size, mode, owner and modification time first so that
+        only the files that could be identical are hashed. Each file is
+        replaced by renaming a new hardlink over it, so the path always
+        exists.
+
+        Since every path is still a separate link, removing a path (for
+        example a temporary copy of a report) does not remove the data
+        for the other paths. Only files with the same modification time
+        are linked, so a link does not change the modification time of a
+        file. The files that are linked should not be modified in
+        place. The hidden files and directories and the files that end
+        with ".db" are skipped.
+
+        @return: Returns a tuple of the number of files that were
+        replaced by a hardlink and the number of bytes that were freed.
+        @rtype: Tuple
+
+        @param listOfPathsToDirs: The list of paths to the directories
+        that will be deduplicated.
+        @type listOfPathsToDirs: Array
+        """
+        # A map of the size, mode, owner, device and modification time of
+        # the files to a map of the inode to the paths of the inode. The
+        # device is at index 4 of the key since it is used to find the
+        # number of links to an inode.
+        bucketsMap = {}
+        # A map of the inode to the number of links to the inode.
+        linksMap = {}
+        for pathToDir in listOfPathsToDirs:
+            for (currentDir, dirnames, filenames) in os.walk(pathToDir):
+                # The hidden files and the databases can be written in
+                # place by sx, so they are never linked.
+                dirnames[:] = [dirname for dirname in dirnames if (not dirname.startswith("."))]
+                for filename in filenames:
+                    if ((filename.startswith(".")) or (filename.endswith(".db"))):
+                        continue
+                    pathToFile = os.path.join(currentDir, filename)
+                    try:
+                        fileStat = os.lstat(pathToFile)
+                    except OSError:
+                        continue
+                    # Empty files do not use any blocks.
+                    if ((not stat.S_ISREG(fileStat.st_mode)) or (not fileStat.st_size > 0)):
+                        continue
+                    bucketKey = (fileStat.st_size, fileStat.st_mode, fileStat.st_uid, fileStat.st_gid, fileStat.st_dev,
+                                 fileStat.st_mtime)
+                    inodesMap = bucketsMap.setdefault(bucketKey, {})
+                    inodesMap.setdefault(fileStat.st_ino, []).append(pathToFile)
+                    linksMap[(fileStat.st_dev, fileStat.st_ino)] = fileStat.st_nlink
+        filesLinked = 0
+        bytesFreed = 0
+        for bucketKey in bucketsMap.keys():
+            inodesMap = bucketsMap.get(bucketKey)
+            if (not len(inodesMap.keys()) > 1):
+                continue
+            # A map of the digest to the first path of each inode with
+            # that digest.
+            digestsMap = {}
+            for inode in sorted(inodesMap.keys()):
+                listOfPaths = inodesMap.get(inode)
+                digest = FileUtil.getFileDigest(listOfPaths[0])
+                if (not len(digest) > 0):
+                    continue
+                elif (not digestsMap.has_key(digest)):
+                    digestsMap[digest] = listOfPaths[0]
+                    continue
+                pathToLinkedFile = digestsMap.get(digest)
+                pathsLinked = 0
+                for pathToFile in listOfPaths:
+                    pathToTmpFile = "%s.sxlink-%d" %(pathToFile, os.getpid())
+                    try:
+                        os.link(pathToLinkedFile, pathToTmpFile)
+                        os.rename(pathToTmpFile, pathToFile)
+                        pathsLinked += 1
+                    except OSError:
+                        message = "There was an error linking the file %s to the file: %s." %(pathToFile, pathToLinkedFile)
+                        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+                        if (os.path.exists(pathToTmpFile)):
+                            os.remove(pathToTmpFile)
+                filesLinked += pathsLinked
+                # The data of the inode is only freed if there are no
+                # other links to the inode, such as in a cache.
+                if (pathsLinked == linksMap.get((bucketKey[4], inode))):
+                    bytesFreed += bucketKey[0]
+        return (filesLinked, bytesFreed)
+    deduplicateFiles = staticmethod(deduplicateFiles)
+
 class StringUtil:
 
     def wrapParagraph(s, width=98, newline=True):